@@ -0,0 +1,51 @@
+"""Fixtures for the benchmarks.
+
+The benchmarks need the pytest-benchmark plugin, see the README for how to
+save a baseline and compare against it.
+"""
+
+import pytest
+from nerdchess.board import Board, START_FEN
+from nerdchess.game import ChessGame
+from nerdchess.player import Player
+
+pytest.importorskip('pytest_benchmark')
+
+# Fixed positions for every stage of a game, in Forsyth-Edwards Notation
+POSITIONS = {
+    'opening': START_FEN,
+    'middlegame': 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/'
+                  'R4RK1 w - - 0 10',
+    'endgame': '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+}
+
+# The opera game (Morphy, 1858), ending in mate
+OPERA_GAME = (
+    'e2e4', 'e7e5', 'g1f3', 'd7d6', 'd2d4', 'c8g4', 'd4e5', 'g4f3', 'd1f3',
+    'd6e5', 'f1c4', 'g8f6', 'f3b3', 'd8e7', 'b1c3', 'c7c6', 'c1g5', 'b7b5',
+    'c3b5', 'c6b5', 'c4b5', 'b8d7', 'e1c1', 'a8d8', 'd1d7', 'd8d7', 'h1d1',
+    'e7e6', 'b5d7', 'f6d7', 'b3b8', 'd7b8', 'd1d8',
+)
+
+
+@pytest.fixture(params=sorted(POSITIONS))
+def position(request):
+    """Board in each of the fixed positions."""
+    return Board.from_fen(POSITIONS[request.param])
+
+
+@pytest.fixture
+def new_game():
+    """Return a function creating a new game between two players."""
+    def create():
+        (player_1,
+         player_2) = Player.create_two('blaat', 'henk', 'w')
+        return ChessGame(player_1, player_2)
+
+    return create
+
+
+@pytest.fixture
+def opera_game():
+    """Return the moves of a complete game."""
+    return OPERA_GAME
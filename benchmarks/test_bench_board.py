@@ -0,0 +1,86 @@
+import pytest
+from nerdchess.board import Board
+from nerdchess.boardmove import BoardMove
+from nerdchess.config import GameState
+
+
+def pieces_to_move(board):
+    """The pieces of the side to move."""
+    return list(board.piece_list(board.squares, board.turn))
+
+
+class TestBoardBenchmarks():
+    """Benchmark the hot paths of a board."""
+
+    def test_new_board(self, benchmark, position):
+        """Copy a board to make a move."""
+        move = next(position.legal_moves())
+        boardmove = BoardMove(position, move.text, rule_check=False)
+
+        newboard = benchmark(position.new_board, boardmove)
+
+        assert newboard.turn != position.turn
+
+    def test_is_check(self, benchmark, position):
+        """Look for a king in check."""
+        assert not benchmark(position.is_check)
+
+    @pytest.mark.parametrize("fen,expected", [
+        ('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3',
+         True),
+        ('rnbqkbnr/ppp2ppp/3p4/1B2p3/4P3/8/PPPP1PPP/RNBQK1NR b KQkq - 1 3',
+         False),
+        ('4k3/8/8/8/8/8/3PPP2/3QKB2 w - - 0 1', False),
+    ], ids=['mate', 'check', 'no check'])
+    def test_is_checkmate(self, benchmark, fen, expected):
+        """Look for mate, in check or not."""
+        board = Board.from_fen(fen)
+
+        assert bool(benchmark(board.is_checkmate)) == expected
+
+    def test_game_state(self, benchmark, position):
+        """Decide whether the game continues after a move."""
+        assert benchmark(position.game_state) == GameState.ONGOING
+
+    def test_allowed_moves(self, benchmark, position):
+        """Expand the move patterns of the pieces to move."""
+        pieces = pieces_to_move(position)
+
+        moves = benchmark(
+            lambda: [piece.allowed_moves() for piece in pieces])
+
+        assert moves
+
+    def test_allowed_moves_board(self, benchmark, position):
+        """Validate the moves of the pieces to move."""
+        pieces = pieces_to_move(position)
+
+        moves = benchmark(
+            lambda: [piece.allowed_moves(board=position) for piece in pieces])
+
+        assert any(moves)
+
+    def test_legal_moves(self, benchmark, position):
+        """Generate all legal moves."""
+        moves = benchmark(lambda: list(position.legal_moves()))
+
+        assert moves
+
+    def test_see(self, benchmark, position):
+        """Evaluate the exchanges of all captures."""
+        captures = list(position.captures())
+
+        scores = benchmark(
+            lambda: [position.see(move) for move in captures])
+
+        assert len(scores) == len(captures)
+
+    @pytest.mark.parametrize("rule_check", [True, False])
+    def test_boardmove(self, benchmark, position, rule_check):
+        """Create a move on the board."""
+        move = next(position.legal_moves())
+
+        boardmove = benchmark(BoardMove, position, move.text,
+                              rule_check=rule_check)
+
+        assert boardmove == move
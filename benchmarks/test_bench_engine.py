@@ -0,0 +1,19 @@
+from nerdchess.engine import Engine
+
+
+def search(engine, board, depth):
+    """Search a board with an engine."""
+    return engine.search(board, depth)
+
+
+class TestEngineBenchmarks():
+    """Benchmark searching for the best move."""
+
+    def test_search(self, benchmark, position):
+        """Search a position to a fixed depth with an empty engine."""
+        fen = position.to_fen()
+        result = benchmark.pedantic(
+            search, setup=lambda: ((Engine(), position, 3), {}), rounds=3)
+
+        assert result.move
+        assert position.to_fen() == fen
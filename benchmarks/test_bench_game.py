@@ -0,0 +1,29 @@
+def play(game, moves):
+    """Play moves in a game, switching between the players."""
+    for move in moves:
+        player = game.player_1 if game.player_1.turn else game.player_2
+        assert game.move(player, move)
+    return game
+
+
+class TestGameBenchmarks():
+    """Benchmark complete games."""
+
+    def test_scripted_game(self, benchmark, new_game, opera_game):
+        """Play a game from start to mate through ChessGame.move."""
+        game = benchmark.pedantic(
+            play, setup=lambda: ((new_game(), opera_game), {}), rounds=20)
+
+        assert game.over
+
+    def test_undo_redo(self, benchmark, new_game, opera_game):
+        """Step back through a whole game and forward again."""
+        game = play(new_game(), opera_game)
+
+        def undo_redo():
+            game.undo(len(opera_game))
+            game.redo(len(opera_game))
+
+        benchmark(undo_redo)
+
+        assert game.over
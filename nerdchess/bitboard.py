@@ -0,0 +1,243 @@
+"""The pieces on a board as bitboards.
+
+A bitboard is an integer with a bit for every square, numbered from 0 (a1)
+to 63 (h8) in the order of nerdchess.config.selectorlist. BitBoards keeps one
+per piece class and color, plus the squares occupied by each color.
+
+Every Board keeps BitBoards of its position up to date on every change of a
+square, see Board.update_square, and generates moves and detects attacks
+with bit operations on them. The squares of the board still hold the piece
+objects, so they remain the way to place and read pieces:
+
+    >>> board.bitboards.attackers(SQUARES['e4'], colors.BLACK)
+    0
+
+Attributes:
+    SQUARES (dict): The number of every square by its selector.
+    BITS (dict): The bit of every square by its selector.
+    PIECE_CLASSES (tuple(Piece)): The piece classes with a bitboard.
+    KNIGHT_ATTACKS (list(int)): The squares a knight attacks, by square.
+    KING_ATTACKS (list(int)): The squares a king attacks, by square.
+    PAWN_ATTACKS (dict): By color, the squares a pawn attacks by square.
+    RAYS (dict): By direction, the squares on the ray from a square up to
+                 the edge of the board.
+    DARK_SQUARES (int): The dark squares, a1 being one.
+"""
+from nerdchess import tables
+from nerdchess.config import colors, selectorlist
+from nerdchess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+SQUARES = {selector: square for (square, selector) in enumerate(selectorlist)}
+BITS = {selector: 1 << square for (selector, square) in SQUARES.items()}
+PIECE_CLASSES = (Pawn, Knight, Bishop, Rook, Queen, King)
+
+
+def mask(selectors):
+    """Return the bitboard of some squares.
+
+    Parameters:
+        selectors(iterable(String)): The squares (eg. ['e4', 'd5'])
+
+    Returns:
+        int: The bitboard with the bits of the squares set
+    """
+    bits = 0
+    for selector in selectors:
+        bits |= BITS[selector]
+    return bits
+
+
+def squares_of(bits):
+    """Yield the numbers of the squares set in a bitboard, lowest first.
+
+    Parameters:
+        bits(int): The bitboard
+
+    Yields:
+        int: The number of every square set
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _ray(selector, steps):
+    """Return the bitboard of the squares in a direction from a square."""
+    bits = 0
+    target = tables.step(selector, steps)
+    while target:
+        bits |= BITS[target]
+        target = tables.step(target, steps)
+    return bits
+
+
+KNIGHT_ATTACKS = [mask(tables.KNIGHT_TARGETS[s]) for s in selectorlist]
+KING_ATTACKS = [mask(tables.KING_TARGETS[s]) for s in selectorlist]
+PAWN_ATTACKS = {
+    color: [mask(tables.PAWN_ATTACKS[color][s]) for s in selectorlist]
+    for color in (colors.WHITE, colors.BLACK)
+}
+RAYS = {
+    steps: [_ray(s, steps) for s in selectorlist]
+    for steps in tables.STRAIGHT_STEPS + tables.DIAGONAL_STEPS
+}
+DARK_SQUARES = mask(s for s in selectorlist
+                    if (tables.FILE_INDEX[s[0]] + int(s[1])) % 2)
+
+# On rays pointing to higher squares the nearest blocker is the lowest bit,
+# on the others the highest one.
+_STRAIGHT = tuple((RAYS[steps], steps[1] > 0 or steps == (1, 0))
+                  for steps in tables.STRAIGHT_STEPS)
+_DIAGONAL = tuple((RAYS[steps], steps[1] > 0)
+                  for steps in tables.DIAGONAL_STEPS)
+
+
+def _slide(square, occupied, directions):
+    """Return the squares attacked along rays, up to the first blockers."""
+    attacks = 0
+    for (rays, positive) in directions:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            if positive:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray ^= rays[first]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square, occupied):
+    """Return the squares a rook attacks.
+
+    Parameters:
+        square(int): The number of the square of the rook
+        occupied(int): The occupied squares, blocking the rook
+
+    Returns:
+        int: The attacked squares, including the blockers
+    """
+    return _slide(square, occupied, _STRAIGHT)
+
+
+def bishop_attacks(square, occupied):
+    """Return the squares a bishop attacks, see rook_attacks()."""
+    return _slide(square, occupied, _DIAGONAL)
+
+
+class BitBoards():
+    """The pieces on a board as one bitboard per piece class and color.
+
+    Attributes:
+        pieces(dict): By color, the bitboard of every piece class
+        occupancy(dict): By color, the squares occupied by its pieces
+    """
+
+    def __init__(self):
+        """Init."""
+        self.pieces = {
+            colors.WHITE: dict.fromkeys(PIECE_CLASSES, 0),
+            colors.BLACK: dict.fromkeys(PIECE_CLASSES, 0),
+        }
+        self.occupancy = {colors.WHITE: 0, colors.BLACK: 0}
+
+    @property
+    def occupied(self):
+        """The squares occupied by pieces of either color."""
+        return self.occupancy[colors.WHITE] | self.occupancy[colors.BLACK]
+
+    def toggle(self, piece, selector):
+        """Put a piece on its square, or take it off when it's there.
+
+        Parameters:
+            piece(Piece): The piece or pawn
+            selector(String): The square (eg. e4)
+        """
+        bit = BITS[selector]
+        self.pieces[piece.color][type(piece)] ^= bit
+        self.occupancy[piece.color] ^= bit
+
+    def attacks(self, piece, square, occupied=None):
+        """Return the squares a piece attacks from a square.
+
+        Parameters:
+            piece(Piece): The piece or pawn
+            square(int): The number of the square it's on
+            occupied(int): Optional: The squares blocking sliding pieces,
+                           defaults to the occupied squares
+
+        Returns:
+            int: The attacked squares, whatever occupies them
+        """
+        if occupied is None:
+            occupied = self.occupied
+        if isinstance(piece, Pawn):
+            return PAWN_ATTACKS[piece.color][square]
+        if isinstance(piece, Knight):
+            return KNIGHT_ATTACKS[square]
+        if isinstance(piece, King):
+            return KING_ATTACKS[square]
+
+        attacks = 0
+        if isinstance(piece, (Rook, Queen)):
+            attacks |= rook_attacks(square, occupied)
+        if isinstance(piece, (Bishop, Queen)):
+            attacks |= bishop_attacks(square, occupied)
+        return attacks
+
+    def attackers(self, square, color, occupied=None):
+        """Return the pieces of a color attacking a square.
+
+        Parameters:
+            square(int): The number of the square
+            color(colors): The color of the attacking pieces
+            occupied(int): Optional: The squares blocking sliding pieces,
+                           defaults to the occupied squares
+
+        Returns:
+            int: The squares of the attacking pieces
+        """
+        if occupied is None:
+            occupied = self.occupied
+        own = self.pieces[color]
+        # Pawns attack forward, so look back from the square
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+
+        attackers = ((KNIGHT_ATTACKS[square] & own[Knight])
+                     | (KING_ATTACKS[square] & own[King])
+                     | (PAWN_ATTACKS[enemy][square] & own[Pawn]))
+        straight = own[Rook] | own[Queen]
+        if straight:
+            attackers |= rook_attacks(square, occupied) & straight
+        diagonal = own[Bishop] | own[Queen]
+        if diagonal:
+            attackers |= bishop_attacks(square, occupied) & diagonal
+        return attackers
+
+    def is_attacked(self, square, color):
+        """Is a square attacked by any piece of a color.
+
+        Like attackers(), but stops at the first kind of attacker found.
+
+        Parameters:
+            square(int): The number of the square
+            color(colors): The color of the attacking pieces
+
+        Returns:
+            Bool: Is the square attacked
+        """
+        own = self.pieces[color]
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        if (KNIGHT_ATTACKS[square] & own[Knight]
+                or PAWN_ATTACKS[enemy][square] & own[Pawn]
+                or KING_ATTACKS[square] & own[King]):
+            return True
+
+        occupied = self.occupied
+        straight = own[Rook] | own[Queen]
+        if straight and rook_attacks(square, occupied) & straight:
+            return True
+        diagonal = own[Bishop] | own[Queen]
+        return bool(diagonal and bishop_attacks(square, occupied) & diagonal)
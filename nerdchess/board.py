@@ -1,8 +1,57 @@
 """This module represents a board in a game of chess."""
 import copy
-from nerdchess.config import colors, letters
+from nerdchess import bitboard, encoding, evaluation, tables, zobrist
+from nerdchess.bitboard import BITS, SQUARES, squares_of
+from nerdchess.config import GameState, colors, letters, selectorlist
 from nerdchess.boardmove import BoardMove, CastleSide
-from nerdchess.pieces import King
+from nerdchess.move import Move
+from nerdchess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+# Castling rights lost when a move starts or ends on one of these squares.
+CASTLING_SQUARES = {
+    'e1': 'KQ',
+    'h1': 'K',
+    'a1': 'Q',
+    'e8': 'kq',
+    'h8': 'k',
+    'a8': 'q',
+}
+# The position a game starts from in Forsyth-Edwards Notation
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+# The pieces by their character in FEN, uppercase for white
+FEN_PIECES = {
+    'p': Pawn,
+    'n': Knight,
+    'b': Bishop,
+    'r': Rook,
+    'q': Queen,
+    'k': King,
+}
+FEN_CHARS = {piece: char for (char, piece) in FEN_PIECES.items()}
+# The pieces a pawn promotes to by their character in move texts (eg. e7e8q)
+PROMOTION_PIECES = {
+    'n': Knight,
+    'b': Bishop,
+    'r': Rook,
+    'q': Queen,
+}
+# The value of the pieces in centipawns when exchanging them, see Board.see.
+# Capturing the king ends an exchange, so it's worth more than all others.
+EXCHANGE_VALUES = {**evaluation.MIDDLEGAME_VALUES, King: 20000}
+# The pieces from the least to the most valuable when exchanging them
+EXCHANGE_ORDER = sorted(EXCHANGE_VALUES, key=EXCHANGE_VALUES.get)
+# The squares between king and rook, and the squares the king passes, when
+# castling to the king side and queen side
+CASTLING_PATHS = {
+    colors.WHITE: ((CastleSide.KING, 'K', bitboard.mask(['f1', 'g1']),
+                    ('f1', 'g1')),
+                   (CastleSide.QUEEN, 'Q', bitboard.mask(['b1', 'c1', 'd1']),
+                    ('d1', 'c1'))),
+    colors.BLACK: ((CastleSide.KING, 'k', bitboard.mask(['f8', 'g8']),
+                    ('f8', 'g8')),
+                   (CastleSide.QUEEN, 'q', bitboard.mask(['b8', 'c8', 'd8']),
+                    ('d8', 'c8'))),
+}
 
 
 class Board():
@@ -26,6 +75,17 @@ class Board():
         letters(list): The letters of a board
         numbers(list): The numbers of a board
         squares(dict): A dict of letters containing numbers with squares
+        selectors(dict): The same squares by their selector (eg. e4)
+        turn(colors): The color to move
+        castling(String): The remaining castling rights (eg. 'KQkq')
+        en_passant(String): The square a pawn skipped last move, or None
+        halfmove_clock(int): The moves since the last capture or pawn move
+        fullmove_number(int): The number of the move, starting at 1 and
+                              counting up after black moved
+        last_move(Move): The last move made on this board, or None
+        kings(dict): The selector of the king of each color, or None
+        bitboards(BitBoards): The pieces as bitboards, kept up to date
+                              with the squares, see nerdchess.bitboard
     """
 
     def __init__(self):
@@ -33,8 +93,96 @@ class Board():
         self.letters = [i.value for i in letters]
         self.numbers = range(1, 9)
         self.squares = {}
+        self.selectors = {}
+        self.turn = colors.WHITE
+        self.castling = 'KQkq'
+        self.en_passant = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.last_move = None
+        self.kings = {colors.WHITE: None, colors.BLACK: None}
+        self.bitboards = bitboard.BitBoards()
+        self.__pieces_key = 0
+        self.__mating_material = 0
+        self.__pieces = {colors.WHITE: 0, colors.BLACK: 0}
+        self.__middlegame = 0
+        self.__endgame = 0
+        self.__phase = 0
         self.__create_board()
 
+    @property
+    def key(self):
+        """The zobrist key of the position on this board.
+
+        The key covers the pieces, the side to move, the castling rights and
+        a capturable en passant square. The pieces part is kept up to date
+        on every change of a square, the rest is added in constant time.
+        """
+        en_passant_file = None
+        if self.en_passant:
+            # Pawns capture en passant from where the other color's pawns
+            # would attack the skipped square
+            other = colors.BLACK if self.turn == colors.WHITE else colors.WHITE
+            attacks = bitboard.PAWN_ATTACKS[other][SQUARES[self.en_passant]]
+            if attacks & self.bitboards.pieces[self.turn][Pawn]:
+                en_passant_file = self.en_passant[0]
+
+        return self.__pieces_key ^ zobrist.state_key(
+            self.turn, self.castling, en_passant_file)
+
+    @property
+    def scores(self):
+        """The material and piece-square scores of the board.
+
+        Kept up to date on every change of a square, see nerdchess.evaluation.
+
+        Returns:
+            tuple(int, int, int): The middlegame score, endgame score and
+                                  phase, scores positive when white is ahead
+        """
+        return (self.__middlegame, self.__endgame, self.__phase)
+
+    def update_square(self, selector, old, new):
+        """Update the board when the occupant of a square changes.
+
+        Keeps the bitboards, the key, the position of the kings, the amount
+        of pawns, rooks and queens, the amount of pieces of each color and the
+        scores up to date. Squares call this themselves, see Square.occupant.
+
+        Parameters:
+            selector(String): The selector of the square that changed
+            old(Piece): The previous occupant or None
+            new(Piece): The new occupant or None
+        """
+        if old:
+            self.bitboards.toggle(old, selector)
+            self.__pieces_key ^= zobrist.piece_key(old, selector)
+            if isinstance(old, King) and self.kings[old.color] == selector:
+                self.kings[old.color] = None
+            if isinstance(old, (Pawn, Rook, Queen)):
+                self.__mating_material -= 1
+            if not isinstance(old, (Pawn, King)):
+                self.__pieces[old.color] -= 1
+            scores = evaluation.SQUARE_SCORES[type(old)][
+                0 if old.color == colors.WHITE else 1][selector]
+            self.__middlegame -= scores[0]
+            self.__endgame -= scores[1]
+            self.__phase -= evaluation.PHASE_WEIGHTS[type(old)]
+        if new:
+            self.bitboards.toggle(new, selector)
+            self.__pieces_key ^= zobrist.piece_key(new, selector)
+            if isinstance(new, King):
+                self.kings[new.color] = selector
+            if isinstance(new, (Pawn, Rook, Queen)):
+                self.__mating_material += 1
+            if not isinstance(new, (Pawn, King)):
+                self.__pieces[new.color] += 1
+            scores = evaluation.SQUARE_SCORES[type(new)][
+                0 if new.color == colors.WHITE else 1][selector]
+            self.__middlegame += scores[0]
+            self.__endgame += scores[1]
+            self.__phase += evaluation.PHASE_WEIGHTS[type(new)]
+
     @classmethod
     def piece_list(cls, square_dict, color=None):
         """Generate the current pieces on the board as a list.
@@ -112,6 +260,88 @@ class Board():
         self.__setup_pieces(game_pieces)
         self.__setup_pawns(pawns)
 
+    @classmethod
+    def from_fen(cls, fen):
+        """Create a board from a position in Forsyth-Edwards Notation.
+
+        The move counters are optional and default to the start of a game.
+
+        Parameters:
+            fen(String): The position, see START_FEN for an example
+
+        Returns:
+            Board: A new board with the position
+        """
+        fields = fen.split()
+        if not 4 <= len(fields) <= 6:
+            raise ValueError('Invalid FEN')
+        (placement, turn, castling, en_passant) = fields[:4]
+        (halfmove_clock, fullmove_number) = (fields[4:] + ['0', '1'])[:2]
+
+        rows = placement.split('/')
+        if len(rows) != 8:
+            raise ValueError('Invalid FEN')
+
+        board = cls()
+        for (number, row) in zip(reversed(board.numbers), rows):
+            index = 0
+            for char in row:
+                if char.isdigit():
+                    index += int(char)
+                    continue
+                if char.lower() not in FEN_PIECES or index >= 8:
+                    raise ValueError('Invalid FEN')
+
+                color = colors.WHITE if char.isupper() else colors.BLACK
+                piece = FEN_PIECES[char.lower()](color)
+                square = board.squares[board.letters[index]][number]
+                piece.position = square.selector
+                square.occupant = piece
+                index += 1
+            if index != 8:
+                raise ValueError('Invalid FEN')
+
+        if (turn not in ('w', 'b')
+                or (castling != '-' and not set(castling) <= set('KQkq'))
+                or (en_passant != '-' and en_passant not in board.selectors)):
+            raise ValueError('Invalid FEN')
+        board.turn = colors(turn)
+        board.castling = '' if castling == '-' else castling
+        board.en_passant = None if en_passant == '-' else en_passant
+        board.halfmove_clock = int(halfmove_clock)
+        board.fullmove_number = int(fullmove_number)
+        if board.halfmove_clock < 0 or board.fullmove_number < 1:
+            raise ValueError('Invalid FEN')
+
+        return board
+
+    def to_fen(self):
+        """Return the position on this board in Forsyth-Edwards Notation.
+
+        Returns:
+            String: The position, see START_FEN for an example
+        """
+        rows = []
+        for number in reversed(self.numbers):
+            row = ''
+            empty = 0
+            for letter in self.letters:
+                piece = self.squares[letter][number].occupant
+                if not piece:
+                    empty += 1
+                    continue
+
+                char = FEN_CHARS[type(piece)]
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += char.upper() if piece.color == colors.WHITE else char
+            rows.append(row + (str(empty) if empty else ''))
+
+        return "{} {} {} {} {} {}".format(
+            '/'.join(rows), self.turn.value, self.castling or '-',
+            self.en_passant or '-', self.halfmove_clock, self.fullmove_number)
+
     def __setup_pieces(self, game_pieces):
         """Set up the pieces at their startposition on the board.
 
@@ -155,7 +385,9 @@ class Board():
             for number in self.numbers:
                 selector = "{}{}".format(letter, number)
 
-                self.squares[letter][number] = Square(selector, color)
+                self.squares[letter][number] = Square(
+                    selector, color, board=self)
+                self.selectors[selector] = self.squares[letter][number]
 
                 if number != len(self.numbers):
                     if color == colors.BLACK:
@@ -163,6 +395,104 @@ class Board():
                     else:
                         color = colors.BLACK
 
+    def attackers(self, selector, color):
+        """Get the pieces of a color that attack a square.
+
+        Instead of generating the moves of every piece, this looks outward
+        from the square along the lines and jumps pieces could attack it
+        from, on the bitboards.
+
+        Parameters:
+            selector(String): The square to look at (eg. e4)
+            color(colors): The color of the attacking pieces
+
+        Returns:
+            list(Square): The squares of the attacking pieces
+        """
+        attackers = self.bitboards.attackers(SQUARES[selector], color)
+        return [self.selectors[selectorlist[square]]
+                for square in squares_of(attackers)]
+
+    def is_square_attacked(self, selector, color):
+        """Is a square attacked by any piece of a color.
+
+        Parameters:
+            selector(String): The square to look at (eg. e4)
+            color(colors): The color of the attacking pieces
+
+        Returns:
+            Bool: Is the square attacked
+        """
+        return self.bitboards.is_attacked(SQUARES[selector], color)
+
+    def see(self, move):
+        """Statically evaluate the exchange a capture starts.
+
+        Both sides take turns capturing on the destination of the move with
+        their least valuable attacker, including the pieces behind the ones
+        that capture (x-rays), and stop when capturing doesn't pay. Pins are
+        not taken into account, and no move is made.
+
+        Parameters:
+            move(Move): The move to evaluate (eg. a capture)
+
+        Returns:
+            int: The material the color making the move wins in centipawns,
+                 negative when it loses material
+        """
+        (origin, target) = (move.origin, move.destination)
+        piece = self.selectors[origin].occupant
+        victim = self.selectors[target].occupant
+        removed = BITS[origin]
+
+        gains = [EXCHANGE_VALUES[type(victim)] if victim else 0]
+        if (not victim and isinstance(piece, Pawn)
+                and origin[0] != target[0]):
+            gains[0] = EXCHANGE_VALUES[Pawn]
+            removed |= BITS[target[0] + origin[1]]
+        value = EXCHANGE_VALUES[type(piece)]
+        if move.promote_to:
+            value = EXCHANGE_VALUES[PROMOTION_PIECES[move.promote_to]]
+            gains[0] += value - EXCHANGE_VALUES[Pawn]
+
+        color = colors.BLACK if piece.color == colors.WHITE else colors.WHITE
+        while True:
+            attacker = self.__least_valuable_attacker(target, color, removed)
+            if not attacker:
+                break
+            gains.append(value - gains[-1])
+            (bit, value) = attacker
+            removed |= bit
+            color = colors.BLACK if color == colors.WHITE else colors.WHITE
+
+        while len(gains) > 1:
+            gain = gains.pop()
+            gains[-1] = -max(-gains[-1], gain)
+        return gains[0]
+
+    def __least_valuable_attacker(self, selector, color, removed):
+        """Find the cheapest attacker of a square, skipping removed pieces.
+
+        Sliding pieces look through the removed pieces, so pieces behind
+        the ones that captured join in.
+
+        Returns:
+            tuple(int, int): The bit of the square of the attacker and its
+                             value, or None
+        """
+        occupied = self.bitboards.occupied & ~removed
+        attackers = self.bitboards.attackers(
+            SQUARES[selector], color, occupied) & occupied
+        if not attackers:
+            return None
+
+        pieces = self.bitboards.pieces[color]
+        for kind in EXCHANGE_ORDER:
+            found = attackers & pieces[kind]
+            if found:
+                return (found & -found, EXCHANGE_VALUES[kind])
+        return None
+
     def is_check(self, color=None):
         """Is one of the kings in check.
 
@@ -172,25 +502,18 @@ class Board():
         Returns:
             color: The color of the king that is in check or False
         """
-        if color:
-            color = colors.BLACK if color == colors.WHITE else colors.WHITE
-        pieces = list(self.piece_list(self.squares, color))
-        for piece in pieces:
-            moves = piece.allowed_moves(board=self, check_checking=True)
-            for move in moves:
-                if not move:
-                    continue
+        for king_color in (colors.WHITE, colors.BLACK):
+            if color and color != king_color:
+                continue
 
-                if not move.destination_sq.occupant:
-                    continue
+            selector = self.kings[king_color]
+            if not selector:
+                continue
 
-                if not move.valid:
-                    continue
-
-                if (isinstance(move.destination_sq.occupant, King) and
-                        move.destination_sq.occupant.color != move.origin_sq.
-                        occupant.color):
-                    return move.destination_sq.occupant.color
+            enemy = (colors.BLACK if king_color == colors.WHITE
+                     else colors.WHITE)
+            if self.is_square_attacked(selector, enemy):
+                return king_color
 
         return False
 
@@ -204,18 +527,201 @@ class Board():
         if not check:
             return False
 
-        pieces = list(self.piece_list(self.squares, check))
-        moves = []
-        for i in pieces:
-            for move in i.allowed_moves(board=self, check_checking=True):
-                moves.append(move)
-
-        for move in moves:
-            if not self.new_board(move).is_check(color=check):
-                return False
+        for _ in self.legal_moves(check):
+            return False
 
         return check
 
+    def game_state(self, color=None):
+        """Get the state of the position for a color to move.
+
+        Stops at the first legal move, so positions where the game simply
+        continues only cost one move and a check on the material.
+
+        Parameters:
+            color(colors): Optional: The color to move, defaults to the turn
+
+        Returns:
+            GameState: Checkmate, stalemate, insufficient material or ongoing
+        """
+        color = color or self.turn
+        for _ in self.legal_moves(color):
+            if self.is_insufficient_material():
+                return GameState.INSUFFICIENT_MATERIAL
+            return GameState.ONGOING
+
+        if self.is_check(color):
+            return GameState.CHECKMATE
+        return GameState.STALEMATE
+
+    def is_insufficient_material(self):
+        """Is there too little material left for either side to mate.
+
+        That's the case with only kings and at most one knight or bishop, or
+        with only kings and bishops on squares of the same color.
+
+        Returns:
+            Bool: Can neither side mate anymore
+        """
+        if self.__mating_material:
+            return False
+
+        (white, black) = (self.bitboards.pieces[colors.WHITE],
+                          self.bitboards.pieces[colors.BLACK])
+        minors = self.bitboards.occupied & ~(white[King] | black[King])
+        if not minors & (minors - 1):
+            return True
+        return (minors == white[Bishop] | black[Bishop]
+                and not (minors & bitboard.DARK_SQUARES
+                         and minors & ~bitboard.DARK_SQUARES))
+
+    def has_pieces(self, color):
+        """Check if a color has any pieces besides its king and pawns.
+
+        Without them a color is likely in zugzwang, where any move makes its
+        position worse.
+
+        Parameters:
+            color(colors): The color to look for
+
+        Returns:
+            Bool: Has the color a knight, bishop, rook or queen
+        """
+        return bool(self.__pieces[color])
+
+    def pseudo_legal_moves(self, color=None, encoded=False):
+        """Generate the moves of a color, without checking for self check.
+
+        The moves might leave the king of the color in check. Moves are
+        generated lazily, so consumers only pay for the moves they take.
+        Castling is generated as the king moving two squares (eg. e1g1),
+        and a promotion as a move for every piece it can promote to.
+
+        Parameters:
+            color(colors): Optional: The color to move, defaults to the turn
+            encoded(Bool): Yield the moves as codes from nerdchess.encoding
+
+        Yields:
+            Move: The shared moves from nerdchess.move
+        """
+        color = color or self.turn
+        for (move, flag) in self.__pseudo_legal_moves(color):
+            yield encoding.encode(move, flag=flag) if encoded else move
+
+    def captures(self, color=None, encoded=False):
+        """Generate the captures and queen promotions of a color.
+
+        Like pseudo_legal_moves(), the moves might leave the king of the
+        color in check.
+
+        Parameters:
+            color(colors): Optional: The color to move, defaults to the turn
+            encoded(Bool): Yield the moves as codes from nerdchess.encoding
+
+        Yields:
+            Move: The shared moves from nerdchess.move
+        """
+        color = color or self.turn
+        for (move, flag) in self.__pseudo_legal_moves(color):
+            if (self.selectors[move.destination].occupant
+                    or flag == encoding.EN_PASSANT or move.promote_to == 'q'):
+                yield encoding.encode(move, flag=flag) if encoded else move
+
+    def legal_moves(self, color=None, encoded=False):
+        """Generate the legal moves of a color.
+
+        Like pseudo_legal_moves(), but every move is checked when it's pulled
+        from the generator by making it on the board and taking it back.
+
+        Parameters:
+            color(colors): Optional: The color to move, defaults to the turn
+            encoded(Bool): Yield the moves as codes from nerdchess.encoding
+
+        Yields:
+            Move: The shared moves from nerdchess.move
+        """
+        color = color or self.turn
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        for (move, flag) in self.__pseudo_legal_moves(color):
+            record = self.make_move(move)
+            king = self.kings[color]
+            legal = not king or not self.is_square_attacked(king, enemy)
+            self.unmake_move(record)
+
+            if legal:
+                yield encoding.encode(move, flag=flag) if encoded else move
+
+    def __pseudo_legal_moves(self, color):
+        """Yield the pseudo legal moves of a color with their encoding flag.
+
+        The pieces and the squares they reach come from the bitboards, the
+        pieces are yielded square by square from a1 to h8.
+        """
+        bitboards = self.bitboards
+        own = bitboards.occupancy[color]
+        occupied = bitboards.occupied
+        for square in list(squares_of(own)):
+            origin = selectorlist[square]
+            piece = self.selectors[origin].occupant
+
+            if isinstance(piece, Pawn):
+                yield from self.__pawn_moves(square, color, occupied)
+                continue
+
+            targets = bitboards.attacks(piece, square, occupied) & ~own
+            for target in squares_of(targets):
+                yield (Move.get(origin, selectorlist[target]),
+                       encoding.NORMAL)
+            if isinstance(piece, King):
+                yield from self.__castling_moves(origin, color, occupied)
+
+    def __pawn_moves(self, square, color, occupied):
+        """Yield the pushes, captures and promotions of a pawn."""
+        origin = selectorlist[square]
+        last_row = '8' if color == colors.WHITE else '1'
+        targets = []
+        for target in tables.PAWN_PUSHES[color][origin]:
+            if BITS[target] & occupied:
+                break
+            targets.append((target, encoding.NORMAL))
+
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        attacks = bitboard.PAWN_ATTACKS[color][square]
+        for target in squares_of(attacks & self.bitboards.occupancy[enemy]):
+            targets.append((selectorlist[target], encoding.NORMAL))
+        if (self.en_passant and color == self.turn
+                and attacks & BITS[self.en_passant]):
+            targets.append((self.en_passant, encoding.EN_PASSANT))
+
+        for (target, flag) in targets:
+            if target[1] == last_row:
+                for piece in ('q', 'r', 'b', 'n'):
+                    yield (Move.get(origin, target, piece), flag)
+            else:
+                yield (Move.get(origin, target), flag)
+
+    def __castling_moves(self, origin, color, occupied):
+        """Yield the castling moves of a king on its start square."""
+        row = 1 if color == colors.WHITE else 8
+        if origin != "e{}".format(row):
+            return
+
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        for (side, right, between, passed) in CASTLING_PATHS[color]:
+            if right not in self.castling:
+                continue
+            if not self.__castling_rook(side, color):
+                continue
+            if occupied & between:
+                continue
+            if self.is_square_attacked(origin, enemy):
+                return
+            if any(self.is_square_attacked(selector, enemy)
+                   for selector in passed):
+                continue
+
+            yield (Move.get(origin, passed[1]), encoding.CASTLING)
+
     def new_board(self, move):
         """Create a new board from a supplied move.
 
@@ -230,62 +736,183 @@ class Board():
             newboard: The new board
         """
         newboard = copy.deepcopy(self)
-        old_move = BoardMove(newboard, move.text, rule_check=False)
-        move = BoardMove(newboard, move.text, rule_check=False)
+        newboard.make_move(move.text)
+
+        return newboard
+
+    def castle(self, side, color):
+        """Perform castling on a board.
+
+        Parameters:
+            side(CastleSide): The side to castle to
+            color(Color): The color performing the castle
+
+        Returns:
+            newboard: A new board with the processed move
+        """
+        newboard = copy.deepcopy(self)
+        record = newboard.__castle(side, color)
+        newboard.__update_state(record, 'castle')
+
+        return newboard
+
+    def make_move(self, move):
+        """Process a move on this board in place.
+
+        Like new_board() this does not do any explicit validation on the
+        move, but handles captures, en passant, castling and promotions.
+        Everything that changes is kept in the returned record, so the move
+        can be taken back with unmake_move() without copying the board.
+
+        Parameters:
+            move(Move): The move to process, its text (eg. e2e4 or e7e8q) or
+                        its code from nerdchess.encoding
+
+        Returns:
+            UndoRecord: The record to pass to unmake_move()
+        """
+        if isinstance(move, int):
+            move = encoding.to_text(move)
+        promotion = PROMOTION_PIECES.get(str(move)[4:5])
+        if not isinstance(move, BoardMove) or move.board is not self:
+            move = BoardMove(self, str(move), rule_check=False)
+
+        castling = move.is_castling()
+        if castling and self.__castling_rook(move.castle_side(), castling):
+            record = self.__castle(move.castle_side(), castling)
+        else:
+            record = self.__move(move)
+            if promotion and move.promotion:
+                move.destination_sq.occupant = record.piece.promote(promotion)
+
+        self.__update_state(record, move)
+        return record
+
+    def unmake_move(self, record):
+        """Take back a move processed with make_move().
+
+        Moves have to be taken back in the reverse order they were made in.
+
+        Parameters:
+            record(UndoRecord): The record returned by make_move()
+        """
+        record.destination.occupant = None
+        if record.rook:
+            record.rook_destination.occupant = None
+            record.rook_origin.occupant = record.rook
+            record.rook.position = record.rook_origin.selector
+            record.rook.last_move = record.rook_last_move
+
+        record.origin.occupant = record.piece
+        record.piece.position = record.origin.selector
+        record.piece.last_move = record.piece_last_move
+
+        if record.captured:
+            record.capture_square.occupant = record.captured
+            record.captured.captured = False
+
+        self.turn = record.turn
+        self.castling = record.castling
+        self.en_passant = record.en_passant
+        self.halfmove_clock = record.halfmove_clock
+        self.fullmove_number = record.fullmove_number
+        self.last_move = record.last_move
+
+    def make_null_move(self):
+        """Pass the turn to the other color without moving.
+
+        Not a move in chess, but searches use it to see whether the other
+        color can do any harm at all. The en passant square is cleared.
+
+        Returns:
+            String: The en passant square, to pass to unmake_null_move()
+        """
+        en_passant = self.en_passant
+        self.en_passant = None
+        self.turn = (colors.BLACK if self.turn == colors.WHITE
+                     else colors.WHITE)
+        return en_passant
+
+    def unmake_null_move(self, en_passant):
+        """Take back a null move made with make_null_move().
 
+        Parameters:
+            en_passant(String): The en passant square make_null_move()
+                                returned
+        """
+        self.en_passant = en_passant
+        self.turn = (colors.BLACK if self.turn == colors.WHITE
+                     else colors.WHITE)
+
+    def __move(self, move):
+        """Move a piece in place, capturing what's in its way.
+
+        Parameters:
+            move(BoardMove): The move to process
+
+        Returns:
+            UndoRecord: The record of the processed move
+        """
         piece = move.origin_sq.occupant
+        capture_square = move.destination_sq
+        if move.enpassant:
+            capture_square = self.squares[move.destination[0]][
+                int(move.origin[1])]
 
-        move.origin_sq.occupant = None
-        if move.destination_sq.occupant:
-            move.destination_sq.occupant.captured = True
-        if old_move.enpassant:
-            d_letter = old_move.destination[0]
-            o_number = int(old_move.origin[1])
-            pass_sq = newboard.squares[d_letter][o_number]
+        record = UndoRecord(self, move.origin_sq, move.destination_sq,
+                            piece, capture_square.occupant, capture_square)
 
-            pass_sq.occupant.captured = True
-            pass_sq.occupant = None
+        if record.captured:
+            record.captured.captured = True
+            capture_square.occupant = None
 
+        move.origin_sq.occupant = None
         move.destination_sq.occupant = piece
         piece.position = move.destination_sq.selector
         piece.last_move = move
 
-        return newboard
+        return record
 
-    def castle(self, side, color):
-        """Perform castling on a board.
+    def __castling_rook(self, side, color):
+        """Get the rook to castle with, if it's in place."""
+        row = 1 if color == colors.WHITE else 8
+        char = 'a' if side == CastleSide.QUEEN else 'h'
+        rook = self.squares[char][row].occupant
+
+        if isinstance(rook, Rook) and rook.color == color:
+            return rook
+        return None
+
+    def __castle(self, side, color):
+        """Perform castling in place.
 
         Parameters:
             side(CastleSide): The side to castle to
             color(Color): The color performing the castle
 
         Returns:
-            newboard: A new board with the processed move
+            UndoRecord: The record of the processed castle
         """
-        newboard = copy.deepcopy(self)
-
-        if color == colors.WHITE:
-            kingsquare = newboard.squares['e'][1]
-            if side == CastleSide.QUEEN:
-                rooksquare = newboard.squares['a'][1]
-            else:
-                rooksquare = newboard.squares['h'][1]
+        row = 1 if color == colors.WHITE else 8
+        kingsquare = self.squares['e'][row]
+        if side == CastleSide.QUEEN:
+            rooksquare = self.squares['a'][row]
         else:
-            kingsquare = newboard.squares['e'][8]
-            if side == CastleSide.QUEEN:
-                rooksquare = newboard.squares['a'][8]
-            else:
-                rooksquare = newboard.squares['h'][8]
+            rooksquare = self.squares['h'][row]
 
         kchar = 'c' if side == CastleSide.QUEEN else 'g'
         rchar = 'd' if side == CastleSide.QUEEN else 'f'
-        kint = 1 if color == colors.WHITE else 8
-        rint = 1 if color == colors.WHITE else 8
-        king_dest = newboard.squares[kchar][kint]
-        rook_dest = newboard.squares[rchar][rint]
+        king_dest = self.squares[kchar][row]
+        rook_dest = self.squares[rchar][row]
 
         king = kingsquare.occupant
         rook = rooksquare.occupant
+        record = UndoRecord(self, kingsquare, king_dest, king)
+        record.rook = rook
+        record.rook_origin = rooksquare
+        record.rook_destination = rook_dest
+        record.rook_last_move = rook.last_move
+
         kingsquare.occupant = None
         rooksquare.occupant = None
 
@@ -297,35 +924,130 @@ class Board():
         king.last_move = 'castle'
         rook.last_move = 'castle'
 
-        return newboard
+        return record
+
+    def __update_state(self, record, move):
+        """Update castling rights and en passant after a move."""
+        origin = record.origin.selector
+        destination = record.destination.selector
+        for selector in (origin, destination):
+            for char in CASTLING_SQUARES.get(selector, ''):
+                self.castling = self.castling.replace(char, '')
+
+        self.en_passant = None
+        self.halfmove_clock += 1
+        if isinstance(record.piece, Pawn) or record.captured:
+            self.halfmove_clock = 0
+        if record.piece.color == colors.BLACK:
+            self.fullmove_number += 1
+        if (isinstance(record.piece, Pawn)
+                and abs(int(destination[1]) - int(origin[1])) == 2):
+            skipped = (int(origin[1]) + int(destination[1])) // 2
+            self.en_passant = "{}{}".format(origin[0], skipped)
+
+        self.turn = (colors.BLACK if record.piece.color == colors.WHITE
+                     else colors.WHITE)
+        self.last_move = move
 
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = Board()
-        obj.squares = copy.deepcopy(self.squares)
+        for letter, column in self.squares.items():
+            for number, square in column.items():
+                if square.occupant:
+                    obj.squares[letter][number].occupant = copy.deepcopy(
+                        square.occupant)
+        obj.turn = self.turn
+        obj.castling = self.castling
+        obj.en_passant = self.en_passant
+        obj.halfmove_clock = self.halfmove_clock
+        obj.fullmove_number = self.fullmove_number
+        obj.last_move = self.last_move
         obj.__create_board = None
 
         return obj
 
 
+class UndoRecord():
+    """Everything needed to take back a move made with Board.make_move().
+
+    Parameters:
+        board(Board): The board the move was made on
+        origin(Square): The square the piece moved from
+        destination(Square): The square the piece moved to
+        piece(Piece): The piece that moved
+        captured(Piece): The captured piece, if any
+        capture_square(Square): The square of the captured piece
+
+    Attributes:
+        piece_last_move(Move): The last move of the piece before this one
+        rook(Rook): The rook that moved along when castling
+        turn(colors): The color to move before the move
+        castling(String): The castling rights before the move
+        en_passant(String): The en passant square before the move
+        halfmove_clock(int): The halfmove clock before the move
+        fullmove_number(int): The fullmove number before the move
+        last_move(Move): The last move of the board before this one
+    """
+
+    __slots__ = ('origin', 'destination', 'piece', 'piece_last_move',
+                 'captured', 'capture_square', 'rook', 'rook_origin',
+                 'rook_destination', 'rook_last_move', 'turn', 'castling',
+                 'en_passant', 'halfmove_clock', 'fullmove_number',
+                 'last_move')
+
+    def __init__(self, board, origin, destination, piece,
+                 captured=None, capture_square=None):
+        """Init."""
+        self.origin = origin
+        self.destination = destination
+        self.piece = piece
+        self.piece_last_move = piece.last_move
+        self.captured = captured
+        self.capture_square = capture_square
+        self.rook = None
+        self.turn = board.turn
+        self.castling = board.castling
+        self.en_passant = board.en_passant
+        self.halfmove_clock = board.halfmove_clock
+        self.fullmove_number = board.fullmove_number
+        self.last_move = board.last_move
+
+
 class Square():
     """Represents a square on a chessboard.
 
     Parameters:
         selector(String): A selector of the square (eg. a1)
         occupant(Piece): Usually a piece or pawn, needs to implement __str__
+        board(Board): Optional: The board to notify of changes
 
     Attributes:
         selector(String): A selector of the square (eg. a1)
         occupant(Piece): Usually a piece or pawn, needs to implement __str__
+        board(Board): The board this square is part of, or None
     """
 
-    def __init__(self, selector, color, occupant=None):
+    def __init__(self, selector, color, occupant=None, board=None):
         """Init."""
         self.selector = selector
+        self.board = board
+        self._occupant = None
         self.occupant = occupant
         self.color = color
 
+    @property
+    def occupant(self):
+        """The piece or pawn on this square."""
+        return self._occupant
+
+    @occupant.setter
+    def occupant(self, piece):
+        """Place a piece on this square, letting the board know."""
+        if self.board is not None:
+            self.board.update_square(self.selector, self._occupant, piece)
+        self._occupant = piece
+
     def __str__(self):
         """Text representation of a square.
 
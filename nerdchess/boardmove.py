@@ -2,25 +2,22 @@
 
 This module glues moves and a board together.
 """
-from nerdchess import pieces
-from nerdchess.move import Move
-from nerdchess.config import colors
+from nerdchess import encoding, pieces
+from nerdchess.move import Move, PROMOTIONS
+from nerdchess.config import MOVE_REGEX, colors, CastleSide
 from nerdchess.boardrules import BoardRules
-from enum import Enum
 
-
-class CastleSide(Enum):
-    """Enumerator with castling sides."""
-
-    QUEEN = 'queenside'
-    KING = 'kingside'
+CASTLING_MOVES = frozenset([
+    'e1g1', 'e1h1', 'e1c1', 'e1b1', 'e1a1', 'h1e1', 'a1e1',
+    'e8g8', 'e8h8', 'e8c8', 'e8b8', 'e8a8', 'h8e8', 'a8e8',
+])
 
 
 class BoardMove(Move):
     """Represents a move in the context of a board.
 
-    Inherits base class (Move) attributes.
-    And adds some new ones.
+    Inherits base class (Move) attributes, taken over from the shared move
+    in nerdchess.move.MOVE_TABLE. And adds some new ones.
 
     Parameters:
         board(Board): The board we're playing on.
@@ -29,13 +26,22 @@ class BoardMove(Move):
         board(Board): The boardcontext.
         origin_sq(Square): The origin square.
         destination_sq(Square): The destination square.
-        valid(Bool): Is this move considered valid.
+        valid(Bool): Is this move considered valid, None when it was
+                     created without checking the rules.
     """
 
-    def __init__(self, board, *args,
+    # Unlike shared moves, a boardmove belongs to a single board and
+    # can be changed like any other object.
+    __setattr__ = object.__setattr__
+    __reduce__ = object.__reduce__
+
+    def __init__(self, board, move, *args,
                  rule_check=True, check_checking=False, **kwargs):
         """Init."""
-        super().__init__(*args, **kwargs)
+        if not MOVE_REGEX.match(move):
+            raise ValueError('Invalid move')
+        promote_to = move[4:5] if move[4:5] in PROMOTIONS else None
+        self.share(Move.get(move[:2], move[2:4], promote_to))
 
         self.board = board
         (self.origin_sq,
@@ -43,24 +49,37 @@ class BoardMove(Move):
         self.enpassant = self.__is_enpassant()
         self.promotion = self.__promotion()
 
+        self.valid = None
         if rule_check:
             rules = BoardRules(self, check_checking=check_checking)
             self.valid = rules.valid
 
+    @classmethod
+    def from_code(cls, board, code, **kwargs):
+        """Create a boardmove from a move encoded with nerdchess.encoding.
+
+        Parameters:
+            board(Board): The board to play the move on
+            code(int): The encoded move
+            kwargs: Passed on to BoardMove (eg. rule_check=False)
+
+        Returns:
+            BoardMove: The move on the board
+        """
+        return cls(board, encoding.to_text(code), **kwargs)
+
+    def encode(self):
+        """Encode this move as an integer, see nerdchess.encoding."""
+        return encoding.encode(self)
+
     def squares_between(self):
         """Get the squares between origin and destination of this move.
 
         Yields:
             Square: The squares between origin and destination of this move.
         """
-        try:
-            for selector in self.square_selectors_between():
-                c = selector[0]
-                i = int(selector[1])
-
-                yield self.board.squares[c][i]
-        except ValueError:
-            pass
+        for selector in self._between:
+            yield self.board.selectors[selector]
 
     def castle_side(self):
         """Return the side we're castling to."""
@@ -68,7 +87,7 @@ class BoardMove(Move):
         if not castling:
             raise Exception('Trying to determine castleside but not castling.')
 
-        if self.horizontal > 0:
+        if self.origin[0] == 'h' or self.destination[0] in ('g', 'h'):
             return CastleSide.KING
         else:
             return CastleSide.QUEEN
@@ -89,36 +108,19 @@ class BoardMove(Move):
         piece = self.origin_sq.occupant
         is_king = isinstance(piece, pieces.King)
         is_rook = isinstance(piece, pieces.Rook)
-        castling_moves = [
-            Move('e1g1'),
-            Move('e1h1'),
-            Move('e1c1'),
-            Move('e1b1'),
-            Move('e1a1'),
-            Move('h1e1'),
-            Move('a1e1'),
-            Move('e8g8'),
-            Move('e8h8'),
-            Move('e8c8'),
-            Move('e8b8'),
-            Move('e8a8'),
-            Move('h8e8'),
-            Move('a8e8')
-        ]
 
         if not is_king and not is_rook:
             return False
 
-        if piece.color == colors.WHITE:
-            king = pieces.King(colors.WHITE)
-            if self.board.squares['e'][1].occupant != king:
-                return False
-        else:
-            king = pieces.King(colors.BLACK)
-            if self.board.squares['e'][8].occupant != king:
-                return False
+        if self.text not in CASTLING_MOVES:
+            return False
 
-        if self not in castling_moves:
+        # Only moves on the back row of the moving color castle
+        row = 1 if piece.color == colors.WHITE else 8
+        if int(self.origin[1]) != row:
+            return False
+        king = self.board.squares['e'][row].occupant
+        if not isinstance(king, pieces.King) or king.color != piece.color:
             return False
 
         return piece.color
@@ -155,7 +157,10 @@ class BoardMove(Move):
         pass_sq = self.board.squares[d_letter][o_number]
 
         if (isinstance(pass_sq.occupant, pieces.Pawn)
-           and pass_sq.occupant.color != self.origin_sq.occupant):
+           and pass_sq.occupant.color != self.origin_sq.occupant.color):
+            # Boards that have seen moves know which pawn just passed
+            if self.board.en_passant or self.board.last_move is not None:
+                return self.destination == self.board.en_passant
             if pass_sq.occupant.last_move:
                 if (pass_sq.occupant.last_move.vertical == 2
                         or pass_sq.occupant.last_move.vertical == -2):
@@ -173,14 +178,8 @@ class BoardMove(Move):
         Returns:
             tuple(Square, Square): The origin and destination
         """
-        o_letter = str(self.origin[0])
-        o_number = int(self.origin[1])
-
-        d_letter = str(self.destination[0])
-        d_number = int(self.destination[1])
-
-        origin = self.board.squares[o_letter][o_number]
-        destination = self.board.squares[d_letter][d_number]
+        origin = self.board.selectors[self.origin]
+        destination = self.board.selectors[self.destination]
 
         return (origin, destination)
 
@@ -193,16 +192,7 @@ class BoardMove(Move):
         """
         piece = self.origin_sq.occupant
 
-        if self.origin_sq == self.destination_sq:
-            return False
-
-        if not piece:
-            return False
-
-        if Move(self.text) not in piece.allowed_moves():
-            return False
-
-        if not self.valid:
+        if not self.__is_allowed(piece):
             return False
 
         castling = self.is_castling()
@@ -216,3 +206,41 @@ class BoardMove(Move):
             return False
 
         return newboard
+
+    def make(self):
+        """Process this move on its board in place, like process().
+
+        Moves created with rule_check=False are checked against the rules
+        here, making the move takes the place of the check for self check.
+
+        Returns:
+            UndoRecord: The record to take the move back with, see
+                        Board.unmake_move(), or None if the move is incorrect
+        """
+        piece = self.origin_sq.occupant
+
+        if not self.__is_allowed(piece):
+            return None
+
+        record = self.board.make_move(self)
+        if self.board.is_check(color=piece.color) == piece.color:
+            self.board.unmake_move(record)
+            return None
+
+        return record
+
+    def __is_allowed(self, piece):
+        """Check the move against the rules, leaving checks aside."""
+        if self.origin_sq == self.destination_sq:
+            return False
+
+        if not piece:
+            return False
+
+        if (Move.get(self.origin, self.destination)
+                not in piece.allowed_moves()):
+            return False
+
+        if self.valid is None:
+            self.valid = BoardRules(self, self_checking=False).valid
+        return bool(self.valid)
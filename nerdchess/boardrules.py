@@ -1,6 +1,7 @@
 """Helps check for valid moves in the context of a board."""
 
 from nerdchess import pieces
+from nerdchess.config import colors, CastleSide
 from nerdchess.move import Move
 
 
@@ -9,6 +10,9 @@ class BoardRules():
 
     Parameters:
         move: The boardmove to check against
+        self_checking(Bool): Make the move to check if it leaves the king
+                             in check, for callers that don't make it
+                             themselves
 
     Attributes:
         move: The move we're checking
@@ -18,13 +22,15 @@ class BoardRules():
         piece: The piece being moved
     """
 
-    def __init__(self, move, debug=False, check_checking=False):
+    def __init__(self, move, debug=False, check_checking=False,
+                 self_checking=True):
         """Init."""
         self.move = move
         self.valid = True
         self.piece = self.move.origin_sq.occupant
         self.debug = debug
         self.check_checking = check_checking
+        self.self_checking = self_checking
         self.apply()
 
     def apply(self):
@@ -71,23 +77,45 @@ class BoardRules():
 
     def __self_checking(self):
         """Check if the move puts the player itself in check."""
-        try:
-            if not self.check_checking:
-                newboard = self.move.board.new_board(self.move)
-                if newboard.is_check(
-                        color=self.piece.color) == self.piece.color:
-                    self.valid = False
-        except AttributeError:
+        if self.check_checking or not self.self_checking:
+            return
+        if not self.piece:
+            self.valid = False
+            return
+
+        board = self.move.board
+        record = board.make_move(self.move)
+        if board.is_check(color=self.piece.color) == self.piece.color:
             self.valid = False
+        board.unmake_move(record)
 
     def __castling(self):
         """Apply rules specific to castling."""
         pattern = []
+        board = self.move.board
+        side = self.move.castle_side()
+
+        right = 'K' if side == CastleSide.KING else 'Q'
+        if self.piece.color == colors.BLACK:
+            right = right.lower()
+        if right not in board.castling:
+            self.valid = False
+            return
+
+        row = 1 if self.piece.color == colors.WHITE else 8
+        rook = board.squares['h' if right in 'Kk' else 'a'][row].occupant
+        if not isinstance(rook, pieces.Rook) or rook.color != self.piece.color:
+            self.valid = False
+            return
+
+        if board.is_check() == self.piece.color:
+            self.valid = False
 
-        if self.move.board.is_check() == self.piece.color:
+        if side == CastleSide.QUEEN and board.squares['b'][row].occupant:
             self.valid = False
 
-        if self.move.horizontal > 0:
+        king = board.squares['e'][row].occupant
+        if side == CastleSide.KING:
             pattern = [
                 (1, 0),
                 (2, 0)
@@ -98,13 +126,13 @@ class BoardRules():
                 (-2, 0)
             ]
 
+        enemy = (colors.BLACK if self.piece.color == colors.WHITE
+                 else colors.WHITE)
         for move in pattern:
-            inter_move = Move.from_position(self.piece.position, move)
-            inter_board = self.move.board.new_board(inter_move)
-            if inter_board.is_check() == self.piece.color:
-                self.valid = False
-
-            dest_sq = self.move.board.squares[
+            inter_move = Move.from_position(king.position, move)
+            dest_sq = board.squares[
                 str(inter_move.destination[0])][int(inter_move.destination[1])]
             if dest_sq.occupant:
                 self.valid = False
+            elif board.is_square_attacked(dest_sq.selector, enemy):
+                self.valid = False
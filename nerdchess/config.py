@@ -4,6 +4,8 @@ Attributes:
     MOVE_REGEX (Regex): Regex to validate a move.
     numbers (list(int)): List of numbers of a chessboard.
     letterlijst (list(letter(Enum))): List of letters of a chessboard.
+    selectorlist (list(String)): Selectors of all squares, ordered a1, b1 ..
+                                 h8. The list index is the square number.
 """
 from enum import Enum
 import re
@@ -16,6 +18,38 @@ class colors(Enum):
     BLACK = 'b'
 
 
+class CastleSide(Enum):
+    """Enumerator with castling sides."""
+
+    QUEEN = 'queenside'
+    KING = 'kingside'
+
+
+class GameState(Enum):
+    """The state of a position for the color to move."""
+
+    ONGOING = 'ongoing'
+    CHECKMATE = 'checkmate'
+    STALEMATE = 'stalemate'
+    INSUFFICIENT_MATERIAL = 'insufficient material'
+
+
+class DrawReason(Enum):
+    """The rules a game of chess can be drawn by."""
+
+    THREEFOLD_REPETITION = 'threefold repetition'
+    FIVEFOLD_REPETITION = 'fivefold repetition'
+    FIFTY_MOVES = 'fifty-move rule'
+    SEVENTY_FIVE_MOVES = 'seventy-five-move rule'
+
+
+class ReplacementPolicy(Enum):
+    """Which entry stays when two positions share a transposition slot."""
+
+    DEPTH_PREFERRED = 'depth-preferred'
+    ALWAYS = 'always'
+
+
 class letters(Enum):
     """The letters of a chess board."""
 
@@ -32,3 +66,5 @@ class letters(Enum):
 MOVE_REGEX = re.compile(r"[a-h][1-8][a-h][1-8]")
 numbers = range(1, 9)
 letterlist = [i.value for i in letters]
+selectorlist = ["{}{}".format(letter, number)
+                for number in numbers for letter in letterlist]
@@ -0,0 +1,119 @@
+"""Encode moves as small integers.
+
+A move object holds a string, its geometry and (for boardmoves) references to
+a board and its squares. Search trees, transposition tables and game histories
+only need to know which move it was, which fits in 16 bits:
+
+    bits 0-5: The origin square (the index in config.selectorlist)
+    bits 6-11: The destination square
+    bits 12-13: The piece to promote to (n, b, r, q)
+    bits 14-15: Flags, one of NORMAL, PROMOTION, EN_PASSANT or CASTLING
+
+Codes fit in an array('H'), two bytes per move. Use BoardMove.from_code() to
+play a code on a board.
+
+Example:
+    >>> code = encoding.encode('e7e8q')
+    >>> encoding.to_text(code)
+    'e7e8q'
+    >>> encoding.decode(code) is Move.get('e7', 'e8')
+    True
+
+Attributes:
+    NORMAL (int): Flag of a regular move or capture.
+    PROMOTION (int): Flag of a pawn promoting, see PROMOTION_CHARS.
+    EN_PASSANT (int): Flag of a pawn capturing en passant.
+    CASTLING (int): Flag of a king castling.
+    PROMOTION_CHARS (String): The promotion pieces by their 2 bit index.
+    SQUARE_INDEX (dict): The index of each square selector.
+"""
+from nerdchess.config import selectorlist
+from nerdchess.move import Move
+
+NORMAL = 0
+PROMOTION = 1
+EN_PASSANT = 2
+CASTLING = 3
+
+PROMOTION_CHARS = 'nbrq'
+SQUARE_INDEX = {selector: index for index, selector in enumerate(selectorlist)}
+
+
+def encode(move, promotion=None, flag=None):
+    """Encode a move as an integer.
+
+    Boardmoves are encoded with the flags of their board context. Pawns
+    reaching the last row without a promotion piece are encoded as a normal
+    move, like the board that still holds the pawn until it's promoted.
+
+    Parameters:
+        move(Move): The move, boardmove or move text (eg. e2e4 or e7e8q)
+        promotion(String): Optional: The piece to promote to (n, b, r or q)
+        flag(int): Optional: The flag of a move without board context (eg.
+                   EN_PASSANT)
+
+    Returns:
+        int: The encoded move
+    """
+    if isinstance(move, int):
+        return move
+
+    text = str(move)
+    try:
+        code = SQUARE_INDEX[text[:2]] | SQUARE_INDEX[text[2:4]] << 6
+    except KeyError:
+        raise ValueError('Invalid move')
+
+    if flag in (EN_PASSANT, CASTLING):
+        return code | flag << 14
+
+    promotion = promotion or text[4:5]
+    if getattr(move, 'board', None) is not None and not promotion:
+        if move.enpassant:
+            return code | EN_PASSANT << 14
+        if move.is_castling():
+            return code | CASTLING << 14
+
+    if promotion:
+        if promotion not in PROMOTION_CHARS:
+            raise ValueError('Invalid promotion')
+        code |= PROMOTION << 14 | PROMOTION_CHARS.index(promotion) << 12
+
+    return code
+
+
+def decode(code):
+    """Decode an integer to the shared move between its squares.
+
+    Parameters:
+        code(int): The encoded move
+
+    Returns:
+        Move: The move from nerdchess.move.MOVE_TABLE
+    """
+    return Move.get(selectorlist[code & 63], selectorlist[code >> 6 & 63])
+
+
+def flags(code):
+    """Return the flags of an encoded move (eg. CASTLING)."""
+    return code >> 14
+
+
+def promotes_to(code):
+    """Return the piece an encoded move promotes to (eg. q), or None."""
+    if code >> 14 != PROMOTION:
+        return None
+    return PROMOTION_CHARS[code >> 12 & 3]
+
+
+def to_text(code):
+    """Return the text of an encoded move, including its promotion.
+
+    Parameters:
+        code(int): The encoded move
+
+    Returns:
+        String: The move text (eg. e2e4 or e7e8q)
+    """
+    text = selectorlist[code & 63] + selectorlist[code >> 6 & 63]
+    return text + (promotes_to(code) or '')
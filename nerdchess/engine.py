@@ -0,0 +1,650 @@
+"""Search for the best move on a board.
+
+The engine searches the tree of legal moves with negamax alpha-beta, one
+depth at a time (iterative deepening). Every iteration starts with the best
+move of the last one, and the result of the last complete iteration is kept
+when the search runs out of nodes or time:
+
+    >>> result = Engine().search(board, depth=4, seconds=5)
+    >>> result.move, result.score, result.pv, result.nps
+
+An EnginePlayer plays its moves in a ChessGame with an engine:
+
+    >>> player = EnginePlayer('computer', colors.BLACK, False, depth=3)
+    >>> player.play(chessgame)
+
+Results of searched positions are kept in a TranspositionTable, which
+lives as long as the engine, so later searches profit from earlier ones.
+Moves are searched in the order of a MoveOrdering, which learns from the
+cutoffs of the search.
+
+At the end of every line the engine keeps searching captures until the
+position is quiet (quiescence search), so it doesn't stop right before
+losing a piece. Captures that lose material by their static exchange
+evaluation (Board.see) are skipped without making them.
+
+Not every move is searched equally deep (selective search), see
+SearchParameters:
+
+    - Null-move pruning: When passing the turn still scores at least beta,
+      the position is good enough without searching its moves
+    - Late move reductions: Quiet moves late in the order are searched
+      shallower first, and only searched again when they raise alpha
+    - Futility pruning: Close to the horizon, quiet moves are skipped when
+      the evaluation is too far below alpha to reach it
+
+The module can also be run from the commandline, see main().
+
+Attributes:
+    MATE_SCORE (int): The score of mating, minus the plies it takes.
+    INFINITY (int): A score higher than any position can get.
+    MAX_DEPTH (int): The deepest iteration of a search.
+    DEFAULT_DEPTH (int): The depth to search without any limits.
+    NULL_MOVE_REDUCTION (int): The default plies a null move is reduced by.
+    NULL_MOVE_DEPTH (int): The default least depth to try a null move at.
+    LMR_MOVES (int): The default amount of moves searched to full depth
+                     before reducing.
+    LMR_DEPTH (int): The default least depth to reduce moves at.
+    FUTILITY_MARGINS (tuple(int)): The default margins of futility
+                                   pruning, by depth.
+"""
+import argparse
+import sys
+import time
+from tabulate import tabulate
+from nerdchess import encoding, evaluation, game_event
+from nerdchess.board import Board, START_FEN
+from nerdchess.config import colors
+from nerdchess.move import Move
+from nerdchess.ordering import MoveOrdering
+from nerdchess.player import Player
+from nerdchess.transposition import (EXACT, LOWER, UPPER,
+                                     TranspositionTable)
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+MAX_DEPTH = 64
+DEFAULT_DEPTH = 4
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_DEPTH = 3
+LMR_MOVES = 3
+LMR_DEPTH = 3
+FUTILITY_MARGINS = (200, 500)
+
+
+class SearchResult():
+    """The result of a search.
+
+    Attributes:
+        move(Move): The best move, or None without legal moves
+        score(int): The score of the best move in centipawns for the color
+                    to move, or MATE_SCORE minus the plies to mate
+        pv(list(Move)): The principal variation, the moves expected to be
+                        played starting with the best move
+        depth(int): The depth of the last complete iteration
+        nodes(int): The amount of positions visited
+        seconds(float): The time the search took
+    """
+
+    def __init__(self, move, score, pv, depth, nodes, seconds):
+        """Init."""
+        self.move = move
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+
+    @property
+    def nps(self):
+        """The amount of positions visited per second."""
+        return int(self.nodes / self.seconds) if self.seconds else 0
+
+    @property
+    def mate_in(self):
+        """The moves until mate, negative when getting mated, or None."""
+        if abs(self.score) < MATE_SCORE - MAX_DEPTH:
+            return None
+        plies = MATE_SCORE - abs(self.score)
+        moves = (plies + 1) // 2
+        return moves if self.score > 0 else -moves
+
+    def __str__(self):
+        """Text representation of the result."""
+        return "depth {} score {} nodes {} nps {} pv {}".format(
+            self.depth, self.score, self.nodes, self.nps,
+            ' '.join(str(move) for move in self.pv))
+
+
+class SearchParameters():
+    """The tunable parameters of the selective search of an engine.
+
+    Setting the reduction of null moves, the amount of moves before
+    reducing or the margins of futility pruning to 0 (or empty) turns that
+    technique off.
+
+    Parameters:
+        null_move_reduction(int): Optional: The plies a null move is
+                                  searched less deep than other moves
+        null_move_depth(int): Optional: The least depth to try a null
+                              move at
+        lmr_moves(int): Optional: The amount of moves searched to full
+                        depth before late moves are reduced
+        lmr_depth(int): Optional: The least depth to reduce moves at
+        futility_margins(tuple(int)): Optional: The margin in centipawns a
+                                      quiet move may raise the evaluation
+                                      by, for depth 1, 2 and so on
+
+    Attributes:
+        null_move_reduction(int): The plies a null move is searched less
+                                  deep than other moves
+        null_move_depth(int): The least depth to try a null move at
+        lmr_moves(int): The amount of moves searched to full depth before
+                        late moves are reduced
+        lmr_depth(int): The least depth to reduce moves at
+        futility_margins(tuple(int)): The margin in centipawns a quiet move
+                                      may raise the evaluation by, by depth
+    """
+
+    def __init__(self, null_move_reduction=NULL_MOVE_REDUCTION,
+                 null_move_depth=NULL_MOVE_DEPTH, lmr_moves=LMR_MOVES,
+                 lmr_depth=LMR_DEPTH, futility_margins=FUTILITY_MARGINS):
+        """Init."""
+        self.null_move_reduction = null_move_reduction
+        self.null_move_depth = null_move_depth
+        self.lmr_moves = lmr_moves
+        self.lmr_depth = lmr_depth
+        self.futility_margins = tuple(futility_margins)
+
+    @classmethod
+    def full_width(cls):
+        """Return parameters that turn off all selective search."""
+        return cls(null_move_reduction=0, lmr_moves=0, futility_margins=())
+
+
+class _Stop(Exception):
+    """The search ran out of nodes or time."""
+
+
+class Engine():
+    """Negamax alpha-beta search with iterative deepening.
+
+    Parameters:
+        evaluate(function): Optional: Scores a board for the color to move,
+                            defaults to nerdchess.evaluation.evaluate
+        table(TranspositionTable): Optional: The table to keep results in,
+                                   defaults to a new table
+        ordering(MoveOrdering): Optional: The order to search moves in,
+                                defaults to a new ordering
+        parameters(SearchParameters): Optional: The parameters of the
+                                      selective search, defaults to the
+                                      default parameters
+
+    Attributes:
+        evaluate(function): Scores a board for the color to move
+        table(TranspositionTable): The table results are kept in
+        ordering(MoveOrdering): The order moves are searched in
+        parameters(SearchParameters): The parameters of the selective
+                                      search
+        nodes(int): The positions visited in the current or last search
+        qnodes(int): The part of the nodes visited by the quiescence search
+        see_pruned(int): The captures skipped by the quiescence search for
+                         losing material
+        null_moves(int): The null moves searched
+        null_cutoffs(int): The null moves that scored at least beta
+        reductions(int): The late moves searched less deep
+        researches(int): The reduced moves searched again to full depth
+        futility_pruned(int): The quiet moves skipped as futile
+    """
+
+    def __init__(self, evaluate=evaluation.evaluate, table=None,
+                 ordering=None, parameters=None):
+        """Init."""
+        self.evaluate = evaluate
+        self.table = table if table is not None else TranspositionTable()
+        self.ordering = ordering if ordering is not None else MoveOrdering()
+        self.parameters = parameters or SearchParameters()
+        self.reset_stats()
+        self.__max_nodes = None
+        self.__deadline = None
+        self.__seen = {}
+
+    def search(self, board, depth=None, nodes=None, seconds=None,
+               history=(), callback=None):
+        """Search the best move for the color to move.
+
+        Without any limit the search goes DEFAULT_DEPTH plies deep.
+
+        Parameters:
+            board(Board): The board to search, it's restored afterwards
+            depth(int): Optional: The deepest iteration
+            nodes(int): Optional: The most positions to visit
+            seconds(float): Optional: The longest time to search
+            history(iterable(int)): The keys of the positions before this
+                                    one, to score repetitions as a draw
+            callback(function): Optional: Called with the SearchResult of
+                                every complete iteration
+
+        Returns:
+            SearchResult: The result of the last complete iteration
+
+        Raises:
+            ValueError: When a limit is 0 or less
+        """
+        start = time.perf_counter()
+        if any(limit is not None and limit <= 0
+               for limit in (depth, nodes, seconds)):
+            raise ValueError('Search limits have to be positive')
+        if depth is None and nodes is None and seconds is None:
+            depth = DEFAULT_DEPTH
+        if depth is None:
+            depth = MAX_DEPTH
+        self.reset_stats()
+        self.__max_nodes = nodes
+        self.__deadline = start + seconds if seconds is not None else None
+        self.__seen = {}
+        self.table.new_search()
+        self.ordering.new_search()
+        for key in history:
+            self.__seen[key] = self.__seen.get(key, 0) + 1
+
+        moves = list(board.legal_moves())
+        if not moves:
+            score = -MATE_SCORE if board.is_check(board.turn) else 0
+            return SearchResult(None, score, [], 0, 0, 0.0)
+
+        result = SearchResult(moves[0], 0, [moves[0]], 0, 0, 0.0)
+        for current in range(1, min(depth, MAX_DEPTH) + 1):
+            try:
+                (score, pv) = self.__root(board, current, moves)
+            except _Stop:
+                break
+
+            result = SearchResult(pv[0], score, pv, current, self.nodes,
+                                  time.perf_counter() - start)
+            if callback:
+                callback(result)
+            moves.remove(pv[0])
+            moves.insert(0, pv[0])
+            if result.mate_in is not None:
+                break
+
+        result.nodes = self.nodes
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def reset_stats(self):
+        """Set the counters of nodes and pruned moves to 0."""
+        self.nodes = 0
+        self.qnodes = 0
+        self.see_pruned = 0
+        self.null_moves = 0
+        self.null_cutoffs = 0
+        self.reductions = 0
+        self.researches = 0
+        self.futility_pruned = 0
+
+    def stats(self):
+        """Return the text of the counters of nodes and pruned moves."""
+        return ("{} nodes, {} in quiescence, {} captures pruned by SEE, "
+                "{} null move cutoffs of {}, {} reductions, {} searched "
+                "again, {} futile moves pruned".format(
+                    self.nodes, self.qnodes, self.see_pruned,
+                    self.null_cutoffs, self.null_moves, self.reductions,
+                    self.researches, self.futility_pruned))
+
+    def __root(self, board, depth, moves):
+        """Search the moves of the root position one iteration deep."""
+        (alpha, pv) = (-INFINITY, [])
+        self.__push(board.key)
+        try:
+            for move in moves:
+                line = []
+                record = board.make_move(move)
+                try:
+                    score = -self.__negamax(board, depth - 1, -INFINITY,
+                                            -alpha, 1, line)
+                finally:
+                    board.unmake_move(record)
+
+                if score > alpha:
+                    (alpha, pv) = (score, [move] + line)
+        finally:
+            self.__pop(board.key)
+
+        self.table.store(board.key, depth, EXACT, _to_table(alpha, 0),
+                         encoding.encode(pv[0]))
+        return (alpha, pv)
+
+    def __negamax(self, board, depth, alpha, beta, ply, pv, null=True):
+        """Score a position for the color to move, filling its pv.
+
+        A null move is only tried when null is True, so two never follow
+        each other.
+
+        Returns:
+            int: The score, at most alpha when all moves fail low and at
+                 least beta when one fails high
+        """
+        if depth <= 0:
+            return self.__quiescence(board, alpha, beta, ply)
+
+        self.nodes += 1
+        self.__check_limits()
+        if self.__is_draw(board):
+            return 0
+
+        key = board.key
+        entry = self.table.probe(key)
+        hash_move = None
+        if entry:
+            (entry_depth, bound, score, code) = entry
+            hash_move = _decode(code) if code else None
+            score = _from_table(score, ply)
+            if entry_depth >= depth and (
+                    bound == EXACT or (bound == LOWER and score >= beta)
+                    or (bound == UPPER and score <= alpha)):
+                pv[:] = [hash_move] if hash_move else []
+                return score
+
+        color = board.turn
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        check = board.is_check(color)
+        parameters = self.parameters
+        if (null and not check and parameters.null_move_reduction
+                and depth >= parameters.null_move_depth
+                and abs(beta) < MATE_SCORE - MAX_DEPTH
+                and board.has_pieces(color)):
+            self.null_moves += 1
+            en_passant = board.make_null_move()
+            try:
+                score = -self.__negamax(
+                    board, depth - 1 - parameters.null_move_reduction, -beta,
+                    -beta + 1, ply + 1, [], False)
+            finally:
+                board.unmake_null_move(en_passant)
+            if score >= beta:
+                self.null_cutoffs += 1
+                return beta
+
+        margins = parameters.futility_margins
+        futile = (not check and depth <= len(margins)
+                  and abs(alpha) < MATE_SCORE - MAX_DEPTH
+                  and self.evaluate(board) + margins[depth - 1] <= alpha)
+        late_moves = (parameters.lmr_moves if not check
+                      and depth >= parameters.lmr_depth else 0)
+
+        (best, best_move, legal) = (-INFINITY, None, 0)
+        original_alpha = alpha
+        self.__push(key)
+        try:
+            moves = self.ordering.order(
+                board, board.pseudo_legal_moves(color), ply, hash_move)
+            for move in moves:
+                line = []
+                record = board.make_move(move)
+                try:
+                    king = board.kings[color]
+                    if king and board.is_square_attacked(king, enemy):
+                        continue
+                    legal += 1
+
+                    reduction = 0
+                    if (legal > 1 and (futile or late_moves
+                                       and legal > late_moves)
+                            and _is_quiet(board, record, move, enemy)):
+                        if futile:
+                            self.futility_pruned += 1
+                            continue
+                        reduction = 1 if legal <= 2 * late_moves else 2
+
+                    if reduction:
+                        self.reductions += 1
+                        score = -self.__negamax(board, depth - 1 - reduction,
+                                                -alpha - 1, -alpha, ply + 1,
+                                                line)
+                        if score > alpha:
+                            self.researches += 1
+                            line = []
+                    if not reduction or score > alpha:
+                        score = -self.__negamax(board, depth - 1, -beta,
+                                                -alpha, ply + 1, line)
+                finally:
+                    board.unmake_move(record)
+
+                if score > best:
+                    (best, best_move) = (score, move)
+                if score > alpha:
+                    alpha = score
+                    pv[:] = [move] + line
+                if alpha >= beta:
+                    self.ordering.cutoff(board, move, ply, depth, legal - 1)
+                    break
+        finally:
+            self.__pop(key)
+
+        if not legal:
+            return -(MATE_SCORE - ply) if board.is_check(color) else 0
+
+        bound = EXACT
+        if best <= original_alpha:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        self.table.store(key, depth, bound, _to_table(best, ply),
+                         encoding.encode(best_move))
+        return best
+
+    def __quiescence(self, board, alpha, beta, ply):
+        """Score a position by searching captures until it's quiet.
+
+        The color to move can take the evaluation (stand pat) instead of
+        capturing, unless it's in check: then every move is searched.
+
+        Returns:
+            int: The score, at most alpha when all moves fail low and at
+                 least beta when one fails high
+        """
+        self.nodes += 1
+        self.qnodes += 1
+        self.__check_limits()
+        if self.__is_draw(board):
+            return 0
+
+        color = board.turn
+        enemy = colors.BLACK if color == colors.WHITE else colors.WHITE
+        check = board.is_check(color)
+        if check:
+            best = -INFINITY
+            moves = board.pseudo_legal_moves(color)
+        else:
+            best = self.evaluate(board)
+            if best >= beta or ply >= MAX_DEPTH:
+                return best
+            alpha = max(alpha, best)
+            moves = board.captures(color)
+
+        legal = 0
+        for move in self.ordering.order(board, moves, ply):
+            if not check and board.see(move) < 0:
+                self.see_pruned += 1
+                continue
+            record = board.make_move(move)
+            try:
+                king = board.kings[color]
+                if king and board.is_square_attacked(king, enemy):
+                    continue
+                legal += 1
+                score = -self.__quiescence(board, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move(record)
+
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.ordering.cutoff(board, move, ply, 0, legal - 1)
+                break
+
+        if check and not legal:
+            return -(MATE_SCORE - ply)
+        return best
+
+    def __is_draw(self, board):
+        """Is a position drawn by repetition, fifty moves or material."""
+        return bool(self.__seen.get(board.key)
+                    or board.halfmove_clock >= 100
+                    or board.is_insufficient_material())
+
+    def __check_limits(self):
+        """Stop the search when it runs out of nodes or time."""
+        if self.__max_nodes is not None and self.nodes > self.__max_nodes:
+            raise _Stop()
+        if (self.__deadline is not None and not self.nodes & 255
+                and time.perf_counter() > self.__deadline):
+            raise _Stop()
+
+    def __push(self, key):
+        """Add a position to the positions on the path to this one."""
+        self.__seen[key] = self.__seen.get(key, 0) + 1
+
+    def __pop(self, key):
+        """Take a position from the positions on the path to this one."""
+        self.__seen[key] -= 1
+        if not self.__seen[key]:
+            del self.__seen[key]
+
+
+def _is_quiet(board, record, move, enemy):
+    """Is a made move no capture, promotion or check of the enemy king."""
+    if record.captured or move.promote_to:
+        return False
+    king = board.kings[enemy]
+    color = colors.BLACK if enemy == colors.WHITE else colors.WHITE
+    return not (king and board.is_square_attacked(king, color))
+
+
+def _to_table(score, ply):
+    """Make a mate score relative to the position, to store it."""
+    if score > MATE_SCORE - MAX_DEPTH:
+        return score + ply
+    if score < -(MATE_SCORE - MAX_DEPTH):
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Make a stored mate score relative to the root again."""
+    if score > MATE_SCORE - MAX_DEPTH:
+        return score - ply
+    if score < -(MATE_SCORE - MAX_DEPTH):
+        return score + ply
+    return score
+
+
+def _decode(code):
+    """Return the shared move of a code, including its promotion."""
+    move = encoding.decode(code)
+    promote_to = encoding.promotes_to(code)
+    if promote_to:
+        return Move.get(move.origin, move.destination, promote_to)
+    return move
+
+
+class EnginePlayer(Player):
+    """A player that picks its moves with an engine.
+
+    Parameters:
+        name: The name of the player
+        color: The color of the player
+        turn: Whether it's the players turn
+        depth(int): Optional: The deepest iteration of every search
+        nodes(int): Optional: The most positions to visit every search
+        seconds(float): Optional: The longest time to search every move
+        engine(Engine): Optional: The engine to search with
+
+    Attributes:
+        engine(Engine): The engine to search with
+        limits(dict): The limits of every search
+        last_result(SearchResult): The result of the last search, or None
+    """
+
+    def __init__(self, name, color, turn=True, depth=None, nodes=None,
+                 seconds=None, engine=None, *args, **kwargs):
+        """Init."""
+        super().__init__(name, color, turn, *args, **kwargs)
+        self.engine = engine or Engine()
+        self.limits = {'depth': depth, 'nodes': nodes, 'seconds': seconds}
+        self.last_result = None
+
+    def play(self, chessgame):
+        """Search a move and make it in a game.
+
+        Parameters:
+            chessgame(ChessGame): The game to play in
+
+        Returns:
+            MoveEvent: Result object containing event information
+        """
+        if not self.turn or chessgame.over:
+            return game_event.MoveEvent(False)
+
+        self.last_result = self.engine.search(
+            chessgame.board, history=chessgame.history.keys[:-1],
+            **self.limits)
+        if not self.last_result.move:
+            return game_event.MoveEvent(False)
+
+        return chessgame.move(self, self.last_result.move.text)
+
+
+def main(argv=None):
+    """Search a position from the commandline.
+
+    Prints a row for every iteration of the search.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m nerdchess.engine',
+        description='Search the best move in a chess position.')
+    parser.add_argument('--fen', default=START_FEN,
+                        help='the position to search')
+    parser.add_argument('--depth', type=int, default=None,
+                        help='the deepest iteration, defaults to {}'.format(
+                            DEFAULT_DEPTH))
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='the most positions to visit')
+    parser.add_argument('--seconds', type=float, default=None,
+                        help='the longest time to search')
+    parser.add_argument('--hash', type=float, default=16,
+                        help='the megabytes of the transposition table')
+    parser.add_argument('--full-width', action='store_true',
+                        help='search without null moves, reductions or '
+                             'futility pruning')
+    args = parser.parse_args(argv)
+
+    rows = []
+
+    def report(result):
+        rows.append([result.depth, result.score, result.nodes, result.nps,
+                     ' '.join(str(move) for move in result.pv)])
+
+    parameters = SearchParameters.full_width() if args.full_width else None
+    engine = Engine(table=TranspositionTable(args.hash),
+                    parameters=parameters)
+    result = engine.search(Board.from_fen(args.fen), args.depth, args.nodes,
+                           args.seconds, callback=report)
+    print(tabulate(rows, headers=['depth', 'score', 'nodes', 'nodes/s',
+                                  'pv']))
+    print("Transposition table: {}".format(engine.table))
+    print("Move ordering: {}".format(engine.ordering))
+    print("Search: {}".format(engine.stats()))
+    print("Best move: {}".format(result.move))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Evaluate positions by material and piece-square tables.
+
+Every piece is worth its material value plus a bonus or penalty for the
+square it stands on, from a piece-square table. Pieces are worth different
+amounts in the middlegame than in the endgame (a king should hide in the
+middlegame but be active in the endgame), so there are two scores, blended
+by the phase of the game:
+
+    score = (middlegame * phase + endgame * (MAX_PHASE - phase)) / MAX_PHASE
+
+The phase is the sum of the PHASE_WEIGHTS of the pieces on the board,
+MAX_PHASE with all pieces and 0 with only kings and pawns.
+
+Boards keep both scores and the phase up to date on every change of a
+square, see Board.update_square, so evaluating a position only reads them:
+
+    >>> evaluate(board)
+    0
+
+The tables are those of the simplified evaluation function by Tomasz
+Michniewski, with tables for pawns and kings in the endgame added.
+
+Attributes:
+    MIDDLEGAME_VALUES (dict): The value of every piece class in the
+                              middlegame, in centipawns.
+    ENDGAME_VALUES (dict): The value of every piece class in the endgame.
+    PHASE_WEIGHTS (dict): How much every piece class counts towards the
+                          phase.
+    MAX_PHASE (int): The phase of the start position.
+    SQUARE_SCORES (dict): The middlegame and endgame score of every piece
+                          class, by color index and square selector. White
+                          scores are positive and black ones negative.
+"""
+from nerdchess import pieces
+from nerdchess.config import colors, selectorlist
+
+MIDDLEGAME_VALUES = {
+    pieces.Pawn: 100,
+    pieces.Knight: 320,
+    pieces.Bishop: 330,
+    pieces.Rook: 500,
+    pieces.Queen: 900,
+    pieces.King: 0,
+}
+ENDGAME_VALUES = {
+    pieces.Pawn: 120,
+    pieces.Knight: 300,
+    pieces.Bishop: 330,
+    pieces.Rook: 520,
+    pieces.Queen: 920,
+    pieces.King: 0,
+}
+PHASE_WEIGHTS = {
+    pieces.Pawn: 0,
+    pieces.Knight: 1,
+    pieces.Bishop: 1,
+    pieces.Rook: 2,
+    pieces.Queen: 4,
+    pieces.King: 0,
+}
+MAX_PHASE = 24
+
+# The tables as seen by white, rank 8 at the top and rank 1 at the bottom
+_PAWN = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_PAWN_ENDGAME = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROOK = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+_QUEEN = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+_KING = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+_KING_ENDGAME = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+_TABLES = {
+    pieces.Pawn: (_PAWN, _PAWN_ENDGAME),
+    pieces.Knight: (_KNIGHT, _KNIGHT),
+    pieces.Bishop: (_BISHOP, _BISHOP),
+    pieces.Rook: (_ROOK, _ROOK),
+    pieces.Queen: (_QUEEN, _QUEEN),
+    pieces.King: (_KING, _KING_ENDGAME),
+}
+
+
+def _square_scores(piece_class, white):
+    """Create the scores of a piece class of a color by square selector."""
+    (middlegame, endgame) = _TABLES[piece_class]
+    scores = {}
+    for (index, selector) in enumerate(selectorlist):
+        # selectorlist starts at rank 1, the tables at rank 8 for white
+        (rank, file) = divmod(index, 8)
+        square = (7 - rank if white else rank) * 8 + file
+        score = (MIDDLEGAME_VALUES[piece_class] + middlegame[square],
+                 ENDGAME_VALUES[piece_class] + endgame[square])
+        scores[selector] = score if white else (-score[0], -score[1])
+    return scores
+
+
+SQUARE_SCORES = {
+    piece_class: (_square_scores(piece_class, True),
+                  _square_scores(piece_class, False))
+    for piece_class in _TABLES
+}
+
+
+def piece_scores(piece, selector):
+    """Return the scores of a piece on a square.
+
+    Parameters:
+        piece(Piece): The piece or pawn
+        selector(String): The square it's on (eg. e4)
+
+    Returns:
+        tuple(int, int): The middlegame and endgame score, negative for
+                         black pieces
+    """
+    scores = SQUARE_SCORES[type(piece)]
+    return scores[0 if piece.color == colors.WHITE else 1][selector]
+
+
+def taper(middlegame, endgame, phase):
+    """Blend a middlegame and endgame score by the phase of the game.
+
+    Parameters:
+        middlegame(int): The middlegame score
+        endgame(int): The endgame score
+        phase(int): The phase, MAX_PHASE or more is a middlegame and 0 an
+                    endgame
+
+    Returns:
+        int: The blended score
+    """
+    phase = min(phase, MAX_PHASE)
+    # Rounded towards 0, so the score of black is the negated one of white
+    return int((middlegame * phase + endgame * (MAX_PHASE - phase))
+               / MAX_PHASE)
+
+
+def evaluate(board):
+    """Score a board for the color to move from its kept scores.
+
+    Parameters:
+        board(Board): The board to score
+
+    Returns:
+        int: The score in centipawns, positive when the color to move is
+             ahead
+    """
+    score = taper(*board.scores)
+    return score if board.turn == colors.WHITE else -score
+
+
+def scan(board):
+    """Add up the scores of a board square by square.
+
+    Gives the same scores Board.scores keeps, but walks all 64 squares.
+
+    Parameters:
+        board(Board): The board to score
+
+    Returns:
+        tuple(int, int, int): The middlegame score, endgame score and phase
+    """
+    (middlegame, endgame, phase) = (0, 0, 0)
+    for (selector, square) in board.selectors.items():
+        piece = square.occupant
+        if piece:
+            scores = piece_scores(piece, selector)
+            middlegame += scores[0]
+            endgame += scores[1]
+            phase += PHASE_WEIGHTS[type(piece)]
+
+    return (middlegame, endgame, phase)
@@ -11,11 +11,15 @@ Example:
     chessgame = game.ChessGame(player_1, player_2)
 """
 
+from nerdchess import encoding
 from nerdchess import pieces
 from nerdchess import game_event
-from nerdchess.config import colors
-from nerdchess.board import Board
+from nerdchess import stats
+from nerdchess.config import DrawReason, GameState, colors
+from nerdchess.board import Board, PROMOTION_PIECES
 from nerdchess.boardmove import BoardMove
+from nerdchess.history import GameHistory
+from nerdchess.player import Player
 
 
 class ChessGame():
@@ -28,6 +32,8 @@ class ChessGame():
         name_1(Player): Player 1
         name_2(Player): Player 2
         over(Bool): Whether the game is over
+        board(Board): Optional: The board to play on, instead of a board in
+                      the start position
 
     Attributes:
         player_1(Player): Player 1
@@ -36,23 +42,157 @@ class ChessGame():
         board(Board): The board the game is played on
         pieces(list): A list of the pieces the game is played with
         pawns(list): A list of the pawns the game is played with
+        history(GameHistory): The moves played and the positions they lead
+                              to
+        board_history(BoardHistory): The boards before each move, rebuilt
+                                     from the history when accessed
+        move_history(array): The moves played, as codes from
+                             nerdchess.encoding
+        stats(Stats): Counts and times of the moves in this game, while
+                      nerdchess.stats is enabled
+        state(GameState): The state of the position for the color to move
+        repetitions(dict): How often every position occurred, by its key
+        draw(DrawReason): The rule the game was drawn by, or None
     """
 
-    def __init__(self, player_1, player_2, over=False):
+    def __init__(self, player_1, player_2, over=False, board=None):
         """Init."""
         self.player_1 = player_1
         self.player_2 = player_2
         self.playerlist = [self.player_1, self.player_2]
 
-        self.board = Board()
-        self.pieces = pieces.create_pieces()
-        self.pawns = pieces.create_pawns()
-        self.board.setup_board(self.pieces, self.pawns)
+        if board is None:
+            self.board = Board()
+            self.pieces = pieces.create_pieces()
+            self.pawns = pieces.create_pawns()
+            self.board.setup_board(self.pieces, self.pawns)
+        else:
+            self.board = board
+            on_board = list(Board.piece_list(board.squares))
+            self.pieces = [piece for piece in on_board
+                           if not isinstance(piece, pieces.Pawn)]
+            self.pawns = [piece for piece in on_board
+                          if isinstance(piece, pieces.Pawn)]
+            for player in self.playerlist:
+                player.turn = player.color == board.turn
 
-        self.board_history = []
+        self.history = GameHistory(self.board)
+        self.move_history = self.history.moves
+        self.stats = stats.Stats()
+        self.__undo_board = self.board
+        self.__undo_records = []
+        self.__redo_moves = []
+        self.repetitions = {self.history.keys[0]: 1}
+        self.draw = None
+        self.state = GameState.ONGOING
 
         self.over = over
 
+    @property
+    def board_history(self):
+        """The boards before each move, see GameHistory.boards()."""
+        return self.history.boards()
+
+    @classmethod
+    def from_fen(cls, player_1, player_2, fen):
+        """Create a game continuing from a position.
+
+        Parameters:
+            player_1(Player): Player 1
+            player_2(Player): Player 2
+            fen(String): The position in Forsyth-Edwards Notation
+
+        Returns:
+            ChessGame: The game, with the turn passed to the side to move
+        """
+        return cls(player_1, player_2, board=Board.from_fen(fen))
+
+    @classmethod
+    def from_moves(cls, moves, player_1=None, player_2=None, trusted=True,
+                   verify=False, fen=None):
+        """Create a game from the moves played so far.
+
+        Trusted moves (eg. from our own database) are made on the board
+        without checking the rules, checking for mate once at the end.
+        Moves that aren't trusted are played through move().
+
+        Parameters:
+            moves(iterable): The moves (eg. e2e4) or their codes
+            player_1(Player): Optional: Player 1, defaults to a white player
+            player_2(Player): Optional: Player 2
+            trusted(Bool): Make the moves without checking the rules
+            verify(Bool): Check the game with verify() afterwards
+            fen(String): Optional: The position the game started from
+
+        Returns:
+            ChessGame: The game after the last move
+        """
+        if player_1 is None:
+            (player_1, player_2) = Player.create_two(
+                'white', 'black', colors.WHITE.value)
+        board = Board.from_fen(fen) if fen else None
+        chessgame = cls(player_1, player_2, board=board)
+
+        if trusted:
+            chessgame.__replay(moves)
+        else:
+            for (ply, move) in enumerate(moves, 1):
+                player = player_1 if player_1.turn else player_2
+                if not chessgame.move(player, move):
+                    raise ValueError("Illegal move '{}' at ply {}".format(
+                        move, ply))
+
+        if verify:
+            chessgame.verify()
+        return chessgame
+
+    def verify(self):
+        """Check the moves of the game against the rules.
+
+        The moves are replayed from the first position of the history, and
+        the position they lead to is compared with the current one.
+
+        Raises:
+            ValueError: At the first illegal move, or when the positions
+                        differ
+        """
+        first = self.history.position_at(0)
+        (white, black) = (Player('white', colors.WHITE),
+                          Player('black', colors.BLACK))
+        replay = ChessGame(white, black, board=first)
+
+        for (ply, code) in enumerate(self.move_history, 1):
+            player = white if white.turn else black
+            if not replay.move(player, code):
+                raise ValueError("Illegal move '{}' at ply {}".format(
+                    encoding.to_text(code), ply))
+
+        if replay.board.key != self.board.key:
+            raise ValueError('The moves lead to a different position')
+
+    def __replay(self, moves):
+        """Make trusted moves on the board, keeping the history."""
+        self.__sync()
+        board = self.board
+        for move in moves:
+            if isinstance(move, int):
+                move = encoding.to_text(move)
+            boardmove = BoardMove(board, move, rule_check=False)
+            code = encoding.encode(boardmove)
+
+            self.__undo_records.append(board.make_move(boardmove))
+            self.history.append(code, board)
+            self.__count_position(self.history.keys[-1], 1)
+
+        self.__redo_moves.clear()
+        self.__check_state()
+        self.__check_draw()
+        self.__update_turns()
+
+    def to_fen(self):
+        """Return the current position in Forsyth-Edwards Notation."""
+        return self.board.to_fen()
+
     def pass_turn(self):
         """Pass the turn to the other player."""
         for player in self.playerlist:
@@ -63,14 +203,18 @@ class ChessGame():
 
         Parameters:
             player: The player that made the move
-            move: The move representeed by squares (eg. e2e4)
+            move: The move representeed by squares (eg. e2e4), or its code
+                  from nerdchess.encoding
 
         Returns:
-            Bool: Was the move succesful?
+            Bool: Was the move succesful? Never once the game is over
         """
-        move = BoardMove(self.board, move)
+        if isinstance(move, int):
+            move = encoding.to_text(move)
+        # make() checks the rules, once
+        move = BoardMove(self.board, move, rule_check=False)
 
-        if not player.turn:
+        if self.over or not player.turn:
             return game_event.MoveEvent(False)
 
         if move.origin_sq.occupant:
@@ -79,17 +223,162 @@ class ChessGame():
         else:
             return game_event.MoveEvent(False)
 
-        result = move.process()
-        if result:
-            self.board_history.append(self.board)
-            if result.is_checkmate():
-                self.over = True
-            self.board = result
+        self.__sync()
+        code = encoding.encode(move)
+        record = move.make()
+        if record:
+            self.__undo_records.append(record)
+            self.__redo_moves.clear()
+            self.history.append(code, self.board)
+            self.__count_position(self.history.keys[-1], 1)
+            self.__check_state()
+            self.__check_draw()
             self.pass_turn()
             return game_event.MoveEvent(True, promotion=move.promotion)
         else:
             return game_event.MoveEvent(False)
 
+    def undo(self, plies=1):
+        """Take back the last moves.
+
+        Moves are taken back on the board in place. When the board was
+        replaced after a move, the position before it is rebuilt from the
+        history instead.
+
+        Parameters:
+            plies(int): The amount of moves to take back
+
+        Returns:
+            UndoEvent: Result object containing the amount of moves taken back
+        """
+        undone = 0
+        while undone < plies and self.history:
+            self.__sync()
+            self.__count_position(self.history.keys[-1], -1)
+            code = self.history.pop()
+            if self.__undo_records:
+                self.board.unmake_move(self.__undo_records.pop())
+            else:
+                self.board = self.history.position_at(-1)
+                self.__undo_board = self.board
+            self.__redo_moves.append(code)
+            undone += 1
+
+        if undone:
+            self.over = False
+            self.draw = None
+            self.state = GameState.ONGOING
+            self.__update_turns()
+        return game_event.UndoEvent(bool(undone), undone)
+
+    def redo(self, plies=1):
+        """Make the moves taken back with undo() again.
+
+        Parameters:
+            plies(int): The amount of moves to make again
+
+        Returns:
+            UndoEvent: Result object containing the amount of moves made
+        """
+        redone = 0
+        while redone < plies and self.__redo_moves:
+            self.__sync()
+            code = self.__redo_moves.pop()
+            self.__undo_records.append(self.board.make_move(code))
+            self.history.append(code, self.board)
+            self.__count_position(self.history.keys[-1], 1)
+            redone += 1
+
+        if redone:
+            self.over = False
+            self.__check_state()
+            self.__check_draw()
+            self.__update_turns()
+        return game_event.UndoEvent(bool(redone), redone)
+
+    def __sync(self):
+        """Keep the history and undo records in line with the board.
+
+        Undo records only apply to the board they were made on, so they are
+        dropped when the board was replaced.
+        """
+        replaced = self.history.sync(self.board)
+        if replaced is not None:
+            self.__count_position(replaced, -1)
+            self.__count_position(self.history.keys[-1], 1)
+        if self.board is not self.__undo_board:
+            self.__undo_board = self.board
+            self.__undo_records.clear()
+
+    def claimable_draw(self):
+        """Return the draw that can be claimed in the current position.
+
+        Returns:
+            DrawReason: Threefold repetition or the fifty-move rule, or None
+        """
+        if self.repetitions.get(self.history.keys[-1], 0) >= 3:
+            return DrawReason.THREEFOLD_REPETITION
+        if self.board.halfmove_clock >= 100:
+            return DrawReason.FIFTY_MOVES
+        return None
+
+    def claim_draw(self, player):
+        """Claim a draw by threefold repetition or the fifty-move rule.
+
+        Parameters:
+            player(Player): The player claiming the draw
+
+        Returns:
+            DrawEvent: Result object containing the rule the game was drawn by
+        """
+        if self.over or player not in self.playerlist:
+            return game_event.DrawEvent(False)
+
+        self.__sync()
+        reason = self.claimable_draw()
+        if not reason:
+            return game_event.DrawEvent(False)
+
+        self.over = True
+        self.draw = reason
+        return game_event.DrawEvent(True, reason)
+
+    def __check_state(self):
+        """End the game on checkmate, stalemate or insufficient material."""
+        self.state = self.board.game_state()
+        if self.state != GameState.ONGOING:
+            self.over = True
+
+    def __check_draw(self):
+        """End the game by the fivefold repetition and seventy-five-move rule.
+
+        Unlike threefold repetition and the fifty-move rule, these don't need
+        to be claimed. Checkmate goes first.
+        """
+        if self.over:
+            return
+
+        if self.repetitions.get(self.history.keys[-1], 0) >= 5:
+            self.draw = DrawReason.FIVEFOLD_REPETITION
+        elif self.board.halfmove_clock >= 150:
+            self.draw = DrawReason.SEVENTY_FIVE_MOVES
+        else:
+            return
+        self.over = True
+
+    def __count_position(self, key, amount):
+        """Add to the amount of times a position occurred."""
+        count = self.repetitions.get(key, 0) + amount
+        if count > 0:
+            self.repetitions[key] = count
+        else:
+            self.repetitions.pop(key, None)
+
+    def __update_turns(self):
+        """Give the turn to the player whose color is to move."""
+        for player in self.playerlist:
+            player.turn = player.color == self.board.turn
+
     def promote(self, pawn, target):
         """Promote a pawn.
 
@@ -107,11 +396,36 @@ class ChessGame():
 
         if pawn.color == colors.WHITE:
             if pawn.last_move.text[3] == '8':
-                return game_event.MoveEvent(self.board.promote(pawn, target))
+                promoted = self.board.promote(pawn, target)
+                self.__record_promotion(target)
+                return game_event.MoveEvent(promoted)
             else:
                 return game_event.MoveEvent(False)
         else:
             if pawn.last_move.text[3] == '1':
-                return game_event.MoveEvent(self.board.promote(pawn, target))
+                promoted = self.board.promote(pawn, target)
+                self.__record_promotion(target)
+                return game_event.MoveEvent(promoted)
             else:
                 return game_event.MoveEvent(False)
+
+    def __record_promotion(self, target):
+        """Record the piece promoted to in the last move of the history.
+
+        The position after the move changes, so the state of the game is
+        checked again, like after undoing and redoing the move.
+        """
+        if not self.move_history:
+            return
+
+        for char, piece in PROMOTION_PIECES.items():
+            if piece == target:
+                text = encoding.to_text(self.move_history[-1])
+                replaced = self.history.amend(
+                    encoding.encode(text[:4], char), self.board)
+                self.__count_position(replaced, -1)
+                self.__count_position(self.history.keys[-1], 1)
+                self.over = False
+                self.draw = None
+                self.__check_state()
+                self.__check_draw()
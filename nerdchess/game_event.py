@@ -47,3 +47,47 @@ class PromotionEvent(GameEvent):
     def __bool__(self):
         """Bool representation."""
         return self.valid
+
+
+class UndoEvent(GameEvent):
+    """Results for the undo and redo actions."""
+
+    def __init__(self, valid, plies=0):
+        """Construct the event.
+
+        Parameters:
+            valid(Bool): Were any moves taken back or made again?
+            plies(int): The amount of moves taken back or made again
+
+        Attributes:
+            valid(Bool): Were any moves taken back or made again?
+            plies(int): The amount of moves taken back or made again
+        """
+        self.valid = valid
+        self.plies = plies
+
+    def __bool__(self):
+        """Bool representation."""
+        return self.valid
+
+
+class DrawEvent(GameEvent):
+    """Results for the claim draw action."""
+
+    def __init__(self, valid, reason=None):
+        """Construct the event.
+
+        Parameters:
+            valid(Bool): Was the draw claimed?
+            reason(DrawReason): The rule the game was drawn by
+
+        Attributes:
+            valid(Bool): Was the draw claimed?
+            reason(DrawReason): The rule the game was drawn by
+        """
+        self.valid = valid
+        self.reason = reason
+
+    def __bool__(self):
+        """Bool representation."""
+        return self.valid
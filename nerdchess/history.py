@@ -0,0 +1,204 @@
+"""Keep the history of a game as a log of moves.
+
+Storing the board before every move costs 64 squares and up to 32 pieces
+per ply. A GameHistory stores the moves as codes from nerdchess.encoding
+instead, with the position in Forsyth-Edwards Notation every
+KEYFRAME_INTERVAL plies. Positions are rebuilt on request by replaying the
+moves from the nearest keyframe before them:
+
+    >>> history = GameHistory(board)
+    >>> history.append(encoding.encode('e2e4'), board)
+    >>> history.position_at(0).to_fen()
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+The key of every position is kept as well, so positions can be compared
+without rebuilding them.
+
+Attributes:
+    KEYFRAME_INTERVAL (int): The amount of plies between keyframes.
+"""
+import copy
+from array import array
+from bisect import bisect_right
+from nerdchess.board import Board
+
+KEYFRAME_INTERVAL = 16
+
+
+class GameHistory():
+    """The positions of a game, as keyframes and the moves between them.
+
+    Parameters:
+        board(Board): The position the game starts from
+        interval(int): Optional: The amount of plies between keyframes
+
+    Attributes:
+        moves(array): The moves played, as codes from nerdchess.encoding
+        keys(array): The keys of the positions before and after every move
+        interval(int): The amount of plies between keyframes
+    """
+
+    def __init__(self, board, interval=KEYFRAME_INTERVAL):
+        """Init."""
+        self.moves = array('H')
+        self.keys = array('Q', [board.key])
+        self.interval = interval
+        self.__keyframes = {0: board.to_fen()}
+        self.__keyframe_plies = [0]
+
+    def __len__(self):
+        """Return the amount of plies played."""
+        return len(self.moves)
+
+    def append(self, code, board):
+        """Record a move.
+
+        Parameters:
+            code(int): The move, as a code from nerdchess.encoding
+            board(Board): The position after the move
+        """
+        self.moves.append(code)
+        self.keys.append(board.key)
+        if len(self.moves) % self.interval == 0:
+            self.__add_keyframe(board)
+
+    def sync(self, board):
+        """Make sure the last position of the history is the given board.
+
+        The board of a game can change outside of its moves, for example by
+        promoting a pawn or by replacing the board. The board is then stored
+        as a keyframe, so the moves before it don't need to lead to it.
+
+        Parameters:
+            board(Board): The current position of the game
+
+        Returns:
+            int: The key of the last position the board replaced, or None
+        """
+        key = board.key
+        if key == self.keys[-1]:
+            return None
+
+        replaced = self.keys[-1]
+        self.keys[-1] = key
+        self.__add_keyframe(board)
+        return replaced
+
+    def amend(self, code, board):
+        """Replace the last move, like when the pawn it moved was promoted.
+
+        Parameters:
+            code(int): The move, as a code from nerdchess.encoding
+            board(Board): The position after the move
+
+        Returns:
+            int: The key of the position the amended move led to before
+        """
+        replaced = self.keys[-1]
+        self.moves[-1] = code
+        self.keys[-1] = board.key
+        if self.__keyframe_plies[-1] == len(self.moves):
+            self.__add_keyframe(board)
+        return replaced
+
+    def pop(self):
+        """Forget the last move.
+
+        Returns:
+            int: The code of the move
+        """
+        ply = len(self.moves)
+        if self.__keyframe_plies[-1] == ply and ply:
+            del self.__keyframes[ply]
+            self.__keyframe_plies.pop()
+        self.keys.pop()
+        return self.moves.pop()
+
+    def position_at(self, ply):
+        """Rebuild the position after a number of plies.
+
+        Parameters:
+            ply(int): The amount of plies played, 0 is the start position and
+                      negative numbers count from the end
+
+        Returns:
+            Board: A new board with the position
+        """
+        plies = len(self.moves)
+        if ply < 0:
+            ply += plies + 1
+        if not 0 <= ply <= plies:
+            raise IndexError('Ply out of range')
+
+        keyframe = self.__keyframe_plies[
+            bisect_right(self.__keyframe_plies, ply) - 1]
+        board = Board.from_fen(self.__keyframes[keyframe])
+        for code in self.moves[keyframe:ply]:
+            board.make_move(code)
+
+        return board
+
+    def positions(self):
+        """Rebuild the positions before every move, replaying each move once.
+
+        Yields:
+            Board: A new board with the position before every move
+        """
+        board = None
+        for (ply, code) in enumerate(self.moves):
+            if ply in self.__keyframes:
+                board = Board.from_fen(self.__keyframes[ply])
+            yield copy.deepcopy(board)
+            board.make_move(code)
+
+    def boards(self):
+        """Return the positions before every move as a sequence of boards."""
+        return BoardHistory(self)
+
+    def __add_keyframe(self, board):
+        """Store a position as the keyframe of the current ply."""
+        ply = len(self.moves)
+        if self.__keyframe_plies[-1] != ply:
+            self.__keyframe_plies.append(ply)
+        self.__keyframes[ply] = board.to_fen()
+
+
+class BoardHistory():
+    """The positions before every move of a game, rebuilt when accessed.
+
+    Behaves like the list of boards games used to keep: it can be indexed,
+    sliced, iterated and added to a list.
+
+    Parameters:
+        history(GameHistory): The history of the game
+    """
+
+    def __init__(self, history):
+        """Init."""
+        self.history = history
+
+    def __len__(self):
+        """Return the amount of positions, one per move."""
+        return len(self.history)
+
+    def __getitem__(self, index):
+        """Rebuild the position before a move, or a list of them."""
+        if isinstance(index, slice):
+            return [self[ply] for ply in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Board history index out of range')
+        return self.history.position_at(index)
+
+    def __iter__(self):
+        """Rebuild the positions in order, see GameHistory.positions()."""
+        return self.history.positions()
+
+    def __add__(self, other):
+        """Return the positions followed by a list of boards."""
+        return list(self) + list(other)
+
+    def __bool__(self):
+        """Are there any positions."""
+        return bool(len(self))
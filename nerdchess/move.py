@@ -2,9 +2,24 @@
 
 The move is not aware of the board context, but is aware of the boundaries
 of a board in general.
+
+Every possible move between two squares is created once at import in
+MOVE_TABLE, and every promotion in PROMOTION_TABLE. Use Move.get() to get one
+of those instead of creating a new move, they are immutable so they can be
+shared freely.
+
+Attributes:
+    PROMOTIONS (tuple(String)): The pieces a pawn can promote to.
+    MOVE_TABLE (dict): The shared moves by origin and destination selector.
+    PROMOTION_TABLE (dict): The shared promotions by origin, destination and
+                            the piece to promote to (eg. ('e7', 'e8', 'q')).
 """
 from abc import ABC
-from nerdchess.config import MOVE_REGEX, letterlist, numbers
+from itertools import chain
+from nerdchess.config import MOVE_REGEX, colors, selectorlist
+from nerdchess.tables import FILE_INDEX, PAWN_ATTACKS, PAWN_PUSHES
+
+PROMOTIONS = ('n', 'b', 'r', 'q')
 
 
 class Move(ABC):
@@ -13,39 +28,63 @@ class Move(ABC):
 
     Parameters:
         move(String): A string that's tested with the regex
-                      '[a-h][1-8][a-h][1-8]'
+                      '[a-h][1-8][a-h][1-8]', optionally followed by the
+                      piece to promote to (eg. e7e8q)
 
     Attributes:
         text(String): String representation of the move r'[a-h][1-8][a-h][1-8]'
         origin(String): String representation of the origin square
         destination(String): String representation of the destination square
+        promote_to(String): The piece to promote to (n, b, r or q), or None
         horizontal(int): Amount of horizontal steps in the move
         vertical(int): Amount of vertical steps in the move
         indices(dict): Origin/destination letter(x)/number(y) mapped to their
                        list position
     """
 
+    __slots__ = ('text', 'origin', 'destination', 'promote_to', 'horizontal',
+                 'vertical', '_coordinates', '_direction', '_between',
+                 '_frozen')
+
     def __init__(self, move, *args, **kwargs):
         """Init."""
         valid_move = MOVE_REGEX.match(move)
         if not valid_move:
             raise ValueError('Invalid move')
 
-        self.text = move
+        promote_to = move[4:5]
+        self.promote_to = promote_to if promote_to in PROMOTIONS else None
+        self.text = move[:4] + (self.promote_to or '')
         self.origin = move[:2]
-        self.destination = move[2:]
-        self.indices = {
-            'or': {
-                'x': letterlist.index(self.origin[0]),
-                'y': numbers.index(int(self.origin[1]))
-            },
-            'dest': {
-                'x': letterlist.index(self.destination[0]),
-                'y': numbers.index(int(self.destination[1]))
-            }
-        }
+        self.destination = move[2:4]
+        self._coordinates = (FILE_INDEX[self.origin[0]],
+                             int(self.origin[1]) - 1,
+                             FILE_INDEX[self.destination[0]],
+                             int(self.destination[1]) - 1)
         (self.horizontal,
          self.vertical) = self.get_steps()
+        self._direction = self.__direction()
+        self._between = tuple(self.__selectors_between())
+        self._frozen = True
+
+    @classmethod
+    def get(cls, origin, destination, promote_to=None):
+        """Get the shared move from one square to another.
+
+        Parameters:
+            origin(String): The origin square (eg. e2)
+            destination(String): The destination square (eg. e4)
+            promote_to(String): Optional: The piece to promote to (eg. q)
+
+        Returns:
+            Move: The move from MOVE_TABLE or PROMOTION_TABLE
+        """
+        try:
+            if promote_to:
+                return PROMOTION_TABLE[(origin, destination, promote_to)]
+            return MOVE_TABLE[origin][destination]
+        except KeyError:
+            raise ValueError('Invalid move')
 
     @classmethod
     def from_position(cls, position, steps):
@@ -56,23 +95,27 @@ class Move(ABC):
             steps(tuple(int, int)): The steps taken in the move
 
         Returns:
-            Move: A new move instance
+            Move: The shared move, None if it ends off the board
         """
         (letter_steps, number_steps) = steps
-        current_letter_index = letterlist.index(position[0])
-        current_number_index = numbers.index(int(position[1]))
-
-        new_letter_index = current_letter_index + letter_steps
-        new_number_index = current_number_index + number_steps
+        new_letter_index = FILE_INDEX[position[0]] + letter_steps
+        new_number_index = int(position[1]) - 1 + number_steps
 
-        if new_letter_index >= 0 and new_number_index >= 0:
-            new_letter = letterlist[new_letter_index]
-            new_number = numbers[new_number_index]
+        if 0 <= new_letter_index < 8 and 0 <= new_number_index < 8:
+            destination = selectorlist[new_number_index * 8 +
+                                       new_letter_index]
+            return MOVE_TABLE[position][destination]
         else:
             return None
 
-        move = "{}{}{}".format(position, new_letter, new_number)
-        return cls(move)
+    @property
+    def indices(self):
+        """Origin/destination letter(x)/number(y) mapped to list positions."""
+        (origin_x, origin_y, dest_x, dest_y) = self._coordinates
+        return {
+            'or': {'x': origin_x, 'y': origin_y},
+            'dest': {'x': dest_x, 'y': dest_y}
+        }
 
     def square_selectors_between(self):
         """Return selectors of squares between the origin and destination.
@@ -80,85 +123,79 @@ class Move(ABC):
         Returns:
             list(String): A list of selectors of squares.
         """
-        squares = []
-        steps = 0
-        step_range = 0
-
-        if self.horizontal == 1 or self.vertical == 1:
-            return squares
+        return list(self._between)
 
-        if self.horizontal == -1 or self.vertical == -1:
-            return squares
+    def __selectors_between(self):
+        """Yield selectors of squares between the origin and destination."""
+        if not self._direction:
+            return
 
-        h_steps = 1 if self.horizontal > 0 else -1
-        v_steps = 1 if self.vertical > 0 else -1
+        h_steps = (self.horizontal > 0) - (self.horizontal < 0)
+        v_steps = (self.vertical > 0) - (self.vertical < 0)
+        (x, y) = self._coordinates[:2]
 
-        if self.is_diagonal():
-            steps = h_steps
-            step_range = self.horizontal
-        elif self.is_horizontal():
-            v_steps = 0
-            steps = h_steps
-            step_range = self.horizontal
-        elif self.is_vertical():
-            h_steps = 0
-            steps = v_steps
-            step_range = self.vertical
+        for _ in range(max(abs(self.horizontal), abs(self.vertical)) - 1):
+            x += h_steps
+            y += v_steps
+            yield selectorlist[y * 8 + x]
 
-        h_counter = h_steps
-        v_counter = v_steps
-
-        for i in range(steps, step_range, steps):
-            step_index_h = self.indices['or']['x'] + h_counter
-            step_index_v = self.indices['or']['y'] + v_counter
-
-            if step_index_v < 0 or step_index_h < 0:
-                h_counter = h_counter + h_steps
-                v_counter = v_counter + v_steps
-                continue
-
-            letter = letterlist[step_index_h]
-            number = numbers[step_index_v]
-            square = f"{letter}{number}"
-            squares.append(square)
-
-            h_counter = h_counter + h_steps
-            v_counter = v_counter + v_steps
-
-        return squares
+    def __direction(self):
+        """Return the direction of the move, if it's in a straight line."""
+        if self.horizontal == 0 and self.vertical == 0:
+            return None
+        if self.horizontal == 0:
+            return 'vertical'
+        if self.vertical == 0:
+            return 'horizontal'
+        if abs(self.horizontal) == abs(self.vertical):
+            return 'diagonal'
+        return None
 
     def is_diagonal(self):
         """Is the move diagonal."""
-        if self.horizontal == 0 or self.vertical == 0:
-            return False
-        if not abs(self.horizontal) == abs(self.vertical):
-            return False
-        return True
+        return self._direction == 'diagonal'
 
     def is_horizontal(self):
         """Is the move horizontal (only)."""
-        if self.horizontal == 0:
-            return False
-        if self.vertical != 0:
-            return False
-        return True
+        return self._direction == 'horizontal'
 
     def is_vertical(self):
         """Is the move vertical (only)."""
-        if self.vertical == 0:
-            return False
-        if self.horizontal != 0:
-            return False
-        return True
+        return self._direction == 'vertical'
 
     def get_steps(self):
         """Return the horizontal/vertical steps of the move."""
-        horizontal_steps = self.indices['dest']['x'] - \
-            self.indices['or']['x']
-        vertical_steps = self.indices['dest']['y'] - \
-            self.indices['or']['y']
+        (origin_x, origin_y, dest_x, dest_y) = self._coordinates
+        return (dest_x - origin_x, dest_y - origin_y)
+
+    def share(self, move):
+        """Take over the attributes of a shared move.
 
-        return (horizontal_steps, vertical_steps)
+        Used by subclasses to reuse a move from MOVE_TABLE instead of parsing
+        the move text again.
+
+        Parameters:
+            move(Move): The move to take the attributes from
+        """
+        self.text = move.text
+        self.origin = move.origin
+        self.destination = move.destination
+        self.promote_to = move.promote_to
+        self.horizontal = move.horizontal
+        self.vertical = move.vertical
+        self._coordinates = move._coordinates
+        self._direction = move._direction
+        self._between = move._between
+
+    def __setattr__(self, name, value):
+        """Prevent changes to moves, since they are shared."""
+        if getattr(self, '_frozen', False):
+            raise AttributeError("Moves can't be changed")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        """Copy and pickle moves as the shared move."""
+        return (_shared_move, (self.text,))
 
     def __eq__(self, item):
         """Describe how to compare a Move."""
@@ -169,6 +206,31 @@ class Move(ABC):
         except TypeError:
             return NotImplemented
 
+    def __hash__(self):
+        """Hash a move by its text, like the strings it's equal to."""
+        return hash(self.text)
+
     def __str__(self):
         """Text representation of a Move."""
         return self.text
+
+
+def _shared_move(text):
+    """Return the shared move for a move text."""
+    return Move.get(text[:2], text[2:4], text[4:5])
+
+
+MOVE_TABLE = {
+    origin: {destination: Move(origin + destination)
+             for destination in selectorlist}
+    for origin in selectorlist
+}
+PROMOTION_TABLE = {
+    (origin, destination, piece): Move(origin + destination + piece)
+    for color, last_row in ((colors.WHITE, '8'), (colors.BLACK, '1'))
+    for origin in selectorlist
+    for destination in chain(PAWN_PUSHES[color][origin],
+                             PAWN_ATTACKS[color][origin])
+    if destination[1] == last_row
+    for piece in PROMOTIONS
+}
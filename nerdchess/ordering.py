@@ -0,0 +1,180 @@
+"""Order the moves of a position so the best ones are searched first.
+
+Alpha-beta only skips the moves after one that's good enough (a cutoff), so
+the sooner a good move is searched the less has to be searched at all. Moves
+are tried in this order:
+
+    1. The hash move, the best move found for the position before
+    2. Captures and queen promotions, the most valuable victim by the least
+       valuable attacker first (MVV-LVA)
+    3. Killer moves, quiet moves that caused a cutoff at the same ply
+    4. Other quiet moves, by how often they caused cutoffs (history)
+    5. Promotions to other pieces than a queen
+
+Example:
+    >>> ordering = MoveOrdering()
+    >>> moves = ordering.order(board, board.pseudo_legal_moves(), ply=0)
+    >>> ordering.cutoff(board, moves[3], ply=0, depth=4, index=3)
+    >>> ordering.first_cutoff_rate
+
+Attributes:
+    PIECE_RANKS (dict): The rank of every piece class by its exchange value
+                        (pawn 1 to king 6), for MVV-LVA.
+    HASH_SCORE (int): The score of the hash move.
+    CAPTURE_SCORE (int): The base score of captures and queen promotions.
+    KILLER_SCORES (tuple(int)): The scores of the killer moves of a ply.
+    MAX_PLY (int): The deepest ply killer moves are kept for.
+"""
+from nerdchess.board import EXCHANGE_VALUES
+from nerdchess.config import colors
+from nerdchess.encoding import SQUARE_INDEX
+from nerdchess.pieces import Pawn, Queen
+
+PIECE_RANKS = {
+    piece: rank for (rank, piece) in enumerate(
+        sorted(EXCHANGE_VALUES, key=EXCHANGE_VALUES.get), 1)
+}
+HASH_SCORE = 10000000
+CAPTURE_SCORE = 1000000
+KILLER_SCORES = (900000, 800000)
+MAX_PLY = 128
+
+_HISTORY_LIMIT = 700000
+
+
+class MoveOrdering():
+    """Order moves by the hash move, MVV-LVA, killer moves and history.
+
+    Killer moves and the history are learned from the cutoffs reported with
+    cutoff(), and kept between the iterations of a search.
+
+    Attributes:
+        killers(list(list(Move))): The last two quiet moves that caused a
+                                   cutoff, by ply
+        history(list(int)): How much every quiet move caused cutoffs, by
+                            color, origin and destination index
+        positions(int): The amount of positions ordered
+        cutoffs(int): The amount of positions with a cutoff
+        first_cutoffs(int): The amount of cutoffs by the first move
+    """
+
+    def __init__(self):
+        """Init."""
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [0] * (2 * 64 * 64)
+        self.reset_stats()
+
+    def order(self, board, moves, ply, hash_move=None):
+        """Sort moves from the most to the least promising.
+
+        Parameters:
+            board(Board): The board the moves are made on
+            moves(iterable(Move)): The moves of the color to move
+            ply(int): The distance from the root of the search
+            hash_move(Move): Optional: The best move found before
+
+        Returns:
+            list(Move): The moves, the most promising first
+        """
+        self.positions += 1
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history
+        offset = 0 if board.turn == colors.WHITE else 4096
+        selectors = board.selectors
+
+        scored = []
+        for move in moves:
+            if move is hash_move:
+                score = HASH_SCORE
+            else:
+                score = self.__capture_score(selectors, move)
+                if score is None:
+                    if move is killers[0]:
+                        score = KILLER_SCORES[0]
+                    elif move is killers[1]:
+                        score = KILLER_SCORES[1]
+                    else:
+                        score = history[offset
+                                        + SQUARE_INDEX[move.origin] * 64
+                                        + SQUARE_INDEX[move.destination]]
+            scored.append((score, move))
+
+        scored.sort(key=_score, reverse=True)
+        return [move for (_, move) in scored]
+
+    def cutoff(self, board, move, ply, depth, index):
+        """Learn from a move that caused a cutoff.
+
+        Parameters:
+            board(Board): The board the move was made on, as it was before
+            move(Move): The move that caused the cutoff
+            ply(int): The distance from the root of the search
+            depth(int): The depth the move was searched to
+            index(int): The position of the move in the ordered moves
+        """
+        self.cutoffs += 1
+        if not index:
+            self.first_cutoffs += 1
+        if self.__capture_score(board.selectors, move) is not None:
+            return
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] is not move:
+                (killers[0], killers[1]) = (move, killers[0])
+
+        index = ((0 if board.turn == colors.WHITE else 4096)
+                 + SQUARE_INDEX[move.origin] * 64
+                 + SQUARE_INDEX[move.destination])
+        self.history[index] += depth * depth
+        if self.history[index] > _HISTORY_LIMIT:
+            self.history = [value // 2 for value in self.history]
+
+    def new_search(self):
+        """Forget the killer moves and age the history for a new search."""
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [value // 2 for value in self.history]
+
+    def clear(self):
+        """Forget everything that was learned."""
+        self.__init__()
+
+    def reset_stats(self):
+        """Set the counters of positions and cutoffs to 0."""
+        self.positions = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+
+    @property
+    def first_cutoff_rate(self):
+        """The share of cutoffs caused by the first move."""
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def __str__(self):
+        """Text representation of the ordering statistics."""
+        return ("{} positions, {} cutoffs, {:.1%} by the first move".format(
+            self.positions, self.cutoffs, self.first_cutoff_rate))
+
+    @staticmethod
+    def __capture_score(selectors, move):
+        """Score a capture or promotion by MVV-LVA, None for quiet moves."""
+        attacker = selectors[move.origin].occupant
+        victim = selectors[move.destination].occupant
+        if move.promote_to:
+            if move.promote_to != 'q':
+                return -1
+            victim_rank = PIECE_RANKS[Queen] + (
+                PIECE_RANKS[type(victim)] if victim else 0)
+            return CAPTURE_SCORE + victim_rank * 10 - PIECE_RANKS[Pawn]
+        if victim:
+            return (CAPTURE_SCORE + PIECE_RANKS[type(victim)] * 10
+                    - PIECE_RANKS[type(attacker)])
+        if type(attacker) is Pawn and move.horizontal:
+            # En passant, the only capture onto an empty square
+            return CAPTURE_SCORE + PIECE_RANKS[Pawn] * 10 - PIECE_RANKS[Pawn]
+        return None
+
+
+def _score(scored):
+    """Return the score of a (score, move) pair."""
+    return scored[0]
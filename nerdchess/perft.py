@@ -0,0 +1,226 @@
+"""Count the positions reachable from a board to test move generation.
+
+Perft (performance test) walks the tree of legal moves to a fixed depth and
+counts the positions at the end. The counts of many positions are known, so a
+different count means a bug in move generation, and the time it takes is a
+measure of its speed.
+
+The functions walk Board.legal_moves() with make_move() and unmake_move().
+With rules=True (--rules) they play every move through the rules instead,
+like ChessGame.move() does: the moves of every piece from
+Piece.allowed_moves(), validated by BoardRules and made with
+BoardMove.make(). That's much slower, but counts the positions the rules of
+a game allow.
+
+Example:
+    $ python -m nerdchess.perft --depth 3
+    $ python -m nerdchess.perft --fen '8/8/8/KP5r/8/8/8/7k w - -' --divide
+    $ python -m nerdchess.perft --suite --max-nodes 10000
+    $ python -m nerdchess.perft --depth 2 --rules
+
+Attributes:
+    REFERENCE_POSITIONS (list(tuple)): Positions with their known counts by
+                                       depth, as (name, fen, counts).
+"""
+import argparse
+import sys
+import time
+from tabulate import tabulate
+from nerdchess.board import Board, START_FEN
+from nerdchess.boardmove import BoardMove
+from nerdchess.move import PROMOTIONS
+
+REFERENCE_POSITIONS = [
+    ('start', START_FEN,
+     (20, 400, 8902, 197281)),
+    ('kiwipete',
+     'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     (48, 2039, 97862)),
+    ('position 3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     (14, 191, 2812, 43238)),
+    ('position 4',
+     'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     (6, 264, 9467)),
+    ('position 5',
+     'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     (44, 1486, 62379)),
+    ('position 6',
+     'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - '
+     '0 10',
+     (46, 2079, 89890)),
+]
+
+
+def perft(board, depth, rules=False):
+    """Count the positions after all sequences of legal moves of a depth.
+
+    Parameters:
+        board(Board): The board to start from, it's restored afterwards
+        depth(int): The amount of moves (plies) to look ahead
+        rules(Bool): Generate and make the moves through the rules of the
+                     pieces and the board
+
+    Returns:
+        int: The amount of positions
+    """
+    if depth == 0:
+        return 1
+    if rules:
+        return sum(count for (_, count) in divide(board, depth, rules))
+
+    moves = list(board.legal_moves())
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        record = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(record)
+
+    return nodes
+
+
+def divide(board, depth, rules=False):
+    """Count the positions per legal move of the board, see perft().
+
+    Comparing these counts to those of another move generator shows which
+    move is generated wrong.
+
+    Parameters:
+        board(Board): The board to start from, it's restored afterwards
+        depth(int): The amount of moves (plies) to look ahead, at least 1
+        rules(Bool): Generate and make the moves through the rules of the
+                     pieces and the board
+
+    Returns:
+        list(tuple(String, int)): The move texts with their amount of
+                                  positions
+    """
+    counts = []
+    if rules:
+        for move in rule_moves(board):
+            record = move.make()
+            if record:
+                counts.append((str(move), perft(board, depth - 1, rules)))
+                board.unmake_move(record)
+        return counts
+
+    for move in list(board.legal_moves()):
+        record = board.make_move(move)
+        counts.append((str(move), perft(board, depth - 1)))
+        board.unmake_move(record)
+
+    return counts
+
+
+def rule_moves(board):
+    """Generate the moves the pieces to move allow, checked by the rules.
+
+    Moves to the last row are generated once for every promotion piece.
+    Castling is only generated as the king moving two squares, the rules
+    also accept other texts for it (eg. e1h1). The moves might still leave
+    the king in check, BoardMove.make() refuses those.
+
+    Parameters:
+        board(Board): The board to generate the moves on
+
+    Yields:
+        BoardMove: The moves validated by BoardRules
+    """
+    for piece in list(board.piece_list(board.squares, board.turn)):
+        for move in piece.allowed_moves(board=board):
+            if move.is_castling() and abs(move.horizontal) != 2:
+                continue
+            if not move.promotion:
+                yield move
+                continue
+            for char in PROMOTIONS:
+                yield BoardMove(board, move.text + char)
+
+
+def timed(function, board, depth, rules=False):
+    """Run perft() or divide() and measure how long it takes.
+
+    Returns:
+        tuple(result, float): The result and the seconds it took
+    """
+    start = time.perf_counter()
+    result = function(board, depth, rules)
+    return (result, time.perf_counter() - start)
+
+
+def nodes_per_second(nodes, seconds):
+    """Return the amount of positions counted per second."""
+    return int(nodes / seconds) if seconds else 0
+
+
+def run_suite(max_nodes, rules=False):
+    """Run perft on the reference positions up to a node count.
+
+    Parameters:
+        max_nodes(int): Skip depths with more positions than this
+        rules(Bool): Play the moves through the rules, see perft()
+
+    Returns:
+        list(list): Rows of name, depth, positions, expected, nodes per
+                    second and whether the count was right
+    """
+    rows = []
+    for (name, fen, counts) in REFERENCE_POSITIONS:
+        for (depth, expected) in enumerate(counts, 1):
+            if expected > max_nodes:
+                break
+            (nodes, seconds) = timed(perft, Board.from_fen(fen), depth, rules)
+            rows.append([name, depth, nodes, expected,
+                         nodes_per_second(nodes, seconds), nodes == expected])
+
+    return rows
+
+
+def main(argv=None):
+    """Run perft from the commandline.
+
+    Returns:
+        int: The exit code, 1 when a reference count was wrong
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m nerdchess.perft',
+        description='Count the positions reachable from a chess position.')
+    parser.add_argument('--fen', default=START_FEN,
+                        help='the position to start from')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='the amount of moves to look ahead')
+    parser.add_argument('--divide', action='store_true',
+                        help='show the count per legal move')
+    parser.add_argument('--suite', action='store_true',
+                        help='run the reference positions')
+    parser.add_argument('--max-nodes', type=int, default=100000,
+                        help='the largest reference count to run')
+    parser.add_argument('--rules', action='store_true',
+                        help='make the moves through the rules of a game')
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        rows = run_suite(args.max_nodes, args.rules)
+        print(tabulate(rows, headers=['position', 'depth', 'nodes',
+                                      'expected', 'nodes/s', 'ok']))
+        return 0 if all(row[-1] for row in rows) else 1
+
+    board = Board.from_fen(args.fen)
+    if args.divide:
+        (counts, seconds) = timed(divide, board, args.depth, args.rules)
+        for (move, count) in counts:
+            print("{}: {}".format(move, count))
+        print()
+        nodes = sum(count for (_, count) in counts)
+    else:
+        (nodes, seconds) = timed(perft, board, args.depth, args.rules)
+
+    print("Nodes: {}".format(nodes))
+    print("Nodes/s: {}".format(nodes_per_second(nodes, seconds)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
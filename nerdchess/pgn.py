@@ -0,0 +1,302 @@
+"""Read games in Portable Game Notation and replay them.
+
+Archives are read as a stream of lines, so only one game is held in memory
+at a time:
+
+    with open('archive.pgn') as pgn_file:
+        for result in pgn.replay_games(pgn_file):
+            if result.error:
+                print(result.ply, result.error)
+
+Moves in PGN are written in Standard Algebraic Notation (eg. Nf3), which
+san_to_move() converts to the notation BoardMove expects (eg. g1f3).
+
+Games are replayed through ChessGame.move, checking every move against the
+rules. Trusted games (eg. from our own database) can be replayed on a bare
+board instead, only checking whether a move leaves its king in check when the
+SAN is ambiguous without it.
+"""
+import re
+from nerdchess.board import Board, FEN_PIECES, START_FEN
+from nerdchess.config import colors
+from nerdchess.game import ChessGame
+from nerdchess.pieces import King, Pawn
+from nerdchess.player import Player
+
+TAG_REGEX = re.compile(r'\[(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN_REGEX = re.compile(
+    r'\{[^}]*\}?|;[^\n]*|\(|\)|\$\d+|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s(){};$]+')
+SAN_REGEX = re.compile(
+    r'([KQRBN])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([QRBNqrbn]))?$')
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+
+class PgnGame():
+    """A game read from PGN.
+
+    Parameters:
+        tags(dict): The tag pairs of the game (eg. {'White': 'Morphy'})
+        moves(list(String)): The moves in SAN (eg. ['e4', 'e5', 'Nf3'])
+        result(String): The result (1-0, 0-1, 1/2-1/2 or *)
+
+    Attributes:
+        tags(dict): The tag pairs of the game
+        moves(list(String)): The moves in SAN
+        result(String): The result
+        fen(String): The position the game starts from
+    """
+
+    def __init__(self, tags, moves, result='*'):
+        """Init."""
+        self.tags = tags
+        self.moves = moves
+        self.result = tags.get('Result', result)
+        self.fen = tags.get('FEN', START_FEN)
+
+
+class ReplayError(ValueError):
+    """A move of a game can't be replayed.
+
+    Parameters:
+        message(String): What went wrong
+        ply(int): The number of the move, starting at 1
+        san(String): The move in SAN
+    """
+
+    def __init__(self, message, ply=None, san=None):
+        """Init."""
+        super().__init__(message)
+        self.ply = ply
+        self.san = san
+
+
+class ReplayResult():
+    """The result of replaying a game.
+
+    Attributes:
+        game(PgnGame): The replayed game
+        moves(list(String)): The moves that were replayed (eg. g1f3)
+        fen(String): The position after the last replayed move
+        error(String): Why the game couldn't be replayed, or None
+        ply(int): The number of the move that couldn't be replayed, or None
+    """
+
+    def __init__(self, game, moves, fen, error=None, ply=None):
+        """Init."""
+        self.game = game
+        self.moves = moves
+        self.fen = fen
+        self.error = error
+        self.ply = ply
+
+    def __bool__(self):
+        """Was the game replayed without errors."""
+        return self.error is None
+
+
+def read_games(lines):
+    """Read games from PGN one at a time.
+
+    Parameters:
+        lines(iterable(String)): The lines of the PGN, like an open file
+
+    Yields:
+        PgnGame: The games in the order they're in
+    """
+    tags = {}
+    movetext = []
+    in_comment = False
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith('%') and not in_comment:
+            continue
+
+        tag = TAG_REGEX.match(line)
+        if tag and not in_comment:
+            if movetext:
+                yield _parse_game(tags, movetext)
+                (tags, movetext) = ({}, [])
+            tags[tag.group(1)] = tag.group(2).replace('\\"', '"')
+        elif line:
+            movetext.append(line)
+            in_comment = _ends_in_comment(line, in_comment)
+        elif movetext and not in_comment:
+            yield _parse_game(tags, movetext)
+            (tags, movetext) = ({}, [])
+
+    if tags or movetext:
+        yield _parse_game(tags, movetext)
+
+
+def _ends_in_comment(line, in_comment):
+    """Check if a line of movetext ends inside a {comment}.
+
+    Comments can span lines and contain anything but a closing brace.
+    """
+    index = 0
+    while True:
+        if in_comment:
+            index = line.find('}', index)
+            if index == -1:
+                return True
+            in_comment = False
+        else:
+            brace = line.find('{', index)
+            semicolon = line.find(';', index)
+            if brace == -1 or -1 < semicolon < brace:
+                return False
+            (index, in_comment) = (brace, True)
+
+
+def _parse_game(tags, movetext):
+    """Pick the moves and result out of the movetext of a game."""
+    moves = []
+    result = '*'
+    variations = 0
+
+    for token in TOKEN_REGEX.findall('\n'.join(movetext)):
+        if token == '(':
+            variations += 1
+        elif token == ')':
+            variations = max(variations - 1, 0)
+        elif variations or token[0] in '{;$' or token.endswith('.'):
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+
+    return PgnGame(tags, moves, result)
+
+
+def san_to_move(board, san, trusted=False):
+    """Convert a move in SAN to the notation of BoardMove.
+
+    Parameters:
+        board(Board): The board the move is played on, by the side to move
+        san(String): The move in SAN (eg. Nbd7, exd5, O-O or e8=Q+)
+        trusted(Bool): Only check whether moves leave the king in check when
+                       the SAN is ambiguous without it
+
+    Returns:
+        String: The move (eg. b8d7), with the piece to promote to (eg. e7e8q)
+    """
+    text = san.rstrip('+#!?')
+    color = board.turn
+
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        row = 1 if color == colors.WHITE else 8
+        (kind, origin_file, origin_row) = (King, 'e', str(row))
+        destination = "{}{}".format('g' if len(text) == 3 else 'c', row)
+        promote_to = None
+    else:
+        match = SAN_REGEX.match(text)
+        if not match:
+            raise ReplayError("Invalid SAN '{}'".format(san), san=san)
+        (piece, origin_file, origin_row, destination, promote_to) = (
+            match.groups())
+        kind = FEN_PIECES[piece.lower()] if piece else Pawn
+        promote_to = promote_to.lower() if promote_to else None
+
+    candidates = []
+    moves = board.pseudo_legal_moves() if trusted else board.legal_moves()
+    for move in moves:
+        if (move.destination == destination
+                and move.promote_to == promote_to
+                and (not origin_file or move.origin[0] == origin_file)
+                and (not origin_row or move.origin[1] == origin_row)
+                and type(board.selectors[move.origin].occupant) is kind):
+            candidates.append(move)
+
+    if trusted and len(candidates) > 1:
+        candidates = [move for move in candidates
+                      if move in board.legal_moves()]
+    if len(candidates) != 1:
+        error = 'Illegal' if not candidates else 'Ambiguous'
+        raise ReplayError("{} move '{}'".format(error, san), san=san)
+
+    return candidates[0].text
+
+
+def replay(game, trusted=False):
+    """Replay the moves of a game.
+
+    Parameters:
+        game(PgnGame): The game to replay
+        trusted(Bool): Replay on a bare board without checking the rules,
+                       see san_to_move()
+
+    Yields:
+        tuple(int, String, Board): The ply, the move (eg. g1f3) and the
+                                   board after the move. Trusted games
+                                   change the same board in place.
+
+    Raises:
+        ReplayError: When a move can't be replayed
+    """
+    if trusted:
+        board = Board.from_fen(game.fen)
+    else:
+        (white, black) = Player.create_two(
+            game.tags.get('White', 'white'), game.tags.get('Black', 'black'),
+            colors.WHITE.value)
+        chessgame = ChessGame.from_fen(white, black, game.fen)
+
+    for (ply, san) in enumerate(game.moves, 1):
+        if not trusted:
+            board = chessgame.board
+        try:
+            move = san_to_move(board, san, trusted)
+        except ReplayError as error:
+            error.ply = ply
+            raise
+
+        if trusted:
+            board.make_move(move)
+        else:
+            player = white if white.turn else black
+            if not chessgame.move(player, move):
+                raise ReplayError("Illegal move '{}'".format(san), ply, san)
+            board = chessgame.board
+
+        yield (ply, move, board)
+
+
+def replay_games(lines, trusted=False):
+    """Read and replay the games in PGN one at a time.
+
+    Parameters:
+        lines(iterable(String)): The lines of the PGN, like an open file
+        trusted(Bool): Replay on a bare board, see replay()
+
+    Yields:
+        ReplayResult: The result of every game, in the order they're in
+    """
+    for game in read_games(lines):
+        yield replay_game(game, trusted)
+
+
+def replay_game(game, trusted=False):
+    """Replay a game up to its end or its first invalid move.
+
+    Parameters:
+        game(PgnGame): The game to replay
+        trusted(Bool): Replay on a bare board, see replay()
+
+    Returns:
+        ReplayResult: The moves, the last position and the error, if any
+    """
+    moves = []
+    board = None
+    try:
+        for (_, move, board) in replay(game, trusted):
+            moves.append(move)
+    except ReplayError as error:
+        return ReplayResult(
+            game, moves, board.to_fen() if board else game.fen, str(error),
+            error.ply)
+    except ValueError as error:
+        return ReplayResult(game, moves, game.fen, str(error))
+
+    return ReplayResult(game, moves, board.to_fen() if board else game.fen)
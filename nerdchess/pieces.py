@@ -1,6 +1,8 @@
 """This module describes what pieces and pawns look like."""
 from abc import ABC, abstractmethod
-from nerdchess.config import colors, numbers, letterlist
+from itertools import chain
+from nerdchess import encoding, tables
+from nerdchess.config import colors, letterlist
 from nerdchess.move import Move
 from nerdchess.boardmove import BoardMove
 
@@ -41,58 +43,52 @@ class Piece(ABC):
 
     def diagonal_pattern(self):
         """Return a diagonal movement pattern as a list (bishops)."""
-        pattern = []
-        cur_letter = self.position[0]
-        pos_letter = letterlist.index(cur_letter)
-
-        for letter in letterlist:
-            letter_diff = letterlist.index(letter) - pos_letter
-            pattern.append((0 + letter_diff, letter_diff))
-            pattern.append((0 - letter_diff, letter_diff))
-            pattern.append((letter_diff, 0 + letter_diff))
-            pattern.append((letter_diff, 0 - letter_diff))
-
-        return pattern
+        return [tables.steps_between(self.position, target)
+                for target in chain.from_iterable(
+                    tables.DIAGONAL_RAYS[self.position])]
 
     def straight_pattern(self):
         """Return a straight movement pattern as a list (rooks)."""
-        pattern = []
-        cur_letter = self.position[0]
-        cur_number = int(self.position[1])
-        pos_letter = letterlist.index(cur_letter)
-        pos_number = numbers.index(cur_number)
+        return [tables.steps_between(self.position, target)
+                for target in chain.from_iterable(
+                    tables.STRAIGHT_RAYS[self.position])]
 
-        for letter in letterlist:
-            letter_diff = letterlist.index(letter) - pos_letter
-            pattern.append((letter_diff, 0))
-        for number in numbers:
-            number_diff = numbers.index(number) - pos_number
-            pattern.append((0, number_diff))
+    def move_targets(self):
+        """Return the squares the move pattern reaches from the position.
 
-        return pattern
+        Pieces override this with a lookup in nerdchess.tables.
+
+        Returns:
+            iterable(String): Selectors of the squares on the board
+        """
+        targets = (tables.step(self.position, steps)
+                   for steps in self.move_pattern())
+        return [target for target in targets if target]
 
-    def allowed_moves(self, board=False, debug=False, check_checking=False):
+    def allowed_moves(self, board=False, debug=False, check_checking=False,
+                      encoded=False):
         """Transform the move pattern into a list of allowed moves.
 
+        Parameters:
+            board(Board): Optional: The board to validate the moves on
+            encoded(Bool): Return the moves as codes from nerdchess.encoding
+
         Returns:
             list(Move, ): A list of allowed moves for the piece
                           doesn't factor in other pieces on the board.
         """
         allowed_moves = []
-        for move in self.move_pattern():
-            try:
-                new_move = Move.from_position(self.position, move)
-
-                if board and new_move:
-                    boardmove = BoardMove(board, new_move.text,
-                                          check_checking=check_checking)
-                    if boardmove.valid:
-                        allowed_moves.append(boardmove)
-                elif new_move:
-                    allowed_moves.append(new_move)
-            except IndexError:
-                pass
-
+        for target in self.move_targets():
+            if board:
+                boardmove = BoardMove(board, self.position + target,
+                                      check_checking=check_checking)
+                if boardmove.valid:
+                    allowed_moves.append(boardmove)
+            else:
+                allowed_moves.append(Move.get(self.position, target))
+
+        if encoded:
+            return [encoding.encode(move) for move in allowed_moves]
         return allowed_moves
 
     @abstractmethod
@@ -166,6 +162,11 @@ class Pawn(Piece):
 
         return pattern
 
+    def move_targets(self):
+        """Return the squares the pawn could move to from its position."""
+        return (tables.PAWN_PUSHES[self.color][self.position] +
+                tables.PAWN_ATTACKS[self.color][self.position])
+
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = Pawn(self.color)
@@ -201,6 +202,10 @@ class Rook(Piece):
         """
         return self.straight_pattern()
 
+    def move_targets(self):
+        """Return the squares the rook could move to from its position."""
+        return chain.from_iterable(tables.STRAIGHT_RAYS[self.position])
+
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = Rook(self.color)
@@ -236,6 +241,10 @@ class Bishop(Piece):
         """
         return self.diagonal_pattern()
 
+    def move_targets(self):
+        """Return the squares the bishop could move to from its position."""
+        return chain.from_iterable(tables.DIAGONAL_RAYS[self.position])
+
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = Bishop(self.color)
@@ -269,17 +278,11 @@ class Knight(Piece):
         Returns:
             list(tuple(int, int), ): Move pattern as list of tuples
         """
-        pattern = [
-            (2, 1),
-            (2, -1),
-            (-2, 1),
-            (-2, -1),
-            (1, 2),
-            (-1, 2),
-            (1, -2),
-            (-1, -2)
-        ]
-        return pattern
+        return list(tables.KNIGHT_STEPS)
+
+    def move_targets(self):
+        """Return the squares the knight could move to from its position."""
+        return tables.KNIGHT_TARGETS[self.position]
 
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
@@ -319,6 +322,12 @@ class Queen(Piece):
         pattern = straight + diagonal
         return pattern
 
+    def move_targets(self):
+        """Return the squares the queen could move to from its position."""
+        return chain(
+            chain.from_iterable(tables.STRAIGHT_RAYS[self.position]),
+            chain.from_iterable(tables.DIAGONAL_RAYS[self.position]))
+
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = Queen(self.color)
@@ -352,16 +361,7 @@ class King(Piece):
         Returns:
             list(tuple(int, int), ): Move pattern as list of tuples
         """
-        pattern = [
-            (0, 1),
-            (0, -1),
-            (1, 1),
-            (1, -1),
-            (1, 0),
-            (-1, 1),
-            (-1, 0),
-            (-1, -1)
-        ]
+        pattern = list(tables.KING_STEPS)
 
         if self.position == self.start_position():
             pattern.append((2, 0))
@@ -372,6 +372,13 @@ class King(Piece):
 
         return pattern
 
+    def move_targets(self):
+        """Return the squares the king could move to from its position."""
+        targets = tables.KING_TARGETS[self.position]
+        if self.position == self.start_position():
+            targets += tables.CASTLING_TARGETS[self.position]
+        return targets
+
     def __deepcopy__(self, memodict={}):
         """Deepcopy."""
         obj = King(self.color)
@@ -0,0 +1,153 @@
+"""Count and time the hot paths of nerdchess.
+
+Instrumentation is off by default and costs nothing then: enable() wraps the
+instrumented functions with counters and timers, disable() puts the
+originals back. Every call is recorded in the global STATS, and calls made
+during ChessGame.move() in the stats of that game as well. Times include
+the time of nested calls, so one move shows how much of it went to the rule
+checks it triggered.
+
+Example:
+    >>> stats.enable()
+    >>> chessgame.move(player, 'e2e4')
+    >>> print(chessgame.stats.report())
+    >>> stats.disable()
+
+Attributes:
+    STATS (Stats): The stats of all calls while instrumentation is enabled.
+    INSTRUMENTED (list(tuple)): The instrumented functions as (class,
+                                attribute, name).
+"""
+import functools
+import time
+from tabulate import tabulate
+from nerdchess import game
+from nerdchess.board import Board
+from nerdchess.boardmove import BoardMove
+from nerdchess.boardrules import BoardRules
+from nerdchess.pieces import Piece
+
+
+class Stats():
+    """Counts and times of named operations.
+
+    Attributes:
+        calls(dict): The amount of calls by operation name
+        seconds(dict): The total seconds spent by operation name
+    """
+
+    def __init__(self):
+        """Init."""
+        self.calls = {}
+        self.seconds = {}
+
+    def add(self, name, seconds):
+        """Record a call of an operation.
+
+        Parameters:
+            name(String): The name of the operation (eg. Board.is_check)
+            seconds(float): The time the call took
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def reset(self):
+        """Forget all recorded calls."""
+        self.calls.clear()
+        self.seconds.clear()
+
+    def report(self):
+        """Return a table of the operations, the most time consuming first.
+
+        Returns:
+            String: The calls, total milliseconds and mean microseconds of
+                    every operation
+        """
+        rows = []
+        for name in sorted(self.calls, key=self.seconds.get, reverse=True):
+            (calls, seconds) = (self.calls[name], self.seconds[name])
+            rows.append([name, calls, seconds * 1000, seconds * 1e6 / calls])
+
+        return tabulate(rows, headers=['operation', 'calls', 'total ms',
+                                       'mean us'], floatfmt='.1f')
+
+    def __str__(self):
+        """Text representation of the stats."""
+        return self.report()
+
+
+STATS = Stats()
+INSTRUMENTED = [
+    (BoardMove, '__init__', 'BoardMove'),
+    (BoardRules, 'apply', 'BoardRules.apply'),
+    (Board, 'new_board', 'Board.new_board'),
+    (Board, '__deepcopy__', 'Board.deepcopy'),
+    (Board, 'make_move', 'Board.make_move'),
+    (Board, 'is_check', 'Board.is_check'),
+    (Piece, 'allowed_moves', 'Piece.allowed_moves'),
+]
+
+# The stats to record calls in, the game being moved in is pushed on top
+_collectors = [STATS]
+_originals = {}
+
+
+def _record(name, seconds):
+    """Record a call in all active stats."""
+    for collector in _collectors:
+        collector.add(name, seconds)
+
+
+def _instrument(function, name):
+    """Wrap a function with a counter and timer."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _instrument_game(function):
+    """Wrap ChessGame.move to record its calls in the stats of the game."""
+    @functools.wraps(function)
+    def wrapper(chessgame, *args, **kwargs):
+        _collectors.append(chessgame.stats)
+        start = time.perf_counter()
+        try:
+            return function(chessgame, *args, **kwargs)
+        finally:
+            _record('ChessGame.move', time.perf_counter() - start)
+            _collectors.pop()
+
+    return wrapper
+
+
+def is_enabled():
+    """Is instrumentation enabled."""
+    return bool(_originals)
+
+
+def enable():
+    """Start counting and timing the instrumented functions."""
+    if is_enabled():
+        return
+
+    for (cls, attribute, name) in INSTRUMENTED:
+        original = cls.__dict__[attribute]
+        _originals[(cls, attribute)] = original
+        setattr(cls, attribute, _instrument(original, name))
+
+    original = game.ChessGame.__dict__['move']
+    _originals[(game.ChessGame, 'move')] = original
+    game.ChessGame.move = _instrument_game(original)
+
+
+def disable():
+    """Stop counting and timing, restoring the original functions."""
+    for ((cls, attribute), original) in _originals.items():
+        setattr(cls, attribute, original)
+    _originals.clear()
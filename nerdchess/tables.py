@@ -0,0 +1,106 @@
+"""Precomputed move and attack tables for every square of a board.
+
+The tables are built once at import and map square selectors (eg. 'e4') to
+the selectors pieces can reach from there. They only contain squares on the
+board and never contain duplicates.
+
+Attributes:
+    KNIGHT_TARGETS (dict): The squares a knight reaches from a square.
+    KING_TARGETS (dict): The squares a king reaches from a square.
+    CASTLING_TARGETS (dict): The castling destinations from the start square
+                             of a king, in all notations nerdchess accepts.
+    PAWN_PUSHES (dict): By color, the squares a pawn moves forward to.
+    PAWN_ATTACKS (dict): By color, the squares a pawn attacks from a square.
+    STRAIGHT_RAYS (dict): The four straight rays from a square.
+    DIAGONAL_RAYS (dict): The four diagonal rays from a square.
+    FILE_INDEX (dict): The index of each letter of the board.
+"""
+from nerdchess.config import colors, letterlist, numbers, selectorlist
+
+FILE_INDEX = {letter: index for index, letter in enumerate(letterlist)}
+
+KNIGHT_STEPS = ((2, 1), (2, -1), (-2, 1), (-2, -1),
+                (1, 2), (-1, 2), (1, -2), (-1, -2))
+KING_STEPS = ((0, 1), (0, -1), (1, 1), (1, -1),
+              (1, 0), (-1, 1), (-1, 0), (-1, -1))
+STRAIGHT_STEPS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def step(selector, steps):
+    """Return the selector of the square some steps away, or None.
+
+    Parameters:
+        selector(String): The square to start from (eg. e4)
+        steps(tuple(int, int)): The horizontal and vertical steps to take
+
+    Returns:
+        String: The selector of the square, None if it's off the board
+    """
+    (letter_steps, number_steps) = steps
+    letter_index = FILE_INDEX[selector[0]] + letter_steps
+    number = int(selector[1]) + number_steps
+
+    if 0 <= letter_index < len(letterlist) and number in numbers:
+        return "{}{}".format(letterlist[letter_index], number)
+    return None
+
+
+def steps_between(origin, destination):
+    """Return the horizontal and vertical steps from one square to another.
+
+    Parameters:
+        origin(String): The square to start from (eg. e4)
+        destination(String): The square to end on (eg. g5)
+
+    Returns:
+        tuple(int, int): The horizontal and vertical steps
+    """
+    return (FILE_INDEX[destination[0]] - FILE_INDEX[origin[0]],
+            int(destination[1]) - int(origin[1]))
+
+
+def _targets(selector, step_list):
+    """Return the squares reached by a single step of each steps."""
+    targets = (step(selector, steps) for steps in step_list)
+    return tuple(target for target in targets if target)
+
+
+def _rays(selector, step_list):
+    """Return the rays in each direction, nearest square first."""
+    rays = []
+    for steps in step_list:
+        ray = []
+        target = step(selector, steps)
+        while target:
+            ray.append(target)
+            target = step(target, steps)
+        rays.append(tuple(ray))
+    return tuple(rays)
+
+
+def _pawn_pushes(selector, color):
+    """Return the squares a pawn can move forward to."""
+    (forward, start) = (1, 2) if color == colors.WHITE else (-1, 7)
+    pushes = _targets(selector, [(0, forward)])
+    if pushes and int(selector[1]) == start:
+        pushes += _targets(selector, [(0, 2 * forward)])
+    return pushes
+
+
+KNIGHT_TARGETS = {s: _targets(s, KNIGHT_STEPS) for s in selectorlist}
+KING_TARGETS = {s: _targets(s, KING_STEPS) for s in selectorlist}
+CASTLING_TARGETS = {
+    'e1': ('g1', 'h1', 'c1', 'b1', 'a1'),
+    'e8': ('g8', 'h8', 'c8', 'b8', 'a8'),
+}
+PAWN_PUSHES = {
+    colors.WHITE: {s: _pawn_pushes(s, colors.WHITE) for s in selectorlist},
+    colors.BLACK: {s: _pawn_pushes(s, colors.BLACK) for s in selectorlist},
+}
+PAWN_ATTACKS = {
+    colors.WHITE: {s: _targets(s, [(-1, 1), (1, 1)]) for s in selectorlist},
+    colors.BLACK: {s: _targets(s, [(1, -1), (-1, -1)]) for s in selectorlist},
+}
+STRAIGHT_RAYS = {s: _rays(s, STRAIGHT_STEPS) for s in selectorlist}
+DIAGONAL_RAYS = {s: _rays(s, DIAGONAL_STEPS) for s in selectorlist}
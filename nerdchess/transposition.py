@@ -0,0 +1,173 @@
+"""Remember the results of searched positions.
+
+A search reaches the same position through different orders of moves. The
+transposition table stores what was learned about a position by its key, so
+it doesn't have to be searched again.
+
+The table has a fixed amount of slots, chosen by the megabytes it may use.
+Every slot is two 64 bit numbers in flat arrays, the key of the position and
+its packed entry:
+
+    bits 0-15: The best move, as a code from nerdchess.encoding
+    bits 16-47: The score, offset by 2 ** 31
+    bits 48-55: The depth it was searched to
+    bits 56-57: The bound of the score, one of EXACT, LOWER or UPPER
+    bits 58-63: The age, the search it was stored in
+
+Positions share a slot by their key modulo the amount of slots. Which one
+stays is decided by the ReplacementPolicy of the table.
+
+Example:
+    >>> table = TranspositionTable(megabytes=1)
+    >>> table.store(board.key, 3, EXACT, 25, encoding.encode('e2e4'))
+    >>> table.probe(board.key)
+    (3, 1, 25, 1804)
+
+Attributes:
+    EXACT (int): Bound of a score that is exact.
+    LOWER (int): Bound of a score that is at least this (a beta cutoff).
+    UPPER (int): Bound of a score that is at most this (all moves failed
+                 low).
+    SLOT_BYTES (int): The memory of a slot.
+    DEFAULT_MEGABYTES (int): The default size of a table.
+"""
+from array import array
+from nerdchess.config import ReplacementPolicy
+
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+SLOT_BYTES = 16
+DEFAULT_MEGABYTES = 16
+
+_SCORE_OFFSET = 1 << 31
+_SCORE_LIMIT = (1 << 31) - 1
+_AGES = 64
+
+
+class TranspositionTable():
+    """A fixed size table of search results by position key.
+
+    Parameters:
+        megabytes(float): Optional: The memory the slots may use
+        policy(ReplacementPolicy): Optional: Which entry stays when two
+                                   positions share a slot
+
+    Attributes:
+        size(int): The amount of slots
+        policy(ReplacementPolicy): Which entry stays when two positions
+                                   share a slot
+        probes(int): The amount of lookups
+        hits(int): The amount of lookups that found their position
+        stores(int): The amount of entries stored
+        overwrites(int): The amount of stores that replaced another position
+        rejected(int): The amount of stores the policy kept out
+    """
+
+    def __init__(self, megabytes=DEFAULT_MEGABYTES,
+                 policy=ReplacementPolicy.DEPTH_PREFERRED):
+        """Init."""
+        self.size = max(1, int(megabytes * 1024 * 1024) // SLOT_BYTES)
+        self.policy = policy
+        self.__keys = array('Q', bytes(8 * self.size))
+        self.__entries = array('Q', bytes(8 * self.size))
+        self.__age = 0
+        self.reset_stats()
+
+    def probe(self, key):
+        """Look up the entry of a position.
+
+        Parameters:
+            key(int): The key of the position (eg. Board.key)
+
+        Returns:
+            tuple(int, int, int, int): The depth, bound, score and move code
+                                       of the entry, or None
+        """
+        self.probes += 1
+        index = key % self.size
+        entry = self.__entries[index]
+        if not entry or self.__keys[index] != key:
+            return None
+
+        self.hits += 1
+        return (entry >> 48 & 255, entry >> 56 & 3,
+                (entry >> 16 & 0xFFFFFFFF) - _SCORE_OFFSET, entry & 0xFFFF)
+
+    def store(self, key, depth, bound, score, move=0):
+        """Store the entry of a position, if the policy allows it.
+
+        Parameters:
+            key(int): The key of the position (eg. Board.key)
+            depth(int): The depth the position was searched to
+            bound(int): EXACT, LOWER or UPPER
+            score(int): The score of the position
+            move(int): Optional: The best move as a code from
+                       nerdchess.encoding, 0 for none
+
+        Returns:
+            Bool: Was the entry stored
+        """
+        index = key % self.size
+        stored = self.__entries[index]
+        other = stored and self.__keys[index] != key
+
+        if (other and self.policy == ReplacementPolicy.DEPTH_PREFERRED
+                and stored >> 58 == self.__age
+                and stored >> 48 & 255 > depth):
+            self.rejected += 1
+            return False
+
+        if not move and not other and stored:
+            move = stored & 0xFFFF
+        score = max(-_SCORE_LIMIT, min(_SCORE_LIMIT, score))
+        self.__keys[index] = key
+        self.__entries[index] = (
+            move | (score + _SCORE_OFFSET) << 16 | min(depth, 255) << 48
+            | bound << 56 | self.__age << 58)
+
+        self.stores += 1
+        if other:
+            self.overwrites += 1
+        return True
+
+    def new_search(self):
+        """Start a new search, so entries of older ones are replaced first."""
+        self.__age = (self.__age + 1) % _AGES
+
+    def clear(self):
+        """Forget all entries."""
+        self.__keys = array('Q', bytes(8 * self.size))
+        self.__entries = array('Q', bytes(8 * self.size))
+
+    def reset_stats(self):
+        """Set the counters of lookups and stores to 0."""
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+        self.rejected = 0
+
+    @property
+    def hit_rate(self):
+        """The share of lookups that found their position."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def megabytes(self):
+        """The memory used by the slots."""
+        return self.size * SLOT_BYTES / 1024 / 1024
+
+    def usage(self, sample=1000):
+        """Return the share of used slots, of the first slots of the table."""
+        sample = min(sample, self.size)
+        used = sum(1 for entry in self.__entries[:sample] if entry)
+        return used / sample
+
+    def __str__(self):
+        """Text representation of the table."""
+        return ("{:.1f} MB, {} probes, {:.1%} hits, {} stores, {} overwrites, "
+                "{} rejected, {:.1%} used".format(
+                    self.megabytes, self.probes, self.hit_rate, self.stores,
+                    self.overwrites, self.rejected, self.usage()))
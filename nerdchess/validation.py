@@ -0,0 +1,236 @@
+"""Validate large amounts of games on multiple processes.
+
+Games are sent to a pool of worker processes in chunks, and every game is
+replayed through ChessGame.move there. Only a few chunks are in flight at a
+time, so games can be streamed from a file of any size:
+
+    with open('archive.pgn') as pgn_file:
+        for result in validate_games(pgn.read_games(pgn_file), workers=4):
+            if not result:
+                print(result.index, result.ply, result.error)
+
+A game is either a list of moves in the notation of BoardMove (eg. ['e2e4',
+'e7e5']), a string of those moves separated by spaces, or a PgnGame.
+
+The module can also be run from the commandline, see main().
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from nerdchess import pgn
+from nerdchess.config import GameState, colors
+from nerdchess.game import ChessGame
+from nerdchess.player import Player
+
+
+class ValidationResult():
+    """The result of validating a game.
+
+    Attributes:
+        index(int): The position of the game in the input, starting at 0
+        plies(int): The amount of valid moves
+        fen(String): The position after the last valid move
+        result(String): 1-0 or 0-1 when the game ended in mate, 1/2-1/2 in a
+                        draw, or *
+        ply(int): The number of the first invalid move, or None
+        error(String): Why that move is invalid, or None
+    """
+
+    def __init__(self, index, plies, fen, result='*', ply=None, error=None):
+        """Init."""
+        self.index = index
+        self.plies = plies
+        self.fen = fen
+        self.result = result
+        self.ply = ply
+        self.error = error
+
+    def __bool__(self):
+        """Were all moves of the game valid."""
+        return self.error is None
+
+
+def validate_game(game, index=0):
+    """Validate a game by replaying it through ChessGame.move.
+
+    Moves of a PgnGame are converted from SAN on the board they're played
+    on, and the result the PGN claims has to match a mate or draw on the
+    board.
+
+    Parameters:
+        game(list(String)): The moves (eg. ['e2e4', 'e7e5']), a string of
+                            moves or a PgnGame
+        index(int): The position of the game in the input
+
+    Returns:
+        ValidationResult: The result of the game
+    """
+    (fen, claimed, san) = (None, None, False)
+    if isinstance(game, pgn.PgnGame):
+        (fen, claimed, san) = (game.fen, game.result, True)
+        game = game.moves
+    elif isinstance(game, str):
+        game = game.split()
+
+    (white, black) = Player.create_two('white', 'black', colors.WHITE.value)
+    try:
+        chessgame = (ChessGame.from_fen(white, black, fen) if fen
+                     else ChessGame(white, black))
+    except ValueError as error:
+        return ValidationResult(index, 0, fen, error=str(error))
+
+    for (ply, move) in enumerate(game, 1):
+        error = None
+        if chessgame.over:
+            error = "Move '{}' after the game is over".format(move)
+        else:
+            player = white if white.turn else black
+            try:
+                text = pgn.san_to_move(chessgame.board, move) if san else move
+                if not chessgame.move(player, text):
+                    error = "Illegal move '{}'".format(move)
+            except pgn.ReplayError as replay_error:
+                error = str(replay_error)
+            except ValueError:
+                error = "Invalid move '{}'".format(move)
+
+        if error:
+            return ValidationResult(index, ply - 1, chessgame.to_fen(),
+                                    ply=ply, error=error)
+
+    result = '*'
+    if chessgame.state == GameState.CHECKMATE:
+        result = '1-0' if chessgame.board.turn == colors.BLACK else '0-1'
+    elif chessgame.over:
+        result = '1/2-1/2'
+
+    if result != '*' and claimed not in (None, '*', result):
+        return ValidationResult(
+            index, len(game), chessgame.to_fen(), result, len(game),
+            "Result '{}' while the game ended in '{}'".format(
+                claimed, result))
+    return ValidationResult(index, len(game), chessgame.to_fen(), result)
+
+
+def _validate_chunk(chunk):
+    """Validate a chunk of (index, game) pairs in a worker process."""
+    return [validate_game(game, index) for (index, game) in chunk]
+
+
+def _chunks(games, chunksize):
+    """Split games into lists of (index, game) pairs."""
+    numbered = enumerate(games)
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _next_done(pending, ordered):
+    """Wait for a chunk to be done and take it from the pending chunks."""
+    if not ordered:
+        while not any(chunk.ready() for chunk in pending):
+            pending[0].wait(0.01)
+        for chunk in pending:
+            if chunk.ready():
+                pending.remove(chunk)
+                return chunk.get()
+
+    return pending.popleft().get()
+
+
+def validate_games(games, workers=None, chunksize=64, ordered=True):
+    """Validate games on a pool of processes.
+
+    Parameters:
+        games(iterable): The games, see validate_game()
+        workers(int): The amount of processes, defaults to the amount of
+                      cpus. With 1 the games are validated in this process.
+        chunksize(int): The amount of games sent to a process at once
+        ordered(Bool): Yield the results in the order of the games, instead
+                       of as soon as they're done
+
+    Yields:
+        ValidationResult: The result of every game
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(games, chunksize)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _validate_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield from _next_done(pending, ordered)
+
+        while pending:
+            yield from _next_done(pending, ordered)
+
+
+def read_moves(lines):
+    """Read games from lines of moves separated by spaces, one per line."""
+    for line in lines:
+        if line.strip():
+            yield line.split()
+
+
+def main(argv=None):
+    """Validate games from a file on the commandline.
+
+    Prints the invalid games and a summary with the throughput.
+
+    Returns:
+        int: The exit code, 1 when there were invalid games
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m nerdchess.validation',
+        description='Validate the moves of a file of games.')
+    parser.add_argument('file', help='PGN, or one game of moves (eg. e2e4) '
+                                     'per line, - to read stdin')
+    parser.add_argument('--format', choices=['pgn', 'moves'],
+                        help='defaults to pgn for .pgn files')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='the amount of processes, defaults to the cpus')
+    parser.add_argument('--chunksize', type=int, default=64,
+                        help='the amount of games sent to a process at once')
+    parser.add_argument('--unordered', action='store_true',
+                        help='report games as soon as they are done')
+    args = parser.parse_args(argv)
+
+    file_format = args.format or (
+        'pgn' if args.file.endswith('.pgn') else 'moves')
+    lines = sys.stdin if args.file == '-' else open(args.file)
+    read = pgn.read_games if file_format == 'pgn' else read_moves
+
+    (games, invalid, plies) = (0, 0, 0)
+    start = time.perf_counter()
+    with lines:
+        for result in validate_games(read(lines), args.workers,
+                                     args.chunksize, not args.unordered):
+            games += 1
+            plies += result.plies
+            if not result:
+                invalid += 1
+                print("Game {}, ply {}: {}".format(
+                    result.index + 1, result.ply, result.error))
+    seconds = time.perf_counter() - start or float('inf')
+
+    print("Validated {} games ({} invalid) and {} plies in {:.2f}s, "
+          "{:.0f} games/s, {:.0f} plies/s".format(
+              games, invalid, plies, seconds, games / seconds,
+              plies / seconds))
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Zobrist keys to identify positions on a board.
+
+A position key is the XOR of a random number for every piece on every square,
+the side to move, the castling rights and the en passant file. Since XOR is
+its own inverse, the key can be updated for every change on the board by
+XOR-ing the numbers of what changed, instead of walking all squares.
+
+The numbers come from a seeded generator, so keys are the same between runs
+and processes.
+
+Attributes:
+    PIECE_KEYS (dict): Keys by piece class, color index and square selector.
+    TURN_KEY (int): Key for black to move.
+    CASTLING_KEYS (dict): Keys by castling right (eg. 'K').
+    EN_PASSANT_KEYS (dict): Keys by en passant file (eg. 'e').
+"""
+import random
+from nerdchess import pieces
+from nerdchess.config import colors, letterlist, selectorlist
+
+_random = random.Random(0x6E657264)
+
+
+def _keys(names):
+    """Create a dict with a random 64 bit key for every name."""
+    return {name: _random.getrandbits(64) for name in names}
+
+
+PIECE_KEYS = {
+    piece_class: (_keys(selectorlist), _keys(selectorlist))
+    for piece_class in (pieces.Pawn, pieces.Knight, pieces.Bishop,
+                        pieces.Rook, pieces.Queen, pieces.King)
+}
+TURN_KEY = _random.getrandbits(64)
+CASTLING_KEYS = _keys('KQkq')
+EN_PASSANT_KEYS = _keys(letterlist)
+
+
+def piece_key(piece, selector):
+    """Return the key of a piece on a square.
+
+    Parameters:
+        piece(Piece): The piece or pawn
+        selector(String): The square it's on (eg. e4)
+
+    Returns:
+        int: The key of the piece on that square
+    """
+    keys = PIECE_KEYS[type(piece)]
+    return keys[0 if piece.color == colors.WHITE else 1][selector]
+
+
+def state_key(turn, castling, en_passant_file=None):
+    """Return the key of the state of a position besides its pieces.
+
+    Parameters:
+        turn(colors): The color to move
+        castling(String): The castling rights (eg. 'KQkq')
+        en_passant_file(String): The file of a capturable en passant square
+
+    Returns:
+        int: The key of the state
+    """
+    key = TURN_KEY if turn == colors.BLACK else 0
+    for right in castling:
+        key ^= CASTLING_KEYS.get(right, 0)
+    if en_passant_file:
+        key ^= EN_PASSANT_KEYS[en_passant_file]
+    return key
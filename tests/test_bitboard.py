@@ -0,0 +1,120 @@
+import copy
+import pytest
+from nerdchess import bitboard, pieces
+from nerdchess.bitboard import BitBoards, SQUARES, squares_of
+from nerdchess.board import Board
+from nerdchess.config import colors, selectorlist
+from nerdchess.game import ChessGame
+from nerdchess.player import Player
+
+KIWIPETE = ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - '
+            '0 1')
+
+
+def scanned(board):
+    """Build the bitboards of a board from its squares."""
+    bitboards = BitBoards()
+    for (selector, square) in board.selectors.items():
+        if square.occupant:
+            bitboards.toggle(square.occupant, selector)
+    return bitboards
+
+
+def selectors(bits):
+    """Return the selectors of the squares set in a bitboard."""
+    return sorted(selectorlist[square] for square in squares_of(bits))
+
+
+class TestBitBoard():
+    """Test the bitboards behind the squares of a board."""
+
+    def test_tables(self):
+        assert selectors(bitboard.KNIGHT_ATTACKS[SQUARES['a1']]) == [
+            'b3', 'c2']
+        assert len(selectors(bitboard.KING_ATTACKS[SQUARES['e4']])) == 8
+        assert selectors(bitboard.PAWN_ATTACKS[colors.BLACK][
+            SQUARES['e4']]) == ['d3', 'f3']
+
+    def test_sliding(self):
+        """Test if sliding attacks stop at, and include, the blockers."""
+        occupied = bitboard.mask(['e6', 'c4', 'g2'])
+
+        assert selectors(bitboard.rook_attacks(
+            SQUARES['e4'], occupied)) == sorted(
+                ['e5', 'e6', 'e3', 'e2', 'e1', 'd4', 'c4', 'f4', 'g4', 'h4'])
+        assert 'h1' not in selectors(bitboard.bishop_attacks(
+            SQUARES['e4'], occupied))
+        assert 'g2' in selectors(bitboard.bishop_attacks(
+            SQUARES['e4'], occupied))
+
+    def test_setup_board(self, board_fixt):
+        """Test if setting up the squares sets up the bitboards."""
+        board = board_fixt.default_setup()
+
+        assert board.bitboards.occupancy[colors.WHITE] == 0xFFFF
+        assert board.bitboards.occupancy[colors.BLACK] == 0xFFFF << 48
+        assert selectors(board.bitboards.pieces[colors.BLACK][
+            pieces.King]) == ['e8']
+        assert board.matrix() == Board.from_fen(board.to_fen()).matrix()
+
+    def test_squares(self, board_fixt):
+        """Test if placing and removing pieces on squares is reflected."""
+        queen = pieces.Queen(colors.WHITE)
+        board_fixt.place_piece(queen, 'e4')
+        board = board_fixt.board
+        assert board.bitboards.pieces[colors.WHITE][pieces.Queen] == (
+            bitboard.BITS['e4'])
+
+        board.squares['e'][4].occupant = None
+        assert not board.bitboards.occupied
+
+    def test_make_unmake(self):
+        """Test if moves, castling, en passant and promotions keep them."""
+        board = Board.from_fen(KIWIPETE)
+        start = scanned(board)
+        records = []
+
+        for move in ('e1g1', 'a6e2', 'd5d6', 'c7c5', 'd6e7', 'e8c8', 'e7d8q',
+                     'h8d8'):
+            records.append(board.make_move(move))
+            assert board.bitboards.pieces == scanned(board).pieces
+            assert board.bitboards.occupancy == scanned(board).occupancy
+
+        for record in reversed(records):
+            board.unmake_move(record)
+        assert board.bitboards.pieces == start.pieces
+
+    def test_copy(self):
+        board = Board.from_fen(KIWIPETE)
+        other = copy.deepcopy(board)
+        other.make_move('e2a6')
+
+        assert board.bitboards.pieces == scanned(board).pieces
+        assert other.bitboards.pieces == scanned(other).pieces
+        assert other.bitboards.pieces != board.bitboards.pieces
+
+    @pytest.mark.parametrize("fen,expected", [
+        ('4k3/8/8/8/8/8/8/4K3 w - - 0 1', True),
+        ('4k3/8/8/8/8/8/8/2B1K3 w - - 0 1', True),
+        ('4k3/8/8/8/8/8/8/2B1KB2 w - - 0 1', False),
+        ('4k1b1/8/8/8/8/8/8/2B1K3 w - - 0 1', False),
+        ('3bk3/8/8/8/8/8/8/2B1K3 w - - 0 1', True),
+        ('4k3/8/8/8/8/8/8/1NB1K3 w - - 0 1', False),
+    ])
+    def test_insufficient_material(self, fen, expected):
+        assert Board.from_fen(fen).is_insufficient_material() == expected
+
+    def test_game(self):
+        """Test if moves played in a game are kept in the bitboards."""
+        (white, black) = Player.create_two('white', 'black', 'w')
+        game = ChessGame(white, black)
+
+        for move in ('e2e4', 'd7d5', 'e4d5', 'd8d5', 'b1c3', 'd5a5'):
+            player = white if white.turn else black
+            assert game.move(player, move)
+        game.undo(2)
+
+        board = game.board
+        assert board.bitboards.pieces == scanned(board).pieces
+        assert selectors(board.bitboards.pieces[colors.BLACK][
+            pieces.Queen]) == ['d5']
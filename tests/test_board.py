@@ -1,6 +1,11 @@
+import copy
 import pytest
-from nerdchess.pieces import King, Queen, Bishop
-from nerdchess.config import colors
+from nerdchess import encoding
+from nerdchess.board import Board, START_FEN
+from nerdchess.boardmove import BoardMove
+from nerdchess.move import Move
+from nerdchess.pieces import King, Queen, Bishop, Pawn, Knight, Rook
+from nerdchess.config import GameState, colors
 
 
 class TestBoard():
@@ -30,3 +35,334 @@ class TestBoard():
         check = board_fixt.board.is_checkmate()
 
         assert check == expected
+
+    def test_make_unmake(self, board_fixt):
+        """Test if moves made in place can be taken back."""
+        board = board_fixt.default_setup()
+        before = board.matrix()
+        records = []
+        for move in ('e2e4', 'd7d5', 'e4d5', 'd8d5', 'g1f3', 'g8f6',
+                     'f1e2', 'c8g4', 'e1g1'):
+            records.append(board.make_move(move))
+
+        assert isinstance(board.squares['g'][1].occupant, King)
+        assert board.castling == 'kq'
+        captured = records[3].captured
+        assert captured.captured
+
+        for record in reversed(records):
+            board.unmake_move(record)
+
+        assert board.matrix() == before
+        assert board.castling == 'KQkq'
+        assert not captured.captured
+        assert board.squares['e'][1].occupant.position == 'e1'
+        assert not board.squares['e'][1].occupant.last_move
+
+    @pytest.mark.parametrize("moves,expected", [
+        (['e2e4', 'a7a6', 'e4e5', 'd7d5'], True),
+        (['e2e4', 'd7d5', 'e4e5', 'a7a6'], False),
+        (['e2e4', 'a7a6', 'e4e5', 'd7d5', 'a2a3', 'a6a5'], False),
+    ])
+    def test_enpassant_state(self, board_fixt, moves, expected):
+        """Test if en passant is only possible right after the double step."""
+        board = board_fixt.default_setup()
+        for move in moves:
+            board.make_move(move)
+
+        move = BoardMove(board, 'e5d6')
+
+        assert move.enpassant == expected
+        assert move.valid == expected
+
+    def test_key_transposition(self, board_fixt):
+        """Test if the same position reached differently has the same key."""
+        board = board_fixt.default_setup()
+        start_key = board.key
+        other = copy.deepcopy(board)
+
+        for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8'):
+            board.make_move(move)
+        assert board.key == start_key
+
+        for move in ('e2e4', 'e7e5', 'd2d4'):
+            board.make_move(move)
+        for move in ('d2d4', 'e7e5', 'e2e4'):
+            other.make_move(move)
+
+        assert board.key == other.key
+        assert len({board.key: 1, other.key: 2}) == 1
+
+    def test_identity(self, board_fixt):
+        """Test if boards compare and hash by identity, not by position."""
+        board = board_fixt.default_setup()
+        other = copy.deepcopy(board)
+        boards = {board}
+
+        assert board != other
+        board.make_move('e2e4')
+        assert board in boards
+
+    def test_key_incremental(self, board_fixt):
+        """Test if the updated key matches one computed from scratch."""
+        board = board_fixt.default_setup()
+        keys = [board.key]
+        records = []
+        for move in ('e2e4', 'd7d5', 'e4d5', 'c7c5', 'd5c6', 'b8c6',
+                     'f1b5', 'a7a6', 'g1f3', 'a6b5', 'e1g1'):
+            records.append(board.make_move(move))
+            keys.append(board.key)
+            assert board.key == copy.deepcopy(board).key
+
+        for record in reversed(records):
+            board.unmake_move(record)
+            keys.pop()
+            assert board.key == keys[-1]
+
+    @pytest.mark.parametrize("attribute,value", [
+        ('turn', colors.WHITE),
+        ('castling', 'Kkq'),
+        ('en_passant', 'e3'),
+    ])
+    def test_key_state(self, board_fixt, attribute, value):
+        """Test if the key covers the state besides the pieces."""
+        board = board_fixt.default_setup()
+        board_fixt.place_piece(Pawn(colors.BLACK), 'f4')
+        board.turn = colors.BLACK
+        key = board.key
+
+        setattr(board, attribute, value)
+
+        assert board.key != key
+
+    @pytest.mark.parametrize("color,expected", [
+        (colors.WHITE, ['d4', 'e1', 'f3']),
+        (colors.BLACK, ['d6', 'f5', 'f6']),
+    ])
+    def test_attackers(self, board_fixt, color, expected):
+        """Test if all pieces attacking a square are found."""
+        board_fixt.place_piece(Pawn(colors.WHITE), 'd4')
+        board_fixt.place_piece(Knight(colors.WHITE), 'f3')
+        board_fixt.place_piece(Rook(colors.WHITE), 'e1')
+        board_fixt.place_piece(Bishop(colors.WHITE), 'b2')
+        board_fixt.place_piece(Rook(colors.WHITE), 'h5')
+        board_fixt.place_piece(Pawn(colors.BLACK), 'd6')
+        board_fixt.place_piece(Pawn(colors.BLACK), 'f6')
+        board_fixt.place_piece(Queen(colors.BLACK), 'c7')
+        board_fixt.place_piece(King(colors.BLACK), 'f5')
+        board_fixt.place_piece(Pawn(colors.WHITE), 'e6')
+
+        attackers = board_fixt.board.attackers('e5', color)
+
+        assert sorted(sq.selector for sq in attackers) == expected
+        assert board_fixt.board.is_square_attacked('e5', color)
+        assert not board_fixt.board.is_square_attacked('a8', color)
+
+    def test_legal_moves(self, board_fixt):
+        """Test if the moves of the start position are generated."""
+        board = board_fixt.default_setup()
+
+        moves = list(board.legal_moves())
+
+        assert len(moves) == 20
+        assert len(list(board.legal_moves(colors.BLACK))) == 20
+        assert moves[0] is Move.get(moves[0].origin, moves[0].destination)
+        assert sorted(board.legal_moves(encoded=True)) == sorted(
+            encoding.encode(move) for move in moves)
+
+    def test_legal_moves_pinned(self, board_fixt):
+        """Test if moves leaving the king in check are only pseudo legal."""
+        board_fixt.place_piece(King(colors.WHITE), 'e1')
+        board_fixt.place_piece(Rook(colors.WHITE), 'e2')
+        board_fixt.place_piece(Rook(colors.BLACK), 'e8')
+        board = board_fixt.board
+
+        pseudo = [move.text for move in board.pseudo_legal_moves()]
+        legal = [move.text for move in board.legal_moves()]
+
+        assert 'e2a2' in pseudo
+        assert 'e2a2' not in legal
+        assert 'e2e8' in legal
+
+    def test_special_moves(self, board_fixt):
+        """Test if castling, en passant and promotions are generated."""
+        board_fixt.place_piece(King(colors.WHITE), 'e1')
+        board_fixt.place_piece(Rook(colors.WHITE), 'h1')
+        board_fixt.place_piece(Rook(colors.WHITE), 'a1')
+        board_fixt.place_piece(Pawn(colors.WHITE), 'b7')
+        board_fixt.place_piece(Pawn(colors.WHITE), 'e5')
+        board_fixt.place_piece(Pawn(colors.BLACK), 'd7')
+        board_fixt.place_piece(Knight(colors.BLACK), 'a8')
+        board_fixt.place_piece(King(colors.BLACK), 'h8')
+        board = board_fixt.board
+        board.turn = colors.BLACK
+        board.make_move('d7d5')
+
+        codes = {encoding.to_text(code): encoding.flags(code)
+                 for code in board.legal_moves(encoded=True)}
+
+        assert codes['e1g1'] == encoding.CASTLING
+        assert codes['e1c1'] == encoding.CASTLING
+        assert 'e1h1' not in codes
+        assert codes['e5d6'] == encoding.EN_PASSANT
+        assert [text for text in codes if text.startswith('b7a8')] == [
+            'b7a8q', 'b7a8r', 'b7a8b', 'b7a8n']
+
+        board.make_move(Move.get('b7', 'a8', 'n'))
+        assert isinstance(board.squares['a'][8].occupant, Knight)
+        assert board.squares['a'][8].occupant.color == colors.WHITE
+
+    def test_legal_moves_lazy(self, board_fixt):
+        """Test if moves are only checked when they're pulled."""
+        board = board_fixt.default_setup()
+        calls = []
+        make_move = board.make_move
+        board.make_move = lambda move: calls.append(move) or make_move(move)
+
+        next(board.legal_moves())
+
+        assert len(calls) == 1
+
+    def test_from_fen(self, board_fixt):
+        """Test if positions are loaded from FEN."""
+        board = Board.from_fen(
+            'r3k2r/8/8/8/4Pp2/8/8/R3K3 b Qk e3 0 1')
+
+        assert isinstance(board.squares['e'][4].occupant, Pawn)
+        assert board.squares['a'][8].occupant.color == colors.BLACK
+        assert board.squares['e'][4].occupant.position == 'e4'
+        assert board.turn == colors.BLACK
+        assert board.castling == 'Qk'
+        assert board.en_passant == 'e3'
+        assert board.kings == {colors.WHITE: 'e1', colors.BLACK: 'e8'}
+        assert 'f4e3' in [move.text for move in board.legal_moves()]
+
+        start = Board.from_fen(START_FEN)
+        assert start.matrix() == board_fixt.default_setup().matrix()
+        assert start.key == board_fixt.board.key
+
+    @pytest.mark.parametrize("fen", [
+        '8/8/8/8/8/8/8 w - -',
+        '9/8/8/8/8/8/8/8 w - -',
+        '8/8/8/8/8/8/8/7x w - -',
+        '8/8/8/8/8/8/8/8 x - -',
+        '8/8/8/8/8/8/8/8 w KX -',
+        '8/8/8/8/8/8/8/8 w - e9',
+        '8/8/8/8/8/8/8/8 w',
+    ])
+    def test_from_fen_invalid(self, fen):
+        """Test if invalid FEN is refused."""
+        with pytest.raises(ValueError):
+            Board.from_fen(fen)
+
+    @pytest.mark.parametrize("fen", [
+        START_FEN,
+        'r3k2r/8/8/8/4Pp2/8/8/R3K3 b Qk e3 0 1',
+        '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 12 40',
+    ])
+    def test_to_fen(self, fen):
+        """Test if positions are written back to FEN."""
+        assert Board.from_fen(fen).to_fen() == fen
+
+    def test_move_counters(self, board_fixt):
+        """Test if the move counters follow the moves."""
+        board = board_fixt.default_setup()
+        records = [board.make_move(move)
+                   for move in ('g1f3', 'g8f6', 'f3g1', 'e7e5', 'g1f3',
+                                'b8c6')]
+
+        assert board.to_fen().endswith(' 2 4')
+        assert board.fullmove_number == 4
+
+        record = board.make_move('f3e5')
+        assert board.to_fen().endswith(' 0 4')
+
+        board.unmake_move(record)
+        for record in reversed(records):
+            board.unmake_move(record)
+        assert board.to_fen() == START_FEN
+
+    def test_null_move(self, board_fixt):
+        board = Board.from_fen(
+            'rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3')
+        key = board.key
+
+        en_passant = board.make_null_move()
+        assert board.turn == colors.WHITE
+        assert board.en_passant is None
+        assert board.key != key
+        board.unmake_null_move(en_passant)
+        assert board.key == key
+        assert board.en_passant == 'e3'
+
+    def test_has_pieces(self, board_fixt):
+        board = Board.from_fen('4k3/pppp4/8/8/8/8/4P3/4K1N1 w - - 0 1')
+
+        assert board.has_pieces(colors.WHITE)
+        assert not board.has_pieces(colors.BLACK)
+        record = board.make_move('g1f3')
+        assert board.has_pieces(colors.WHITE)
+        board.unmake_move(record)
+        board.squares['g'][1].occupant = None
+        assert not board.has_pieces(colors.WHITE)
+
+
+class TestGameState():
+    """Test the state of a position for the color to move."""
+
+    @pytest.mark.parametrize("fen,state", [
+        (START_FEN, GameState.ONGOING),
+        ('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3',
+         GameState.CHECKMATE),
+        ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', GameState.STALEMATE),
+        ('7k/8/8/8/8/8/8/K7 w - - 0 1', GameState.INSUFFICIENT_MATERIAL),
+        ('7k/8/8/8/8/8/8/KN6 b - - 0 1', GameState.INSUFFICIENT_MATERIAL),
+        ('6bk/8/8/8/8/8/8/KB6 w - - 0 1', GameState.INSUFFICIENT_MATERIAL),
+        ('5b1k/8/8/8/8/8/8/KB6 w - - 0 1', GameState.ONGOING),
+        ('7k/8/8/8/8/8/8/KNN5 w - - 0 1', GameState.ONGOING),
+        ('7k/8/8/8/8/8/P7/K7 w - - 0 1', GameState.ONGOING),
+    ])
+    def test_game_state(self, fen, state):
+        board = Board.from_fen(fen)
+
+        assert board.game_state() == state
+        assert board.to_fen() == fen
+
+    def test_material(self):
+        """Test if the material is kept up to date by moves."""
+        board = Board.from_fen('7k/8/8/8/8/8/r7/KN6 w - - 0 1')
+        assert board.game_state() == GameState.ONGOING
+
+        record = board.make_move('a1a2')
+        assert board.game_state() == GameState.INSUFFICIENT_MATERIAL
+        board.unmake_move(record)
+        assert not board.is_insufficient_material()
+
+
+class TestStaticExchange():
+    """Test evaluating the exchanges on a square without moving."""
+
+    @pytest.mark.parametrize("fen,move,expected", [
+        ('1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1', 'e1e5', 100),
+        ('1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1', 'd3e5',
+         -220),
+        ('4k3/3r4/2n5/3p4/8/8/3R4/3RK3 w - - 0 1', 'd2d5', 100),
+        ('4k3/3r4/2n5/3p4/8/8/8/3RK3 w - - 0 1', 'd1d5', -400),
+        ('4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1', 'd1d5', -800),
+        ('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1', 'e5d6', 100),
+        ('1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1', 'a7a8q', 800),
+    ])
+    def test_see(self, fen, move, expected):
+        board = Board.from_fen(fen)
+        move = Move.get(move[:2], move[2:4], move[4:] or None)
+
+        assert board.see(move) == expected
+        assert board.to_fen() == fen
+
+    def test_captures(self):
+        board = Board.from_fen('4k3/P7/8/3pP3/4Q3/8/8/4K3 w - d6 0 1')
+        captures = sorted(str(move) for move in board.captures())
+
+        assert captures == ['a7a8q', 'e4d5', 'e5d6']
+        assert sorted(encoding.to_text(code)
+                      for code in board.captures(encoded=True)) == captures
@@ -0,0 +1,87 @@
+import pytest
+from nerdchess import encoding, pieces
+from nerdchess.boardmove import BoardMove
+from nerdchess.config import colors, selectorlist
+from nerdchess.game import ChessGame
+from nerdchess.move import Move
+from nerdchess.player import Player
+
+
+class TestEncoding():
+    """Test encoding moves as integers."""
+
+    def test_roundtrip(self):
+        """Test if every move survives encoding."""
+        for origin in selectorlist:
+            for destination in selectorlist:
+                code = encoding.encode(origin + destination)
+
+                assert 0 <= code < 2 ** 16
+                assert encoding.decode(code) is Move.get(origin, destination)
+                assert encoding.to_text(code) == origin + destination
+
+    @pytest.mark.parametrize("text,char", [
+        ('e7e8q', 'q'),
+        ('a2a1n', 'n'),
+        ('b7a8r', 'r'),
+        ('e7e8', None),
+    ])
+    def test_promotion(self, text, char):
+        """Test if promotions are kept in the code."""
+        code = encoding.encode(text)
+
+        assert encoding.promotes_to(code) == char
+        assert encoding.to_text(code) == text
+
+    def test_invalid(self):
+        """Test if invalid moves can't be encoded."""
+        with pytest.raises(ValueError):
+            encoding.encode('e7e9')
+        with pytest.raises(ValueError):
+            encoding.encode('e7e8k')
+
+    @pytest.mark.parametrize("moves,move,flags", [
+        ([], 'e2e4', encoding.NORMAL),
+        (['e2e4', 'a7a6', 'e4e5', 'd7d5'], 'e5d6', encoding.EN_PASSANT),
+        (['e2e4', 'e7e5', 'g1f3', 'b8c6', 'f1c4', 'g8f6'], 'e1g1',
+         encoding.CASTLING),
+    ])
+    def test_boardmove(self, board_fixt, moves, move, flags):
+        """Test if boardmoves are encoded with their board context."""
+        board = board_fixt.default_setup()
+        for played in moves:
+            board.make_move(played)
+
+        boardmove = BoardMove(board, move)
+        code = boardmove.encode()
+
+        assert encoding.flags(code) == flags
+        assert BoardMove.from_code(board, code) == boardmove
+
+    def test_make_move(self, board_fixt):
+        """Test if boards play encoded and promoting moves."""
+        pawn = pieces.Pawn(colors.WHITE)
+        board_fixt.place_piece(pawn, 'e7')
+        board = board_fixt.board
+        key = board.key
+
+        record = board.make_move(encoding.encode('e7e8n'))
+        assert isinstance(board.squares['e'][8].occupant, pieces.Knight)
+
+        board.unmake_move(record)
+        assert board.squares['e'][7].occupant is pawn
+        assert not board.squares['e'][8].occupant
+        assert board.key == key
+
+    def test_move_history(self):
+        """Test if games keep their moves as codes."""
+        (player_1,
+         player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+
+        assert game.move(player_1, encoding.encode('e2e4'))
+        assert game.move(player_2, 'e7e5')
+
+        assert [encoding.to_text(code) for code in game.move_history] == [
+            'e2e4', 'e7e5']
+        assert game.move_history.itemsize == 2
@@ -0,0 +1,188 @@
+import pytest
+from nerdchess.board import Board, START_FEN
+from nerdchess.config import GameState, colors
+from nerdchess.engine import (Engine, EnginePlayer, MATE_SCORE,
+                              SearchParameters)
+from nerdchess.evaluation import evaluate
+from nerdchess.game import ChessGame
+from nerdchess.player import Player
+
+SCHOLARS_MATE = ('r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w '
+                 'KQkq - 2 3')
+BACK_RANK_MATE = '6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1'
+HANGING_QUEEN = ('rnb1kbnr/pppp1ppp/8/4p3/3q4/4P3/PPPP1PPP/RNBQKBNR w KQkq - '
+                 '0 1')
+ROOK_LADDER = '7k/8/8/8/8/8/R7/1R4K1 w - - 0 1'
+MIDDLEGAME = ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 '
+              'w - - 0 10')
+
+
+@pytest.fixture
+def engine():
+    return Engine()
+
+
+class TestEngine():
+    """Test searching for the best move."""
+
+    @pytest.mark.parametrize("fen,move", [
+        (SCHOLARS_MATE, 'h5f7'),
+        (BACK_RANK_MATE, 'a1a8'),
+    ])
+    def test_mate_in_one(self, engine, fen, move):
+        board = Board.from_fen(fen)
+        result = engine.search(board, depth=3)
+
+        assert result.move == move
+        assert result.pv == [move]
+        assert result.mate_in == 1
+        assert result.score == MATE_SCORE - 1
+        assert board.to_fen() == fen
+
+    def test_capture(self, engine):
+        board = Board.from_fen(HANGING_QUEEN)
+        result = engine.search(board, depth=2)
+
+        assert result.move == 'e3d4'
+        assert result.score > evaluate(board) + 700
+
+    def test_horizon(self, engine):
+        """Test if a defended pawn isn't taken right before the horizon."""
+        board = Board.from_fen('k7/8/8/3p4/4p3/8/8/K3R3 w - - 0 1')
+        result = engine.search(board, depth=1)
+
+        assert result.move != 'e1e4'
+        assert abs(result.score - evaluate(board)) < 100
+        assert engine.qnodes
+
+    def test_limits(self, engine):
+        board = Board.from_fen(START_FEN)
+        depths = []
+        result = engine.search(board, depth=20, nodes=300,
+                               callback=lambda result: depths.append(
+                                   result.depth))
+
+        assert 0 < result.depth < 20
+        assert depths == list(range(1, result.depth + 1))
+        assert result.move in list(board.legal_moves())
+        assert result.nodes == engine.nodes
+        assert board.to_fen() == START_FEN
+
+        result = engine.search(board, seconds=0.05)
+        assert result.move and result.seconds < 1
+        assert board.to_fen() == START_FEN
+
+    @pytest.mark.parametrize("limits", [
+        {'depth': 0},
+        {'nodes': 0},
+        {'seconds': 0},
+        {'depth': 2, 'nodes': -1},
+    ])
+    def test_no_limit(self, engine, limits):
+        """Test if limits of 0 or less are refused, not taken as none."""
+        with pytest.raises(ValueError):
+            engine.search(Board.from_fen(START_FEN), **limits)
+
+    def test_game_over(self, engine):
+        board = Board.from_fen(
+            'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3')
+        result = engine.search(board, depth=2)
+
+        assert result.move is None
+        assert result.score == -MATE_SCORE
+        assert result.mate_in == 0
+
+    def test_repetition(self, engine):
+        """Test if repeating a position is scored as a draw."""
+        board = Board.from_fen('k7/8/8/8/8/8/P7/K2Q3r w - - 0 1')
+        assert engine.search(board, depth=1).move == 'd1h1'
+
+        record = board.make_move('d1h1')
+        history = [board.key]
+        board.unmake_move(record)
+        result = engine.search(board, depth=1, history=history)
+
+        assert result.move == 'd1b1'
+        # Qb1 Rxb1 Kxb1, scored for black to move
+        assert result.score == -evaluate(Board.from_fen(
+            'k7/8/8/8/8/8/P7/1K6 b - - 0 2'))
+
+
+class TestSelectiveSearch():
+    """Test pruning and reducing moves."""
+
+    @pytest.mark.parametrize("fen,depth", [
+        (HANGING_QUEEN, 3),
+        (ROOK_LADDER, 4),
+    ])
+    def test_same_result(self, fen, depth):
+        """Test if selective search finds what a full width search finds."""
+        selective = Engine().search(Board.from_fen(fen), depth=depth)
+        full = Engine(parameters=SearchParameters.full_width()).search(
+            Board.from_fen(fen), depth=depth)
+
+        assert selective.move == full.move
+        assert selective.score == full.score
+
+    def test_nodes(self):
+        board = Board.from_fen(MIDDLEGAME)
+        full = Engine(parameters=SearchParameters.full_width())
+        full.search(board, depth=3)
+        engine = Engine()
+        engine.search(board, depth=3)
+
+        assert engine.nodes < full.nodes
+        assert not (full.null_moves or full.reductions
+                    or full.futility_pruned)
+
+        engine.search(board, depth=4)
+        assert engine.null_cutoffs and engine.reductions
+        assert engine.futility_pruned
+        assert 'null move' in engine.stats()
+        assert board.to_fen() == MIDDLEGAME
+
+    def test_zugzwang(self, engine):
+        """Test if no null moves are tried with only pawns."""
+        board = Board.from_fen('8/8/8/4k3/8/4K3/4P3/8 w - - 0 1')
+        result = engine.search(board, depth=5)
+
+        assert not engine.null_moves
+        assert result.score > 0
+
+    def test_parameters(self):
+        engine = Engine(parameters=SearchParameters(
+            null_move_reduction=0, lmr_moves=0, futility_margins=(100,)))
+        engine.search(Board.from_fen(MIDDLEGAME), depth=3)
+
+        assert not engine.null_moves and not engine.reductions
+        assert engine.futility_pruned
+
+
+class TestEnginePlayer():
+    """Test playing games with an engine."""
+
+    def test_play(self):
+        engine = EnginePlayer('engine', colors.WHITE, depth=2)
+        human = Player('human', colors.BLACK, False)
+        game = ChessGame.from_fen(engine, human, SCHOLARS_MATE)
+
+        idle = EnginePlayer('idle', colors.BLACK, False)
+        other = ChessGame(Player('other', colors.WHITE), idle)
+
+        assert not idle.play(other)
+        assert engine.play(game)
+        assert game.over and game.state == GameState.CHECKMATE
+        assert engine.last_result.mate_in == 1
+        assert not engine.play(game)
+
+    def test_engine_game(self):
+        white = EnginePlayer('white', colors.WHITE, depth=1)
+        black = EnginePlayer('black', colors.BLACK, False, nodes=50)
+        game = ChessGame(white, black)
+
+        for _ in range(4):
+            player = white if white.turn else black
+            assert player.play(game)
+
+        assert len(game.move_history) == 4
+        game.verify()
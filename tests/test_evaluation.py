@@ -0,0 +1,79 @@
+import pytest
+from nerdchess import evaluation
+from nerdchess.board import Board, START_FEN
+from nerdchess.engine import Engine
+from nerdchess.evaluation import MAX_PHASE, evaluate, scan, taper
+from nerdchess.pieces import Knight, Queen
+
+KIWIPETE = ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - '
+            '0 1')
+
+
+class TestEvaluation():
+    """Test scoring positions by material and piece-square tables."""
+
+    @pytest.mark.parametrize("fen", [
+        START_FEN,
+        KIWIPETE,
+        '4k3/8/8/8/8/8/4P3/4K3 w - - 0 1',
+    ])
+    def test_scan(self, fen):
+        """Test if the kept scores are the scores of the squares."""
+        board = Board.from_fen(fen)
+
+        assert board.scores == scan(board)
+
+    def test_incremental(self):
+        """Test if moves, castling, en passant and promotions keep scores."""
+        board = Board.from_fen(KIWIPETE)
+        records = []
+
+        for move in ('e1g1', 'a6e2', 'd5d6', 'c7c5', 'd6e7', 'e8c8', 'e7d8q',
+                     'h8d8'):
+            records.append(board.make_move(move))
+            assert board.scores == scan(board)
+
+        for record in reversed(records):
+            board.unmake_move(record)
+            assert board.scores == scan(board)
+        assert board.scores == Board.from_fen(KIWIPETE).scores
+
+    def test_promote(self):
+        board = Board.from_fen('4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        board.make_move('a7a8')
+        pawn = board.squares['a'][8].occupant
+
+        board.promote(pawn, Queen)
+        assert board.scores == scan(board)
+        assert board.scores[2] == evaluation.PHASE_WEIGHTS[Queen]
+
+    def test_symmetry(self):
+        """Test if mirrored positions score the same for the color to move."""
+        white = Board.from_fen('4k3/8/8/8/3N4/8/8/4K3 w - - 0 1')
+        black = Board.from_fen('4k3/8/8/3n4/8/8/8/4K3 b - - 0 1')
+
+        assert evaluate(white) == evaluate(black) > 0
+        assert white.scores[0] == -black.scores[0]
+
+    def test_squares(self):
+        """Test if knights are better in the center than on the rim."""
+        center = Board.from_fen('4k3/8/8/8/3N4/8/8/4K3 w - - 0 1')
+        rim = Board.from_fen('4k3/8/8/8/N7/8/8/4K3 w - - 0 1')
+
+        assert evaluate(center) > evaluate(rim)
+        assert evaluation.piece_scores(
+            Knight(rim.turn), 'd4') > evaluation.piece_scores(
+                Knight(rim.turn), 'a4')
+
+    def test_taper(self):
+        assert taper(100, 200, MAX_PHASE) == 100
+        assert taper(100, 200, 0) == 200
+        assert taper(100, 200, MAX_PHASE // 2) == 150
+        assert taper(100, 200, MAX_PHASE + 4) == 100
+
+    def test_engine(self):
+        """Test if the engine develops instead of only counting material."""
+        board = Board.from_fen(START_FEN)
+        result = Engine().search(board, depth=2)
+
+        assert str(result.move) in ('b1c3', 'g1f3', 'd2d4', 'e2e4')
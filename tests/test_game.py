@@ -1,9 +1,11 @@
+import copy
 import pytest
+from collections import Counter
 from nerdchess.game import ChessGame
 from nerdchess.player import Player
 from nerdchess.board import Board
-from nerdchess.config import colors
-from nerdchess import pieces
+from nerdchess.config import DrawReason, GameState, colors
+from nerdchess import encoding, pieces
 
 
 @pytest.fixture(scope='class')
@@ -89,6 +91,7 @@ class TestGame():
         result = chessgame.promote(pawn, pieces.Queen)
         assert isinstance(chessgame.board.squares['e'][8].occupant,
                           pieces.Queen)
+        assert encoding.to_text(chessgame.move_history[-1]) == 'e7e8q'
 
 
 class TestMatch():
@@ -119,3 +122,283 @@ class TestMatch():
 
         assert(result)
         assert(chessgame.over == game_over)
+
+
+class TestRepetition():
+    """Test positions in the history of a game can be compared."""
+
+    def test_board_history_counts(self):
+        (player_1,
+         player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        start = copy.deepcopy(game.board)
+
+        for move in ('g1f3', 'g8f6', 'f3g1', 'f6g8') * 2:
+            player = player_1 if player_1.turn else player_2
+            assert game.move(player, move)
+
+        counts = Counter(
+            board.key for board in game.board_history + [game.board])
+
+        assert counts[start.key] == 3
+        assert game.board.key == start.key
+        assert game.board is not start
+
+
+class TestFen():
+    """Test starting games from a position."""
+
+    def test_from_fen(self):
+        (player_1,
+         player_2) = Player.create_two('blaat', 'henk', 'w')
+        fen = '4k3/8/8/8/8/8/4P3/4K3 b - - 3 30'
+        game = ChessGame.from_fen(player_1, player_2, fen)
+
+        assert game.to_fen() == fen
+        assert player_2.turn and not player_1.turn
+        assert len(game.pieces) == 2
+        assert len(game.pawns) == 1
+
+        assert game.move(player_2, 'e8d7')
+        assert game.to_fen() == '8/3k4/8/8/8/8/4P3/4K3 w - - 4 31'
+
+
+class TestFromMoves():
+    """Test creating games from the moves played so far."""
+
+    moves = ['f2f3', 'e7e5', 'g2g4', 'd8h4']
+
+    @pytest.mark.parametrize("trusted", [True, False])
+    def test_from_moves(self, trusted):
+        game = ChessGame.from_moves(self.moves, trusted=trusted, verify=True)
+
+        assert game.over
+        assert game.board.turn == colors.WHITE
+        assert game.player_1.turn and not game.player_2.turn
+        assert len(game.board_history) == 4
+        assert [encoding.to_text(code) for code in game.move_history] == (
+            self.moves)
+        assert game.board_history[0].key == Board.from_fen(
+            game.board_history[0].to_fen()).key
+
+    def test_trusted_verify(self):
+        """Test if trusted moves breaking the rules are caught."""
+        game = ChessGame.from_moves(['e2e5', 'e7e6'])
+
+        assert isinstance(game.board.squares['e'][5].occupant, pieces.Pawn)
+        with pytest.raises(ValueError):
+            game.verify()
+        with pytest.raises(ValueError):
+            ChessGame.from_moves(['e2e5'], trusted=False)
+
+    def test_from_fen(self):
+        """Test if games continue from a position."""
+        (player_1,
+         player_2) = Player.create_two('blaat', 'henk', 'b')
+        game = ChessGame.from_moves(
+            ['a7a8q', 'h1g1'], player_1, player_2, verify=True,
+            fen='8/P7/8/8/8/8/8/7k w - - 0 1')
+
+        assert isinstance(game.board.squares['a'][8].occupant, pieces.Queen)
+        assert player_2.turn and not player_1.turn
+        assert game.to_fen() == 'Q7/8/8/8/8/8/8/6k1 w - - 1 2'
+
+
+class TestUndo():
+    """Test taking back moves and making them again."""
+
+    moves = ['e2e4', 'd7d5', 'e4e5', 'f7f5', 'e5f6', 'g8f6', 'g1f3', 'e7e6',
+             'f1e2', 'f8d6', 'e1g1']
+
+    def play(self, game, moves):
+        for move in moves:
+            player = game.player_1 if game.player_1.turn else game.player_2
+            assert game.move(player, move)
+
+    def test_undo_redo(self):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        start = game.to_fen()
+        fens = []
+        for move in self.moves:
+            self.play(game, [move])
+            fens.append(game.to_fen())
+
+        assert game.undo(3).plies == 3
+        assert game.to_fen() == fens[-4]
+        assert player_1.turn and not player_2.turn
+        assert game.undo(20).plies == len(self.moves) - 3
+        assert game.to_fen() == start
+        assert not game.undo()
+        assert len(game.move_history) == 0
+
+        assert game.redo(5).plies == 5
+        assert game.to_fen() == fens[4]
+        assert game.redo(20).plies == len(self.moves) - 5
+        assert game.to_fen() == fens[-1]
+        assert game.board.squares['f'][1].occupant.color == colors.WHITE
+        assert not game.redo()
+        game.verify()
+
+    def test_new_move(self):
+        """Test if making a move forgets the moves taken back."""
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        self.play(game, self.moves[:2])
+
+        game.undo()
+        self.play(game, ['e7e5'])
+
+        assert not game.redo()
+        assert encoding.to_text(game.move_history[-1]) == 'e7e5'
+
+    def test_mate(self):
+        game = ChessGame.from_moves(['f2f3', 'e7e5', 'g2g4', 'd8h4'])
+        assert game.over
+
+        game.undo()
+        assert not game.over
+        assert game.player_2.turn
+        game.redo()
+        assert game.over
+
+    def test_promotion(self):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame.from_fen(player_1, player_2,
+                                  '4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        self.play(game, ['a7a8'])
+        game.promote(game.board.squares['a'][8].occupant, pieces.Rook)
+
+        game.undo()
+        assert isinstance(game.board.squares['a'][7].occupant, pieces.Pawn)
+        assert not game.board.squares['a'][8].occupant
+        game.redo()
+        assert isinstance(game.board.squares['a'][8].occupant, pieces.Rook)
+        assert game.to_fen() == 'R3k3/8/8/8/8/8/8/4K3 b - - 0 1'
+
+    def test_replaced_board(self):
+        """Test if moves before a replaced board are rebuilt."""
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        self.play(game, self.moves[:3])
+        fen = game.to_fen()
+
+        game.board = Board.from_fen(fen)
+        self.play(game, self.moves[3:5])
+        game.undo(3)
+
+        assert game.to_fen() == 'rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/' \
+                                'RNBQKBNR w KQkq d6 0 2'
+        game.redo(3)
+        assert isinstance(game.board.squares['f'][6].occupant, pieces.Pawn)
+
+
+class TestDraw():
+    """Test draws by repetition and the fifty-move rule."""
+
+    shuffle = ['g1f3', 'g8f6', 'f3g1', 'f6g8']
+
+    def play(self, game, moves):
+        for move in moves:
+            player = game.player_1 if game.player_1.turn else game.player_2
+            assert game.move(player, move)
+
+    def test_threefold(self):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        self.play(game, self.shuffle * 2)
+
+        assert game.repetitions[game.board.key] == 3
+        assert game.claimable_draw() == DrawReason.THREEFOLD_REPETITION
+        assert not game.over
+
+        game.undo()
+        assert not game.claimable_draw()
+        assert not game.claim_draw(player_2)
+        game.redo()
+
+        event = game.claim_draw(player_1)
+        assert event.reason == DrawReason.THREEFOLD_REPETITION
+        assert game.over and game.draw == DrawReason.THREEFOLD_REPETITION
+        assert not game.move(player_1, 'e2e4')
+        assert len(game.move_history) == len(self.shuffle) * 2
+
+    def test_fivefold(self):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame(player_1, player_2)
+        self.play(game, self.shuffle * 3 + self.shuffle[:3])
+        assert not game.over
+
+        self.play(game, self.shuffle[3:])
+        assert game.over
+        assert game.draw == DrawReason.FIVEFOLD_REPETITION
+        assert sum(game.repetitions.values()) == len(game.move_history) + 1
+        assert not game.move(player_1, 'e2e4')
+
+        game.undo()
+        assert not game.over and not game.draw
+
+    @pytest.mark.parametrize("promote", [True, False])
+    def test_promotion(self, promote):
+        """Test if a promoted position counts, however it's promoted."""
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame.from_fen(player_1, player_2,
+                                  '4k3/P7/8/8/8/8/7P/4K3 w - - 0 1')
+        if promote:
+            self.play(game, ['a7a8'])
+            game.promote(game.board.squares['a'][8].occupant, pieces.Knight)
+        else:
+            self.play(game, ['a7a8n'])
+
+        assert game.repetitions[game.board.key] == 1
+        self.play(game, ['e8f7', 'e1f1', 'f7e8', 'f1e1'] * 2)
+        assert game.repetitions[game.board.key] == 3
+        assert game.claimable_draw() == DrawReason.THREEFOLD_REPETITION
+        assert sum(game.repetitions.values()) == len(game.move_history) + 1
+
+    @pytest.mark.parametrize("clock,draw,over", [
+        (98, None, False),
+        (99, DrawReason.FIFTY_MOVES, False),
+        (149, DrawReason.SEVENTY_FIVE_MOVES, True),
+    ])
+    def test_move_rules(self, clock, draw, over):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame.from_fen(player_1, player_2,
+                                  '4k3/8/8/8/8/8/8/R3K3 w Q - {} 80'.format(
+                                      clock))
+        self.play(game, ['a1a2'])
+
+        assert game.over == over
+        assert (game.draw if over else game.claimable_draw()) == draw
+        assert bool(game.move(player_2, 'e8d8')) != over
+
+    @pytest.mark.parametrize("fen,move,state", [
+        ('7k/8/5Q2/6K1/8/8/8/8 w - - 0 1', 'f6f7', GameState.STALEMATE),
+        ('7k/8/8/8/8/8/1r6/KN6 w - - 0 1', 'a1b2',
+         GameState.INSUFFICIENT_MATERIAL),
+        ('7k/8/8/8/7r/8/8/KN6 w - - 0 1', 'b1c3', GameState.ONGOING),
+    ])
+    def test_game_state(self, fen, move, state):
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame.from_fen(player_1, player_2, fen)
+        self.play(game, [move])
+
+        assert game.state == state
+        assert game.over == (state != GameState.ONGOING)
+        assert not game.draw
+
+    @pytest.mark.parametrize("fen,move,state", [
+        ('7k/P7/6K1/8/8/8/8/8 w - - 0 1', 'a7a8', GameState.CHECKMATE),
+        ('8/6P1/8/8/8/8/2K5/k7 w - - 0 1', 'g7g8', GameState.STALEMATE),
+    ])
+    def test_promotion_state(self, fen, move, state):
+        """Test if promoting checks the state of the game again."""
+        (player_1, player_2) = Player.create_two('blaat', 'henk', 'w')
+        game = ChessGame.from_fen(player_1, player_2, fen)
+        self.play(game, [move])
+        assert not game.over
+
+        pawn = game.board.selectors[move[2:]].occupant
+        assert game.promote(pawn, pieces.Queen)
+        assert game.state == state
+        assert game.over
@@ -0,0 +1,139 @@
+import copy
+import pytest
+from nerdchess import encoding, pieces
+from nerdchess.board import Board
+from nerdchess.game import ChessGame
+from nerdchess.history import GameHistory
+from nerdchess.player import Player
+
+# The opera game, Morphy - Duke of Brunswick and Count Isouard, 1858
+OPERA_GAME = [
+    'e2e4', 'e7e5', 'g1f3', 'd7d6', 'd2d4', 'c8g4', 'd4e5', 'g4f3', 'd1f3',
+    'd6e5', 'f1c4', 'g8f6', 'f3b3', 'd8e7', 'b1c3', 'c7c6', 'c1g5', 'b7b5',
+    'c3b5', 'c6b5', 'c4b5', 'b8d7', 'e1c1', 'a8d8', 'd1d7', 'd8d7', 'h1d1',
+    'e7e6', 'b5d7', 'f6d7', 'b3b8', 'd7b8', 'd1d8']
+
+
+@pytest.fixture
+def played():
+    """Play the opera game, keeping a copy of every position."""
+    board = Board.from_fen(
+        'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
+    history = GameHistory(board, interval=8)
+    boards = [copy.deepcopy(board)]
+
+    for move in OPERA_GAME:
+        code = encoding.encode(move)
+        board.make_move(code)
+        history.append(code, board)
+        boards.append(copy.deepcopy(board))
+
+    return (history, boards)
+
+
+def keys(boards):
+    """Return the keys of the positions of boards."""
+    return [board.key for board in boards]
+
+
+class TestGameHistory():
+    """Test rebuilding positions from keyframes and moves."""
+
+    def test_position_at(self, played):
+        (history, boards) = played
+
+        assert len(history) == len(OPERA_GAME)
+        for (ply, board) in enumerate(boards):
+            assert history.position_at(ply).to_fen() == board.to_fen()
+            assert history.keys[ply] == board.key
+        assert history.position_at(-1).key == boards[-1].key
+
+        with pytest.raises(IndexError):
+            history.position_at(len(boards))
+
+    def test_positions(self, played):
+        (history, boards) = played
+
+        assert keys(history.positions()) == keys(boards[:-1])
+        assert keys(history.boards()[3:6]) == keys(boards[3:6])
+        assert history.boards()[-1].key == boards[-2].key
+
+    def test_sync(self, played):
+        """Test if a changed board is kept as a keyframe."""
+        (history, boards) = played
+        board = Board.from_fen('4k3/8/8/8/8/8/8/4K2R w K - 0 1')
+
+        history.sync(board)
+        history.sync(board)
+        board.make_move('e1g1')
+        history.append(encoding.encode('e1g1'), board)
+
+        assert history.position_at(-2).to_fen() == (
+            '4k3/8/8/8/8/8/8/4K2R w K - 0 1')
+        assert history.position_at(-1).key == board.key
+        assert history.position_at(10).key == boards[10].key
+
+        history.pop()
+        assert history.position_at(-1).to_fen() == (
+            '4k3/8/8/8/8/8/8/4K2R w K - 0 1')
+        history.pop()
+        assert history.position_at(-1).key == boards[-2].key
+
+
+class TestGame():
+    """Test the history of a game of chess."""
+
+    def test_board_history(self):
+        (white, black) = Player.create_two('white', 'black', 'w')
+        game = ChessGame(white, black)
+        boards = []
+
+        for move in OPERA_GAME:
+            player = white if white.turn else black
+            boards.append(copy.deepcopy(game.board))
+            assert game.move(player, move)
+
+        assert game.over
+        assert len(game.board_history) == len(OPERA_GAME)
+        assert keys(game.board_history) == keys(boards)
+        assert game.board_history[17].key == boards[17].key
+        assert game.history.position_at(-1).key == game.board.key
+
+    def test_promotion(self):
+        (white, black) = Player.create_two('white', 'black', 'w')
+        game = ChessGame.from_fen(white, black, '4k3/P7/8/8/8/8/7P/4K3 w - - '
+                                                '0 1')
+
+        assert game.move(white, 'a7a8')
+        pawn = game.board.squares['a'][8].occupant
+        assert game.promote(pawn, pieces.Knight)
+        assert game.move(black, 'e8e7')
+
+        assert encoding.to_text(game.move_history[0]) == 'a7a8n'
+        assert isinstance(game.history.position_at(1).squares['a'][8]
+                          .occupant, pieces.Knight)
+        assert game.history.position_at(-1).key == game.board.key
+
+    def test_unpromoted(self):
+        """Test if a pawn on the last row stays a pawn until promoted."""
+        (white, black) = Player.create_two('white', 'black', 'w')
+        game = ChessGame.from_fen(white, black, '4k3/P7/8/8/8/8/8/4K3 w - - '
+                                                '0 1')
+
+        assert game.move(white, 'a7a8')
+        assert encoding.to_text(game.move_history[0]) == 'a7a8'
+        assert game.history.position_at(-1).to_fen() == game.to_fen()
+        assert game.to_fen().startswith('P3k3/')
+        game.verify()
+
+    def test_replaced_board(self):
+        (white, black) = Player.create_two('white', 'black', 'w')
+        game = ChessGame(white, black)
+
+        assert game.move(white, 'e2e4')
+        game.board = Board.from_fen('4k3/8/8/8/8/8/8/R3K3 b Q - 0 1')
+        assert game.move(black, 'e8d7')
+
+        assert game.board_history[1].to_fen() == (
+            '4k3/8/8/8/8/8/8/R3K3 b Q - 0 1')
+        assert game.history.position_at(-1).key == game.board.key
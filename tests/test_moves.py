@@ -1,7 +1,9 @@
+import copy
 import pytest
 from types import SimpleNamespace
 from nerdchess.board import Board
 from nerdchess.boardmove import BoardMove
+from nerdchess.move import Move
 from nerdchess import pieces
 from nerdchess.config import colors
 
@@ -228,6 +230,21 @@ class TestBoardRules():
         else:
             assert result == expected
 
+    @pytest.mark.parametrize("fen,move", [
+        # A white rook on the back row of black
+        ('7R/8/8/8/8/8/8/k3K3 w - - 0 1', 'h8e8'),
+        # A black rook on the back row of white
+        ('K3k3/8/8/8/8/8/8/r7 b - - 0 1', 'a1e1'),
+    ])
+    def test_castling_other_row(self, fen, move):
+        """Test if rooks on the back row of the other color don't castle."""
+        board = Board.from_fen(fen)
+        boardmove = BoardMove(board, move)
+
+        assert not boardmove.is_castling()
+        assert boardmove.make()
+        assert board.squares['e'][int(move[3])].occupant.color != board.turn
+
     @pytest.mark.parametrize("move,expected", [
         # Queenside castle for white with a bishop in the way.
         ('e1a1', False),
@@ -257,3 +274,40 @@ class TestBoardRules():
         boardmove = BoardMove(board_fixt.board, move)
 
         assert boardmove.promotion == expected
+
+
+class TestSharedMoves():
+    """Test the moves shared through the move table."""
+
+    def test_get(self):
+        """Test if moves are created once and reused."""
+        move = Move.get('e2', 'e4')
+
+        assert move is Move.get('e2', 'e4')
+        assert move is Move.from_position('e2', (0, 2))
+        assert move == Move('e2e4')
+        assert move.square_selectors_between() == ['e3']
+        assert move.indices == Move('e2e4').indices
+
+    def test_off_board(self):
+        """Test if moves off the board can't be created."""
+        assert Move.from_position('h8', (1, 1)) is None
+        with pytest.raises(ValueError):
+            Move.get('e2', 'e9')
+
+    def test_immutable(self):
+        """Test if shared moves can't be changed."""
+        move = Move.get('e2', 'e4')
+
+        with pytest.raises(AttributeError):
+            move.text = 'e2e3'
+        assert copy.deepcopy(move) is move
+
+    def test_boardmove(self, board_queen_e4):
+        """Test if boardmoves take over the shared move."""
+        move = BoardMove(board_queen_e4, 'e4h7')
+
+        assert move == Move.get('e4', 'h7')
+        assert move.is_diagonal()
+        assert move.square_selectors_between() == ['f5', 'g6']
+        assert move.valid
@@ -0,0 +1,82 @@
+import pytest
+from nerdchess.board import Board
+from nerdchess.engine import Engine
+from nerdchess.move import Move
+from nerdchess.ordering import MoveOrdering
+
+# White can take the queen with a pawn, knight or rook, and the rook
+POSITION = 'k7/8/3q1r2/4P3/2N5/8/8/K2R4 w - - 0 1'
+POSITION_6 = ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 '
+              'w - - 0 10')
+
+
+@pytest.fixture
+def ordering():
+    return MoveOrdering()
+
+
+def texts(moves):
+    return [move.text for move in moves]
+
+
+class TestMoveOrdering():
+    """Test ordering the moves of a position."""
+
+    def test_mvv_lva(self, ordering):
+        board = Board.from_fen(POSITION)
+        moves = texts(ordering.order(board, board.pseudo_legal_moves(), 0))
+
+        assert moves[:4] == ['e5d6', 'c4d6', 'd1d6', 'e5f6']
+        assert len(moves) == len(set(moves))
+
+    def test_hash_killers_history(self, ordering):
+        board = Board.from_fen(POSITION)
+        hash_move = Move.get('a1', 'b1')
+        (killer, other) = (Move.get('d1', 'd4'), Move.get('c4', 'b6'))
+
+        ordering.cutoff(board, killer, 1, 1, 4)
+        ordering.cutoff(board, other, 2, 3, 0)
+        ordering.cutoff(board, Move.get('d1', 'd6'), 1, 3, 0)
+        moves = ordering.order(board, board.pseudo_legal_moves(), 1,
+                               hash_move)
+
+        assert moves[0] is hash_move
+        assert moves.index(killer) == 5
+        assert moves.index(other) == 6
+        assert ordering.killers[1] == [killer, None]
+        assert ordering.killers[2] == [other, None]
+        assert (ordering.cutoffs, ordering.first_cutoffs) == (3, 2)
+
+        ordering.new_search()
+        moves = ordering.order(board, board.pseudo_legal_moves(), 1)
+        assert ordering.killers[1] == [None, None]
+        assert moves.index(other) == 4
+        assert ordering.positions == 2
+
+    def test_promotions(self, ordering):
+        board = Board.from_fen('1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        moves = texts(ordering.order(board, board.pseudo_legal_moves(), 0))
+
+        assert moves[:2] == ['a7b8q', 'a7a8q']
+        assert set(moves[-6:]) == {'a7b8n', 'a7b8b', 'a7b8r', 'a7a8n',
+                                   'a7a8b', 'a7a8r'}
+
+    def test_en_passant(self, ordering):
+        board = Board.from_fen('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        moves = texts(ordering.order(board, board.pseudo_legal_moves(), 0))
+
+        assert moves[0] == 'e5d6'
+
+
+class TestEngineOrdering():
+    """Test searching with ordered moves."""
+
+    def test_search(self):
+        board = Board.from_fen(POSITION_6)
+        engine = Engine()
+        result = engine.search(board, depth=3)
+
+        assert result.move in list(board.legal_moves())
+        assert result.nodes < 5000
+        assert engine.ordering.first_cutoff_rate > 0.85
+        assert 'cutoffs' in str(engine.ordering)
@@ -0,0 +1,53 @@
+import pytest
+from nerdchess import perft
+from nerdchess.board import Board, START_FEN
+
+CASES = [
+    (name, fen, depth, expected)
+    for (name, fen, counts) in perft.REFERENCE_POSITIONS
+    for (depth, expected) in enumerate(counts, 1)
+    if expected < 3000
+]
+
+
+class TestPerft():
+    """Test move generation against the known perft counts."""
+
+    @pytest.mark.parametrize("name,fen,depth,expected", CASES)
+    def test_reference(self, name, fen, depth, expected):
+        """Test if the amount of positions matches the reference."""
+        board = Board.from_fen(fen)
+        key = board.key
+
+        assert perft.perft(board, depth) == expected
+        assert board.key == key
+
+    @pytest.mark.parametrize("name,fen,depth,expected", [
+        case for case in CASES if case[3] < 500])
+    def test_rules(self, name, fen, depth, expected):
+        """Test if the rules of a game allow the reference positions."""
+        board = Board.from_fen(fen)
+        key = board.key
+
+        assert perft.perft(board, depth, rules=True) == expected
+        assert board.key == key
+
+    def test_divide(self):
+        """Test if divide counts the positions per move."""
+        board = Board.from_fen(START_FEN)
+        counts = dict(perft.divide(board, 2))
+
+        assert len(counts) == 20
+        assert counts['e2e4'] == 20
+        assert sum(counts.values()) == perft.perft(board, 2)
+        assert dict(perft.divide(board, 2, rules=True)) == counts
+
+    def test_main(self, capsys):
+        """Test the commandline entry point."""
+        assert perft.main(['--suite', '--max-nodes', '500']) == 0
+        assert perft.main(['--depth', '2', '--divide']) == 0
+        assert perft.main(['--depth', '1', '--rules']) == 0
+
+        output = capsys.readouterr().out
+        assert 'kiwipete' in output
+        assert 'Nodes: 400' in output
@@ -0,0 +1,123 @@
+import io
+import pytest
+from nerdchess import pgn
+from nerdchess.board import Board
+
+OPERA_GAME = '''[Event "A Night at the Opera"]
+[White "Morphy"]
+[Black "Duke \\"Karl\\""]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move
+
+already.} 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5
+10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6
+(14... Qb4 15. Qxb4 (15. Bxd7+) Nxb4) 15. Bxd7+ Nxd7 16. Qb8+ $1 Nxb8
+17. Rd8# 1-0
+'''
+
+PGN = OPERA_GAME + '''
+% an escaped line
+[Event "Promotion"]
+[FEN "8/P7/8/8/8/8/8/7k w - - 0 1"]
+
+1. a8=Q+ Kg1 *
+[Event "Illegal"]
+
+1. e4 e5 2. Ke3 ; the king can't go there
+0-1
+'''
+
+
+@pytest.fixture
+def games():
+    return list(pgn.read_games(io.StringIO(PGN)))
+
+
+class TestReadGames():
+    """Test reading games from PGN."""
+
+    def test_read(self, games):
+        """Test if tags, moves and results are read."""
+        assert len(games) == 3
+        assert games[0].tags['Black'] == 'Duke "Karl"'
+        assert games[0].result == '1-0'
+        assert len(games[0].moves) == 33
+        assert games[0].moves[-3:] == ['Qb8+', 'Nxb8', 'Rd8#']
+        assert games[1].fen == '8/P7/8/8/8/8/8/7k w - - 0 1'
+        assert games[1].moves == ['a8=Q+', 'Kg1']
+        assert games[2].moves == ['e4', 'e5', 'Ke3']
+        assert games[2].result == '0-1'
+
+    def test_streaming(self):
+        """Test if games are read before the rest of the stream."""
+        lines = iter(io.StringIO(PGN))
+        games = pgn.read_games(lines)
+
+        assert next(games).tags['White'] == 'Morphy'
+        assert next(lines).startswith('% an escaped line')
+
+
+class TestSan():
+    """Test converting SAN to moves."""
+
+    @pytest.mark.parametrize("fen,san,expected", [
+        ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', 'O-O', 'e1g1'),
+        ('r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1', 'O-O-O', 'e8c8'),
+        ('4k3/8/8/8/8/8/4K3/R6R w - - 0 1', 'Rhf1', 'h1f1'),
+        ('4k3/8/8/8/8/8/4K3/R6R w - - 0 1', 'Raf1', 'a1f1'),
+        ('4k3/8/8/5N2/8/5N2/8/4K3 w - - 0 1', 'N3d4', 'f3d4'),
+        ('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1', 'exd6', 'e5d6'),
+        ('4k3/1P6/8/8/8/8/8/4K3 w - - 0 1', 'b8=N+', 'b7b8n'),
+        ('4k3/4r3/8/8/8/2N1N3/8/4K3 w - - 0 1', 'Nd5', 'c3d5'),
+    ])
+    def test_san(self, fen, san, expected):
+        """Test if SAN is converted to the notation of BoardMove."""
+        assert pgn.san_to_move(Board.from_fen(fen), san) == expected
+
+    @pytest.mark.parametrize("fen,san", [
+        ('4k3/8/8/5N2/8/5N2/8/4K3 w - - 0 1', 'Nd4'),
+        ('4k3/8/8/8/8/8/4K3/R6R w - - 0 1', 'Rf1'),
+        ('4k3/8/8/8/8/8/8/4K3 w - - 0 1', 'Ke3'),
+        ('4k3/8/8/8/8/8/8/4K3 w - - 0 1', 'Kx'),
+    ])
+    def test_san_invalid(self, fen, san):
+        """Test if ambiguous, illegal and invalid SAN is refused."""
+        with pytest.raises(pgn.ReplayError):
+            pgn.san_to_move(Board.from_fen(fen), san)
+
+    def test_san_trusted(self):
+        """Test if pinned pieces are only ruled out when it's ambiguous."""
+        board = Board.from_fen('4k3/4r3/8/8/8/2N1N3/8/4K3 w - - 0 1')
+
+        assert pgn.san_to_move(board, 'Nd5', trusted=True) == 'c3d5'
+        assert pgn.san_to_move(board, 'Nf5', trusted=True) == 'e3f5'
+        with pytest.raises(pgn.ReplayError):
+            pgn.san_to_move(board, 'Nf5')
+
+
+class TestReplay():
+    """Test replaying games."""
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_replay_games(self, trusted):
+        """Test if games are replayed up to the first invalid move."""
+        results = list(pgn.replay_games(io.StringIO(PGN), trusted))
+
+        assert results[0]
+        assert results[0].moves[-1] == 'd1d8'
+        assert results[0].fen == (
+            '1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17')
+        assert results[1].moves == ['a7a8q', 'h1g1']
+        assert not results[2]
+        assert results[2].ply == 3
+        assert results[2].moves == ['e2e4', 'e7e5']
+        assert "Ke3" in results[2].error
+
+    def test_replay(self, games):
+        """Test if every position of a game is replayed."""
+        positions = [(ply, move) for (ply, move, _)
+                     in pgn.replay(games[0], trusted=True)]
+
+        assert positions[:2] == [(1, 'e2e4'), (2, 'e7e5')]
+        assert len(positions) == 33
@@ -37,3 +37,29 @@ class TestPieces():
         assert isinstance(allowed_moves, list)
         for move in allowed_moves:
             assert isinstance(move, Move)
+
+    def test_no_duplicate_moves(self, piece):
+        """Test if patterns only hold unique moves on the board."""
+        moves = [move.text for move in piece.allowed_moves()]
+
+        assert len(moves) == len(set(moves))
+        assert len(piece.move_pattern()) == len(set(piece.move_pattern()))
+
+
+@pytest.mark.parametrize("piece_class,position,expected", [
+    (pieces.Rook, 'e4', 14),
+    (pieces.Bishop, 'e4', 13),
+    (pieces.Bishop, 'a1', 7),
+    (pieces.Queen, 'e4', 27),
+    (pieces.Knight, 'a1', 2),
+    (pieces.King, 'h8', 3),
+    (pieces.King, 'e1', 10),
+    (pieces.Pawn, 'e2', 4),
+    (pieces.Pawn, 'a3', 2),
+])
+def test_move_count(piece_class, position, expected):
+    """Test the amount of moves on an empty board."""
+    piece = piece_class(colors.WHITE)
+    piece.position = position
+
+    assert len(piece.allowed_moves()) == expected
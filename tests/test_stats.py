@@ -0,0 +1,74 @@
+import pytest
+from nerdchess import stats
+from nerdchess.boardmove import BoardMove
+from nerdchess.game import ChessGame
+from nerdchess.player import Player
+
+
+@pytest.fixture
+def instrumented():
+    """Enable instrumentation with empty global stats."""
+    stats.STATS.reset()
+    stats.enable()
+    yield stats.STATS
+    stats.disable()
+    stats.STATS.reset()
+
+
+@pytest.fixture
+def players():
+    return Player.create_two('blaat', 'henk', 'w')
+
+
+class TestStats():
+    """Test counting and timing the hot paths."""
+
+    def test_disabled(self, players):
+        """Test if nothing is recorded or wrapped by default."""
+        original = BoardMove.__init__
+        game = ChessGame(*players)
+        game.move(players[0], 'e2e4')
+
+        assert not stats.is_enabled()
+        assert not game.stats.calls
+        assert BoardMove.__init__ is original
+
+    def test_game(self, instrumented, players):
+        """Test if calls are recorded per game and globally."""
+        game = ChessGame(*players)
+        other = ChessGame(*Player.create_two('a', 'b', 'w'))
+        game.move(players[0], 'e2e4')
+        other.move(other.player_1, 'd2d4')
+        BoardMove(game.board, 'e7e5')
+
+        assert game.stats.calls['ChessGame.move'] == 1
+        assert other.stats.calls['ChessGame.move'] == 1
+        assert instrumented.calls['ChessGame.move'] == 2
+        assert (instrumented.calls['BoardMove']
+                == game.stats.calls['BoardMove']
+                + other.stats.calls['BoardMove'] + 1)
+        assert game.stats.calls['BoardRules.apply'] >= 1
+        assert game.stats.calls['Board.make_move'] >= 1
+        assert (game.stats.seconds['ChessGame.move']
+                >= game.stats.seconds['Board.make_move'])
+        assert 'ChessGame.move' in game.stats.report()
+
+    def test_move_checked_once(self, instrumented, players):
+        """Test if a move is checked against the rules and made once."""
+        game = ChessGame(*players)
+        game.move(players[0], 'e2e4')
+
+        assert game.stats.calls['BoardRules.apply'] == 1
+        assert game.stats.calls['Board.is_check'] == 1
+
+    def test_disable(self, instrumented, players):
+        """Test if disabling restores the original functions."""
+        wrapped = BoardMove.__init__
+        stats.enable()
+        assert BoardMove.__init__ is wrapped
+
+        stats.disable()
+        ChessGame(*players).move(players[0], 'e2e4')
+
+        assert BoardMove.__init__ is not wrapped
+        assert not instrumented.calls
@@ -0,0 +1,93 @@
+import pytest
+from nerdchess import encoding
+from nerdchess.board import Board, START_FEN
+from nerdchess.config import ReplacementPolicy
+from nerdchess.engine import Engine
+from nerdchess.transposition import (EXACT, LOWER, UPPER, SLOT_BYTES,
+                                     TranspositionTable)
+
+
+@pytest.fixture
+def table():
+    return TranspositionTable(megabytes=1)
+
+
+class TestTranspositionTable():
+    """Test storing and looking up search results."""
+
+    def test_size(self, table):
+        assert table.size == 1024 * 1024 // SLOT_BYTES
+        assert table.megabytes == 1
+        assert TranspositionTable(megabytes=0).size == 1
+
+    @pytest.mark.parametrize("depth,bound,score,move", [
+        (3, EXACT, 25, 'e2e4'),
+        (0, LOWER, -99998, 'e7e8q'),
+        (255, UPPER, 0, None),
+    ])
+    def test_store_probe(self, table, depth, bound, score, move):
+        code = encoding.encode(move) if move else 0
+        key = Board.from_fen(START_FEN).key
+
+        assert table.probe(key) is None
+        assert table.store(key, depth, bound, score, code)
+        assert table.probe(key) == (depth, bound, score, code)
+        assert table.probe(key + table.size) is None
+        assert (table.probes, table.hits, table.hit_rate) == (3, 1, 1 / 3)
+
+    def test_keep_move(self, table):
+        """Test if the best move stays when a result without one is stored."""
+        code = encoding.encode('g1f3')
+        table.store(42, 2, EXACT, 10, code)
+        table.store(42, 3, UPPER, 5)
+
+        assert table.probe(42) == (3, UPPER, 5, code)
+
+    def test_depth_preferred(self, table):
+        table.store(1, 5, EXACT, 10)
+
+        assert not table.store(1 + table.size, 4, EXACT, 20)
+        assert table.probe(1) == (5, EXACT, 10, 0)
+        assert table.store(1 + table.size, 5, EXACT, 20)
+        assert table.probe(1) is None
+
+        table.store(2, 5, EXACT, 10)
+        table.new_search()
+        assert table.store(2 + table.size, 1, EXACT, 20)
+        assert (table.stores, table.overwrites, table.rejected) == (4, 2, 1)
+
+    def test_always(self):
+        table = TranspositionTable(megabytes=1,
+                                   policy=ReplacementPolicy.ALWAYS)
+        table.store(1, 5, EXACT, 10)
+
+        assert table.store(1 + table.size, 1, LOWER, 20)
+        assert table.probe(1 + table.size) == (1, LOWER, 20, 0)
+
+    def test_clear(self, table):
+        for key in range(1, 200):
+            table.store(key * 7919, 1, EXACT, key)
+        assert table.usage() > 0
+
+        table.clear()
+        assert table.usage() == 0
+        assert table.probe(7919) is None
+        assert str(table).startswith('1.0 MB')
+
+
+class TestEngineTable():
+    """Test searching with a transposition table."""
+
+    def test_search(self):
+        board = Board.from_fen(START_FEN)
+        small = Engine(table=TranspositionTable(megabytes=0.001))
+        engine = Engine(table=TranspositionTable(megabytes=1))
+
+        first = engine.search(board, depth=3)
+        assert engine.table.hits
+        assert first.score == small.search(board, depth=3).score
+
+        second = engine.search(board, depth=3)
+        assert second.nodes < first.nodes
+        assert second.move == first.move
+        assert board.to_fen() == START_FEN
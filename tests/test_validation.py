@@ -0,0 +1,89 @@
+import io
+import pytest
+from nerdchess import pgn, validation
+from nerdchess.board import START_FEN
+
+FOOLS_MATE = ['f2f3', 'e7e5', 'g2g4', 'd8h4']
+GAMES = [
+    FOOLS_MATE,
+    'e2e4 e7e5 e1e3',
+    ['e2e4', 'e7e5', 'g1f3'],
+    FOOLS_MATE + ['e2e4'],
+    ['e2e9'],
+]
+
+
+class TestValidation():
+    """Test validating games in bulk."""
+
+    def test_validate_game(self):
+        """Test the results of single games."""
+        results = [validation.validate_game(game, index)
+                   for (index, game) in enumerate(GAMES)]
+
+        assert results[0] and results[0].result == '0-1'
+        assert results[0].plies == 4
+        assert not results[1]
+        assert (results[1].ply, results[1].plies) == (3, 2)
+        assert results[1].fen.startswith('rnbqkbnr/pppp1ppp/8/4p3/4P3/')
+        assert results[2] and results[2].result == '*'
+        assert results[3].ply == 5
+        assert 'over' in results[3].error
+        assert results[4].ply == 1
+        assert results[4].fen == START_FEN
+
+    def test_validate_pgn(self):
+        """Test if games read from PGN are validated."""
+        games = pgn.read_games(io.StringIO(
+            '[Result "0-1"]\n\n1. f3 e5 2. g4 Qh4# 0-1\n\n1. e4 Ke7 *\n'))
+
+        results = list(validation.validate_games(games, workers=1))
+
+        assert results[0] and results[0].result == '0-1'
+        assert not results[1] and results[1].ply == 2
+
+    @pytest.mark.parametrize("movetext,valid,result", [
+        # Black mates, but the PGN claims white won
+        ('1. f3 e5 2. g4 Qh4# 1-0', False, '0-1'),
+        # Black resigns, the position doesn't decide the game
+        ('1. e4 e5 1-0', True, '*'),
+        # A move after the mate
+        ('1. f3 e5 2. g4 Qh4# 3. e4 0-1', False, '*'),
+    ])
+    def test_validate_pgn_result(self, movetext, valid, result):
+        """Test if the result comes from the position, not from the PGN."""
+        (game,) = pgn.read_games(io.StringIO(movetext + '\n'))
+
+        validated = validation.validate_game(game)
+
+        assert bool(validated) == valid
+        assert validated.result == result
+
+    @pytest.mark.parametrize("workers,ordered", [
+        (1, True),
+        (2, True),
+        (2, False),
+    ])
+    def test_validate_games(self, workers, ordered):
+        """Test if games are validated on a pool of processes."""
+        results = list(validation.validate_games(
+            GAMES * 3, workers=workers, chunksize=2, ordered=ordered))
+
+        assert len(results) == 15
+        if ordered:
+            assert [result.index for result in results] == list(range(15))
+        assert sorted(result.index for result in results
+                      if result) == [0, 2, 5, 7, 10, 12]
+
+    def test_main(self, tmp_path, capsys):
+        """Test the commandline entry point."""
+        games = tmp_path / 'games.txt'
+        games.write_text('\n'.join(' '.join(game) for game in GAMES[:1]))
+        assert validation.main([str(games), '--workers', '1']) == 0
+
+        games.write_text('e2e4 e7e5 e1e3\n')
+        assert validation.main([str(games), '--workers', '1']) == 1
+
+        output = capsys.readouterr().out
+        assert "Game 1, ply 3: Illegal move 'e1e3'" in output
+        assert 'games/s' in output